@@ -0,0 +1,4 @@
+"""Micro-benchmarks for performance-sensitive code paths.
+
+Run a benchmark from the repository root, e.g. ``python -m benchmarks.bench_serializer``.
+"""
@@ -0,0 +1,65 @@
+"""Compare resolving abilities through the cached table with walking the ability tree.
+
+Builds chains of Philosophers of increasing depth, each holding the next, with a Fool at
+the bottom, and times looking up the Fool and an ability nobody has, which is the worst
+case for a walk.
+
+Usage: ``python -m benchmarks.bench_ability_resolution [--depths N ...] [--repeat N]``
+"""
+
+import argparse
+import timeit
+from types import SimpleNamespace
+
+import global_vars  # noqa: F401  Imported first to settle the model's import order
+from model.characters.specific import Fool, Monk, Philosopher
+from utils.character_utils import the_ability
+
+LOOKUPS = 10_000
+
+
+def build_chain(depth: int) -> Philosopher:
+    """Build a Philosopher holding depth - 1 nested Philosophers, the last holding a Fool."""
+    parent = SimpleNamespace()
+    top = innermost = Philosopher(parent)
+    for _ in range(depth - 1):
+        innermost.add_ability(Philosopher)
+        innermost = innermost.abilities[0]
+    innermost.add_ability(Fool)
+    return top
+
+
+def _walk(character, ability_class):
+    """The tree walk ``the_ability`` did before abilities were cached."""
+    if hasattr(character, 'abilities'):
+        for ability in character.abilities:
+            if isinstance(ability, ability_class):
+                return ability
+    if isinstance(character, ability_class):
+        return character
+    if hasattr(character, 'abilities') and hasattr(character, 'parent'):
+        matching = [_walk(c, ability_class) for c in character.abilities]
+        return next((x for x in matching if x is not None), None)
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="Levels of nesting")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs of each lookup")
+    args = parser.parse_args()
+
+    print(f"{'depth':>6}{'ability':>9}{'walk':>14}{'cached':>14}   (per {LOOKUPS} lookups)")
+    for depth in args.depths:
+        character = build_chain(depth)
+        for ability_class in (Fool, Monk):
+            assert _walk(character, ability_class) is the_ability(character, ability_class)
+            walk = min(timeit.repeat(lambda: _walk(character, ability_class), number=LOOKUPS, repeat=args.repeat))
+            cached = min(timeit.repeat(
+                lambda: the_ability(character, ability_class), number=LOOKUPS, repeat=args.repeat
+            ))
+            print(f"{depth:>6}{ability_class.__name__:>9}{walk * 1000:>11.2f} ms{cached * 1000:>11.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
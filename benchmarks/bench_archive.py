@@ -0,0 +1,49 @@
+"""Time post-game statistics queries over an archive of finished games.
+
+Archives the 15-player, 3-day game from ``bench_serializer`` many times into a
+temporary database, then times the query API.
+
+Usage: ``python -m benchmarks.bench_archive [--games N] [--repeat N]``
+"""
+
+import argparse
+import datetime
+import os
+import tempfile
+import timeit
+
+from benchmarks.bench_serializer import build_game
+from model.persistence.archive import GameArchive
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=500, help="Number of games to archive")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of timed runs of each query")
+    args = parser.parse_args()
+
+    game = build_game()
+    user_id = game.seatingOrder[0].user.id
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+    with tempfile.TemporaryDirectory() as directory, GameArchive(os.path.join(directory, "archive.db")) as archive:
+        seconds = timeit.timeit(
+            lambda: [archive.record(game, winner, start + datetime.timedelta(days=i))
+                     for i, winner in enumerate(["good", "evil"] * (args.games // 2))],
+            number=1,
+        )
+        print(f"archived {args.games} games in {seconds * 1000:.1f} ms")
+
+        queries = {
+            "player_record": lambda: archive.player_record(user_id),
+            "character_record": lambda: archive.character_record("Imp"),
+            "games_for_player": lambda: archive.games_for_player(user_id),
+            "games (one month)": lambda: archive.games(start, start + datetime.timedelta(days=30)),
+        }
+        for name, query in queries.items():
+            seconds = min(timeit.repeat(query, number=1, repeat=args.repeat))
+            print(f"{name:<20}{seconds * 1000:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
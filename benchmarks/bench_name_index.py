@@ -0,0 +1,62 @@
+"""Time name lookups against a large guild, with the name index and with a linear scan.
+
+Builds a guild of random members, some with accented names, and times substring and
+prefix lookups of various lengths.
+
+Usage: ``python -m benchmarks.bench_name_index [--members N] [--repeat N]``
+"""
+
+import argparse
+import random
+import string
+import timeit
+from types import SimpleNamespace
+
+from utils.name_index import NameIndex, normalize, person_names
+
+LOOKUPS = 100
+QUERIES = ["a", "ma", "mar", "marie", "zoë", "user_4321", "nobody here"]
+
+
+def build_members(count: int) -> list[SimpleNamespace]:
+    """Build members with random usernames and display names."""
+    rng = random.Random(0)
+    first_names = ["Marie", "Zoë", "Amélie", "José", "Chloé", "Sam", "Alex", "Jordan", "Taylor", "Björn"]
+
+    def word():
+        return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+
+    return [
+        SimpleNamespace(id=i, name=f"user_{i}", display_name=f"{rng.choice(first_names)} {word()}")
+        for i in range(count)
+    ]
+
+
+def _scan(members, text):
+    text = normalize(text)
+    return [member for member in members if any(text in name for name in person_names(member))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=5000, help="Number of guild members")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs of each lookup")
+    args = parser.parse_args()
+
+    members = build_members(args.members)
+    seconds = timeit.timeit(lambda: NameIndex(members), number=1)
+    print(f"indexed {args.members} members in {seconds * 1000:.1f} ms")
+    index = NameIndex(members)
+
+    print(f"{'query':<14}{'matches':>8}{'scan':>12}{'substring':>12}{'prefix':>12}   (per lookup)")
+    for query in QUERIES:
+        assert index.substring(query) == _scan(members, query)
+        timings = [
+            min(timeit.repeat(lookup, number=LOOKUPS, repeat=args.repeat)) / LOOKUPS
+            for lookup in (lambda: _scan(members, query), lambda: index.substring(query), lambda: index.prefix(query))
+        ]
+        print(f"{query!r:<14}{len(index.substring(query)):>8}" + "".join(f"{t * 1000:>9.3f} ms" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Count how often resolving a typed name needs a disambiguation prompt.
+
+Replays a corpus of nickname collisions of the kind that come up in games, each a
+seating order, the text a storyteller typed and who they meant. It compares the plain
+substring search, which prompts whenever more than one name matches, with the ranked
+matcher, and times the matcher.
+
+Usage: ``python -m benchmarks.bench_name_matching [--repeat N]``
+"""
+
+import argparse
+import timeit
+from types import SimpleNamespace
+
+import global_vars
+from model.characters import Character
+from model.game.game import Game
+from model.game.script import Script
+from model.player import Player
+from utils.name_index import normalize, person_names
+from utils.name_matching import best_matches
+
+# (display names in the game, (text typed, display name meant), ...)
+CORPUS = [
+    (["Sam", "Samantha", "Big Sam", "Sammy"], [("sam", "Sam"), ("sama", "Samantha"), ("big", "Big Sam")]),
+    (["Alex", "Alexa", "Alexander", "Lex"], [("alex", "Alex"), ("alexa", "Alexa"), ("lex", "Lex"), ("alexnder", "Alexander")]),
+    (["Chris", "Christine", "Kris", "Chrissy P"], [("chris", "Chris"), ("kris", "Kris"), ("christin", "Christine")]),
+    (["Zoë", "Zoey", "Zo"], [("zoe", "Zoë"), ("zoey", "Zoey"), ("zo", "Zo")]),
+    (["Dan", "Daniel", "Danielle", "Jordan"], [("dan", "Dan"), ("daniel", "Daniel"), ("danielle", "Danielle"), ("jordn", "Jordan")]),
+    (["Mat", "Matt", "Matthew", "Mattie"], [("mat", "Mat"), ("matt", "Matt"), ("mathew", "Matthew")]),
+    (["J", "Jay", "Jaymie", "DJ"], [("j", "J"), ("jay", "Jay"), ("dj", "DJ")]),
+    (["Ben", "Benny", "Benjamin", "Ruben"], [("ben", "Ben"), ("benj", "Benjamin"), ("rub", "Ruben")]),
+    (["Em", "Emma", "Emily", "Gem"], [("em", "Em"), ("emi", "Emily"), ("emma", "Emma")]),
+    (["Théo", "Theodore", "Teo"], [("theo", "Théo"), ("teo", "Teo"), ("theod", "Theodore")]),
+]
+
+
+def build_game(names: list[str]) -> Game:
+    """Build a game with a player for each display name and make it the current game."""
+    players = [
+        Player(Character, "good", SimpleNamespace(id=i, name=name.lower(), display_name=name, roles=[]), None, i)
+        for i, name in enumerate(names)
+    ]
+    game = Game(players, None, None, Script([]), skip_storytellers=True)
+    global_vars.game = game
+    return game
+
+
+def _substring(text, people):
+    text = normalize(text)
+    return [person for person in people if any(text in name for name in person_names(person))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs of the corpus")
+    args = parser.parse_args()
+
+    lookups = [(build_game(names), text, meant) for names, queries in CORPUS for text, meant in queries]
+    results = {"substring": [0, 0, 0], "ranked": [0, 0, 0]}  # resolved, prompted, wrong or not found
+    for game, text, meant in lookups:
+        global_vars.game = game
+        matches = _substring(text, game.seatingOrder)
+        ranked = matches if len(matches) == 1 else best_matches(text, matches or game.seatingOrder)
+        for name, found in (("substring", matches), ("ranked", ranked)):
+            if len(found) == 1 and found[0].display_name == meant:
+                results[name][0] += 1
+            elif len(found) > 1 and any(person.display_name == meant for person in found):
+                results[name][1] += 1
+            else:
+                results[name][2] += 1
+
+    print(f"{len(lookups)} lookups")
+    print(f"{'':<12}{'resolved':>10}{'prompted':>10}{'missed':>10}")
+    for name, (resolved, prompted, missed) in results.items():
+        print(f"{name:<12}{resolved:>10}{prompted:>10}{missed:>10}")
+
+    def run():
+        for game, text, _ in lookups:
+            global_vars.game = game
+            best_matches(text, game.seatingOrder)
+
+    seconds = min(timeit.repeat(run, number=1, repeat=args.repeat))
+    print(f"ranked matching: {seconds / len(lookups) * 1e6:.1f} us per lookup")
+
+
+if __name__ == "__main__":
+    main()
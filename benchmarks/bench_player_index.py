@@ -0,0 +1,64 @@
+"""Compare looking players up through the game's index with scanning the seating order.
+
+Builds games of increasing size, each with a few storytellers, and times looking up
+the last player in the seating order, which is the worst case for a scan.
+
+Usage: ``python -m benchmarks.bench_player_index [--sizes N ...] [--repeat N]``
+"""
+
+import argparse
+import timeit
+from types import SimpleNamespace
+
+import global_vars  # noqa: F401  Imported first to settle the model's import order
+from model.characters import Character, Storyteller
+from model.game.game import Game
+from model.game.script import Script
+from model.player import Player, STORYTELLER_ALIGNMENT
+
+STORYTELLERS = 3
+LOOKUPS = 10_000
+
+
+def build_game(players: int) -> Game:
+    """Build a game with the given number of players and STORYTELLERS storytellers."""
+    members = [
+        SimpleNamespace(id=1000 + i, name=f"player{i}", display_name=f"Player {i}", roles=[])
+        for i in range(players + STORYTELLERS)
+    ]
+    seating_order = [
+        Player(Character, "good", member, SimpleNamespace(id=2000 + i), i)
+        for i, member in enumerate(members[:players])
+    ]
+    game = Game(seating_order, None, None, Script([]), skip_storytellers=True)
+    game.storytellers = [
+        Player(Storyteller, STORYTELLER_ALIGNMENT, member, None, None) for member in members[players:]
+    ]
+    return game
+
+
+def _scan(game: Game, user_id: int) -> Player | None:
+    for person in game.seatingOrder:
+        if person.user.id == user_id:
+            return person
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 50, 200], help="Numbers of players")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs of each lookup")
+    args = parser.parse_args()
+
+    print(f"{'players':>8}{'scan':>14}{'index':>14}   (per {LOOKUPS} lookups)")
+    for size in args.sizes:
+        game = build_game(size)
+        user_id = game.seatingOrder[-1].user.id
+        assert _scan(game, user_id) is game.get_player(user_id)
+        scan = min(timeit.repeat(lambda: _scan(game, user_id), number=LOOKUPS, repeat=args.repeat))
+        index = min(timeit.repeat(lambda: game.get_player(user_id), number=LOOKUPS, repeat=args.repeat))
+        print(f"{size:>8}{scan * 1000:>11.2f} ms{index * 1000:>11.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Compare the game-state serializer with dill.
+
+Builds a 15-player game with three days of nominations and whispers, then times
+encoding and decoding the backed-up attributes with both formats and reports their
+sizes. It also times the snapshot a background backup takes on the event loop, against
+the deep copy it used to take.
+
+Usage: ``python -m benchmarks.bench_serializer [--repeat N]``
+"""
+
+import argparse
+import copy
+import datetime
+import random
+import timeit
+from types import SimpleNamespace
+
+import dill
+
+import global_vars
+from model.characters import Character
+from model.characters.specific import Imp
+from model.game.day import Day
+from model.game.game import Game
+from model.game.script import Script
+from model.game.vote import Vote
+from model.persistence import serializer, tracking
+from model.player import Player
+from utils import game_utils
+
+PLAYERS = 15
+DAYS = 3
+WHISPERS_PER_DAY = 60
+NOMINATIONS_PER_DAY = 4
+
+
+class _Server:
+    """Resolves the ids stored for players, standing in for the Discord guild."""
+
+    def __init__(self, members, channels):
+        self._members = {member.id: member for member in members}
+        self._channels = {channel.id: channel for channel in channels}
+
+    def get_member(self, member_id):
+        return self._members.get(member_id)
+
+    def get_channel(self, channel_id):
+        return self._channels.get(channel_id)
+
+
+def build_game() -> Game:
+    """Build a 15-player game after three days of play and make it the current game."""
+    rng = random.Random(0)
+    members = [
+        SimpleNamespace(id=1000 + i, name=f"player{i}", display_name=f"Player {i}", roles=[])
+        for i in range(PLAYERS)
+    ]
+    channels = [SimpleNamespace(id=2000 + i) for i in range(PLAYERS)]
+    global_vars.server = _Server(members, channels)
+
+    players = [
+        Player(Imp if i == 0 else Character, "evil" if i == 0 else "good", member, channel, i)
+        for i, (member, channel) in enumerate(zip(members, channels))
+    ]
+    game = Game(players, None, None, Script(["imp", "washerwoman", "librarian"]), skip_storytellers=True)
+    global_vars.game = game
+
+    time = datetime.datetime(2025, 1, 1, 18, 0)
+    for day_number in range(1, DAYS + 1):
+        day = Day()
+        game.days.append(day)
+        for _ in range(WHISPERS_PER_DAY):
+            sender, recipient = rng.sample(players, 2)
+            time += datetime.timedelta(seconds=rng.randint(5, 120))
+            content = " ".join(rng.choice(["I", "think", "you", "are", "the", "demon", "good"])
+                               for _ in range(rng.randint(3, 20)))
+            recipient._record_message(sender, content, day_number, time,
+                                      "https://discord.com/channels/1/2/3", "https://discord.com/channels/1/2/4")
+        for _ in range(NOMINATIONS_PER_DAY):
+            nominator, nominee = rng.sample(players, 2)
+            vote = Vote(nominee, nominator)
+            for voter in vote.order:
+                vote._record_vote(voter, rng.randint(0, 1))
+            vote.done = True
+            day.votes.append(vote)
+        day.aboutToDie = (day.votes[0].nominee, day.votes[0])
+    return game
+
+
+def _dill_encode(state):
+    return {name: dill.dumps(value) for name, value in state.items()}
+
+
+def _dill_decode(sections):
+    return {name: dill.loads(payload) for name, payload in sections.items()}
+
+
+def _serializer_decode(sections):
+    return serializer.decode_sections(list(sections), sections.__getitem__)
+
+
+def _deep_copy(state):
+    with tracking.suppressed():
+        return copy.deepcopy(state)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Number of timed runs of each operation")
+    args = parser.parse_args()
+
+    build_game()
+    _, _, state = game_utils._snapshot_game("benchmark.pckl", False)
+
+    formats = {
+        "dill": (_dill_encode, _dill_decode),
+        "serializer": (serializer.encode_sections, _serializer_decode),
+    }
+    print(f"{PLAYERS} players, {DAYS} days, {WHISPERS_PER_DAY} whispers and {NOMINATIONS_PER_DAY} votes per day")
+    print(f"{'format':<12}{'bytes':>10}{'encode ms':>12}{'decode ms':>12}")
+    for name, (encode, decode) in formats.items():
+        sections = encode(state)
+        size = sum(len(payload) for payload in sections.values())
+        encode_seconds = min(timeit.repeat(lambda: encode(state), number=1, repeat=args.repeat))
+        decode_seconds = min(timeit.repeat(lambda: decode(sections), number=1, repeat=args.repeat))
+        print(f"{name:<12}{size:>10}{encode_seconds * 1000:>12.2f}{decode_seconds * 1000:>12.2f}")
+
+    # The pause on the event loop before a background backup can be written
+    print(f"{'snapshot':<12}{'loop ms':>10}")
+    for name, take in (("deepcopy", _deep_copy), ("capture", serializer.capture)):
+        seconds = min(timeit.repeat(lambda: take(state), number=1, repeat=args.repeat))
+        print(f"{name:<12}{seconds * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare searching whispers through the word index with scanning every whisper.
+
+Builds a log of whispers between 15 players, then times searching it for single words,
+several words and a phrase, both by checking the content of every whisper, as the search
+command used to, and through the log's index.
+
+Usage: ``python -m benchmarks.bench_whisper_search [--whispers N] [--repeat N]``
+"""
+
+import argparse
+import datetime
+import random
+import timeit
+
+import global_vars  # noqa: F401  Imported first to settle the model's import order
+from model.game.whisper_log import WhisperLog
+
+PLAYERS = 15
+VOCABULARY = [
+    "I", "think", "you", "are", "the", "demon", "good", "evil", "imp", "poisoner", "drunk", "washerwoman",
+    "librarian", "investigator", "chef", "empath", "fortune", "teller", "undertaker", "monk", "ravenkeeper",
+    "virgin", "slayer", "soldier", "mayor", "butler", "recluse", "saint", "spy", "scarlet", "woman", "baron",
+    "nominate", "vote", "execute", "tonight", "tomorrow", "trust", "lying", "claim", "ping", "info", "maybe",
+]
+QUERIES = [["demon"], ["fortune", "teller"], ["you are the imp"], ["zebra"]]
+
+
+def build_log(whispers: int) -> WhisperLog:
+    """Build a log of random whispers between the players."""
+    rng = random.Random(0)
+    people = [object() for _ in range(PLAYERS)]
+    log = WhisperLog()
+    time = datetime.datetime(2025, 1, 1, 18, 0, tzinfo=datetime.timezone.utc)
+    for number in range(whispers):
+        sender, recipient = rng.sample(people, 2)
+        time += datetime.timedelta(seconds=rng.randint(1, 30))
+        content = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(3, 25)))
+        log.record(sender, recipient, content, 1 + number * 5 // whispers, time, "", "")
+    return log
+
+
+def scan(log: WhisperLog, terms: list[str]) -> list:
+    return [whisper for whisper in log if all(term in whisper.content.lower() for term in terms)]
+
+
+def _rebuild_index(log: WhisperLog) -> None:
+    log._search_index = None
+    _ = log.search_index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--whispers", type=int, default=30000, help="Number of whispers in the log")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs of each search")
+    args = parser.parse_args()
+
+    log = build_log(args.whispers)
+    build_seconds = min(timeit.repeat(lambda: _rebuild_index(log), number=1, repeat=args.repeat))
+    print(f"{args.whispers} whispers, index built in {build_seconds * 1000:.1f} ms")
+    print(f"{'query':<20}{'matches':>9}{'scan ms':>10}{'index ms':>10}")
+    for terms in QUERIES:
+        assert scan(log, terms) == log.search(terms)
+        scan_seconds = min(timeit.repeat(lambda: scan(log, terms), number=1, repeat=args.repeat))
+        index_seconds = min(timeit.repeat(lambda: log.search(terms), number=1, repeat=args.repeat))
+        print(f"{' + '.join(terms):<20}{len(log.search(terms)):>9}"
+              f"{scan_seconds * 1000:>10.2f}{index_seconds * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
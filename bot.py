@@ -4,6 +4,8 @@ import discord
 
 import bot_client
 import bot_impl
+import model.settings
+from utils import game_utils
 
 _ = bot_impl.__name__  # need to reference the bot module to "install" event handlers
 
@@ -24,6 +26,10 @@ class BotApp:
                 logging.exception("Ignoring exception")
                 print(str(e))
                 print("Restarting the bot")
+            finally:
+                # Backups are written in the background; make sure the last one reaches the disk
+                game_utils.flush_backups()
+                model.settings.flush_settings()
 
 
 if __name__ == "__main__":
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import inspect
-import itertools
 import math
 import os
 from collections import OrderedDict
@@ -16,8 +15,10 @@ import model.channels
 import model.channels.channel_utils
 import model.characters
 import model.game.script
+import model.game.search_index
 import model.game.vote
 import model.game.whisper_mode
+import model.game.whisper_tally
 import model.nomination_buttons
 import model.player
 import model.settings
@@ -25,6 +26,7 @@ import time_utils
 from commands.registry import registry
 from model import TravelerVote
 from model.game import game
+from model.persistence.backup_service import SnapshotMode
 from utils import player_utils, message_utils, update_presence, text_utils, character_utils, game_utils
 
 # Try to import config, create a mock config module if not available
@@ -53,6 +55,9 @@ except ImportError:
     config.CHANNEL_SUFFIX = 'test'
     config.PREFIXES = (',', '@')
 
+# Settings are stored in JSON files unless the config asks for sqlite
+if getattr(config, "SETTINGS_BACKEND", "json") == "sqlite":
+    model.settings.set_backend(model.settings.SqliteSettingsBackend())
 
 
 # Load all commands into the registry
@@ -90,6 +95,7 @@ async def on_ready():
     global_vars.channel = bot_client.client.get_channel(config.TOWN_SQUARE_CHANNEL_ID)
     global_vars.out_of_play_category = bot_client.client.get_channel(config.OUT_OF_PLAY_CATEGORY_ID)
     global_vars.channel_suffix = config.CHANNEL_SUFFIX
+    game_utils.get_backup_service().snapshot_mode = getattr(config, "BACKUP_SNAPSHOT_MODE", SnapshotMode.THREAD)
     bot_client.logger.info(
         f"server: {global_vars.server.name}, "
         f"game_category: {global_vars.game_category.name if global_vars.game_category else None}, "
@@ -365,7 +371,7 @@ async def on_message(message):
 
             # Welcomes players
             elif command == "welcome":
-                player = await player_utils.select_player(message.author, argument, global_vars.server.members)
+                player = await player_utils.select_player(message.author, argument, player_utils.member_index())
                 if player is None:
                     return
 
@@ -446,7 +452,7 @@ async def on_message(message):
 
                 users: list[discord.Member] = []
                 for person in order:
-                    name = await player_utils.select_player(message.author, person, global_vars.server.members)
+                    name = await player_utils.select_player(message.author, person, player_utils.member_index())
                     if name is None:
                         return
                     users.append(name)
@@ -1104,7 +1110,7 @@ async def on_message(message):
                     await message_utils.safe_send(message.author, "You don't have permission to add travelers.")
                     return
 
-                person = await player_utils.select_player(message.author, argument, global_vars.server.members)
+                person = await player_utils.select_player(message.author, argument, player_utils.member_index())
                 if person is None:
                     return
 
@@ -1482,29 +1488,11 @@ async def on_message(message):
                     await message_utils.safe_send(message.author, "Message not found by ID: {}".format(argument))
                     return
 
-                message_tally = {
-                    X: 0 for X in itertools.combinations(global_vars.game.seatingOrder, 2)
-                }
-                for person in global_vars.game.seatingOrder:
-                    for msg in person.message_history:
-                        if msg["from_player"] == person:
-                            if msg["time"] >= origin_msg.created_at:
-                                if (person, msg["to_player"]) in message_tally:
-                                    message_tally[(person, msg["to_player"])] += 1
-                                elif (msg["to_player"], person) in message_tally:
-                                    message_tally[(msg["to_player"], person)] += 1
-                                else:
-                                    message_tally[(person, msg["to_player"])] = 1
-                sorted_tally = sorted(message_tally.items(), key=lambda x: -x[1])
-                message_text = "Message Tally:"
-                for pair in sorted_tally:
-                    if pair[1] > 0:
-                        message_text += "\n> {person1} - {person2}: {n}".format(
-                            person1=pair[0][0].display_name, person2=pair[0][1].display_name, n=pair[1]
-                        )
-                    else:
-                        message_text += "\n> All other pairs: 0"
-                        break
+                message_text = model.game.whisper_tally.format_tally(
+                    global_vars.game.whisper_tally.since(origin_msg.created_at, global_vars.game.seating),
+                    global_vars.game.seating,
+                    "Message Tally:"
+                )
                 await message_utils.safe_send(message.author, message_text)
             elif command == "whispers":
                 person = None
@@ -2573,52 +2561,33 @@ async def on_message(message):
 
                 author_roles = global_vars.server.get_member(message.author.id).roles
                 if global_vars.gamemaster_role in author_roles or global_vars.observer_role in author_roles:
+                    holder = None
+                else:
+                    holder = player_utils.get_player(message.author)
+                    if not holder:
+                        await message_utils.safe_send(message.author,
+                                                      "You are not in the game. You have no message history.")
+                        return
 
-                    history = []
-                    people = []
-                    for person in global_vars.game.seatingOrder:
-                        for msg in person.message_history:
-                            if not msg["from_player"] in people and not msg["to_player"] in people:
-                                history.append(msg)
-                        people.append(person)
-
-                    history = sorted(history, key=lambda i: i["time"])
-
-                    message_text = "**Messages mentioning {} (Times in UTC):**\n\n**Day 1:**".format(
-                        argument
+                query = model.game.search_index.parse_query(argument)
+                person = None
+                if query.person is not None:
+                    person = await player_utils.select_player(
+                        message.author, query.person, global_vars.game.seatingOrder + global_vars.game.storytellers
                     )
-                    day = 1
-                    for msg in history:
-                        if not (argument.lower() in msg["content"].lower()):
-                            continue
-                        while msg["day"] != day:
-                            await message_utils.safe_send(message.author, message_text)
-                            day += 1
-                            message_text = "**Day {}:**".format(str(day))
-                        message_text += "\nFrom: {} | To: {} | Time: {}\n**{}**".format(
-                            msg["from_player"].display_name,
-                            msg["to_player"].display_name,
-                            msg["time"].strftime("%m/%d, %H:%M:%S"),
-                            msg["content"],
-                        )
-
-                    await message_utils.safe_send(message.author, message_text)
-                    return
+                    if person is None:
+                        return
 
-                if not player_utils.get_player(message.author):
-                    await message_utils.safe_send(message.author,
-                                                  "You are not in the game. You have no message history.")
-                    return
+                # The game's log holds each whisper once, in the order they were sent
+                whispers = global_vars.game.whispers
+                found = whispers.search(query.terms, query.day, person, holder)
 
-                message_text = (
-                    "**Messages mentioning {} (Times in UTC):**\n\n**Day 1:**".format(
-                        argument
-                    )
+                day = query.day or 1
+                message_text = "**Messages mentioning {} (Times in UTC):**\n\n**Day {}:**".format(
+                    argument, day
                 )
-                day = 1
-                for msg in player_utils.get_player(message.author).message_history:
-                    if not (argument.lower() in msg["content"].lower()):
-                        continue
+                for whisper in found:
+                    msg = whispers.message(whisper)
                     while msg["day"] != day:
                         await message_utils.safe_send(message.author, message_text)
                         day += 1
@@ -2784,13 +2753,12 @@ async def check_and_print_if_one_or_zero_to_check_in():
         if not player.has_checked_in and player.alignment != model.player.STORYTELLER_ALIGNMENT
     ]
     if len(not_checked_in) == 1:
-        for memb in global_vars.gamemaster_role.members:
-            await message_utils.safe_send(
-                memb, f"Just waiting on {not_checked_in[0].display_name} to check in."
-            )
+        await message_utils.broadcast(
+            global_vars.gamemaster_role.members,
+            f"Just waiting on {not_checked_in[0].display_name} to check in."
+        )
     if len(not_checked_in) == 0:
-        for memb in global_vars.gamemaster_role.members:
-            await message_utils.safe_send(memb, "Everyone has checked in!")
+        await message_utils.broadcast(global_vars.gamemaster_role.members, "Everyone has checked in!")
 
 
 @bot_client.client.event
@@ -2933,16 +2901,12 @@ async def on_message_edit(before, after):
                    and player.is_ghost == False
             ]
             if len(can_nominate) == 1:
-                for memb in global_vars.gamemaster_role.members:
-                    await message_utils.safe_send(
-                        memb,
-                        "Just waiting on {} to nominate or skip.".format(
-                            can_nominate[0].display_name
-                        ),
-                    )
+                await message_utils.broadcast(
+                    global_vars.gamemaster_role.members,
+                    "Just waiting on {} to nominate or skip.".format(can_nominate[0].display_name)
+                )
             if len(can_nominate) == 0:
-                for memb in global_vars.gamemaster_role.members:
-                    await message_utils.safe_send(memb, "Everyone has nominated or skipped!")
+                await message_utils.broadcast(global_vars.gamemaster_role.members, "Everyone has nominated or skipped!")
 
             global_vars.game.days[-1].skipMessages.append(after.id)
 
@@ -2961,9 +2925,31 @@ async def on_message_edit(before, after):
 # remove_banshee_nomination has been moved to model/characters/specific.py
 
 
+@bot_client.client.event
+async def on_member_join(member):
+    player_utils.index_member(member)
+
+
+@bot_client.client.event
+async def on_member_remove(member):
+    player_utils.unindex_member(member)
+
+
+@bot_client.client.event
+async def on_user_update(before, after):
+    # Username changes arrive as user updates rather than member updates
+    if before.name != after.name or before.display_name != after.display_name:
+        member = global_vars.server.get_member(after.id) if global_vars.server else None
+        if member is not None:
+            player_utils.index_member(member)
+
+
 @bot_client.client.event
 async def on_member_update(before, after):
     # Handles member-level modifications
+    if before.display_name != after.display_name or before.name != after.name:
+        player_utils.index_member(after)
+
     if after == bot_client.client.user:
         return
 
@@ -2980,6 +2966,6 @@ async def on_member_update(before, after):
                                             st_channel=None, position=None)
             global_vars.game.storytellers.append(st_player)
         elif global_vars.gamemaster_role in before.roles and global_vars.gamemaster_role not in after.roles:
-            for st in global_vars.game.storytellers:
-                if st.user.id == after.id:
-                    global_vars.game.storytellers.remove(st)
\ No newline at end of file
+            st = global_vars.game.get_storyteller(after.id)
+            if st:
+                global_vars.game.storytellers.remove(st)
\ No newline at end of file
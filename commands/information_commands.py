@@ -100,6 +100,32 @@ async def disabletally_command(message: discord.Message, argument: str):
     await message_utils.notify_storytellers_about_action(message.author, "disabled the message tally")
 
 
+@registry.command(
+    name="enablelivevotes",
+    description="shows the votes on each nomination in one message, edited as votes come in",
+    help_sections=[HelpSection.CONFIGURE],
+    user_types=[UserType.STORYTELLER],
+    required_phases=[GamePhase.DAY, GamePhase.NIGHT],  # Any phase
+)
+async def enablelivevotes_command(message: discord.Message, argument: str):
+    """Show votes in a live tally message rather than announcing each vote."""
+    global_vars.game.live_vote_tally = True
+    await message_utils.notify_storytellers_about_action(message.author, "enabled the live vote tally")
+
+
+@registry.command(
+    name="disablelivevotes",
+    description="announces each vote in its own message",
+    help_sections=[HelpSection.CONFIGURE],
+    user_types=[UserType.STORYTELLER],
+    required_phases=[GamePhase.DAY, GamePhase.NIGHT],  # Any phase
+)
+async def disablelivevotes_command(message: discord.Message, argument: str):
+    """Announce each vote in its own message."""
+    global_vars.game.live_vote_tally = False
+    await message_utils.notify_storytellers_about_action(message.author, "disabled the live vote tally")
+
+
 @registry.command(
     name="resetseats",
     description="Reset the seating chart to the current order",
@@ -152,9 +178,12 @@ async def history_command(message: discord.Message, argument: str):
 @registry.command(
     name="search",
     description={
-        UserType.STORYTELLER: "views all messages containing content",
-        UserType.OBSERVER: "views all messages containing content",
-        UserType.PLAYER: "views all of your messages containing content"
+        UserType.STORYTELLER: "views all messages containing every word of content in any order, "
+                              "and each \"quoted phrase\" as written, optionally only on day:N or with:player",
+        UserType.OBSERVER: "views all messages containing every word of content in any order, "
+                           "and each \"quoted phrase\" as written, optionally only on day:N or with:player",
+        UserType.PLAYER: "views all of your messages containing every word of content in any order, "
+                         "and each \"quoted phrase\" as written, optionally only on day:N or with:player"
     },
     help_sections=[HelpSection.INFO, HelpSection.PLAYER],
     user_types=[UserType.STORYTELLER, UserType.OBSERVER, UserType.PLAYER],
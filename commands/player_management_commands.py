@@ -249,11 +249,7 @@ async def swapseats_command(message: discord.Message, argument: str):
         return
 
     # Swap the players in the seating order
-    new_seating = game.seatingOrder.copy()
-    index1, index2 = new_seating.index(player1), new_seating.index(player2)
-    new_seating[index1], new_seating[index2] = new_seating[index2], new_seating[index1]
-
-    await game.reseat(new_seating)
+    await game.reseat(game.seating.swapped(player1, player2))
     await message_utils.notify_storytellers_about_action(
         message.author, f"swapped seats of {player1.user.display_name} and {player2.user.display_name}."
     )
@@ -11,6 +11,8 @@ from utils import message_utils
 async def reorder_channels(st_channels: list[discord.TextChannel]):
     result = await ChannelManager(bot_client.client).setup_channels_in_order(st_channels)
     if not result:
-        for st in global_vars.gamemaster_role.members:
-            await message_utils.safe_send(st, "Failed to set up channels. Please review the channel order.")
+        await message_utils.broadcast(
+            global_vars.gamemaster_role.members,
+            "Failed to set up channels. Please review the channel order."
+        )
         return
@@ -6,7 +6,8 @@ Character classes for Blood on the Clocktower game.
 from .base import (
     Character, Townsfolk, Outsider, Minion, Demon, Traveler, Storyteller,
     SeatingOrderModifier, DayStartModifier, NomsCalledModifier, NominationModifier,
-    DayEndModifier, VoteBeginningModifier, VoteModifier, DeathModifier, AbilityModifier
+    DayEndModifier, VoteBeginningModifier, VoteModifier, DeathModifier, AbilityModifier,
+    abilities_changed, abilities_generation
 )
 # Specific character imports are done lazily to avoid circular imports
 # Re-export character registry
@@ -2,9 +2,43 @@
 Base character classes for Blood on the Clocktower game.
 """
 
+import copy
+
 import model
+from model.persistence import Tracked, TrackedList
+
+# Counts changes to which characters and abilities players have, so that indexes of
+# them can tell when they are stale
+_abilities_generation = 0
+
+
+def abilities_changed():
+    """Record that a player's character or abilities changed."""
+    global _abilities_generation
+    _abilities_generation += 1
+
+
+def abilities_generation():
+    """Get a number that changes whenever a player's character or abilities change."""
+    return _abilities_generation
+
+
+class AbilityList(TrackedList):
+    """The abilities of an AbilityModifier, recording every change to them."""
+
+    def _mutated(self):
+        super()._mutated()
+        abilities_changed()
+
+    def __deepcopy__(self, memo):
+        # Copying is not a change; bypass the overridden mutators
+        result = AbilityList()
+        memo[id(self)] = result
+        list.extend(result, [copy.deepcopy(ability, memo) for ability in self])
+        return result
+
 
-class Character:
+class Character(Tracked):
     """A generic character."""
 
     parent: 'model.player.Player'
@@ -219,19 +253,72 @@ class AbilityModifier(
 ):
     """A character which can have different abilities."""
 
+    # The generation it was built at and the table of effective abilities, keyed by class
+    _untracked_attributes = frozenset({"_ability_cache"})
+
     abilities: list[Character]
 
     def __init__(self, parent):
         super().__init__(parent)
         self.abilities = []
 
+    def __setattr__(self, name, value):
+        if name == "abilities":
+            value = AbilityList(value)
+            abilities_changed()
+        super().__setattr__(name, value)
+
+    def __getstate__(self):
+        """Exclude the ability cache from backups; it is rebuilt on first use."""
+        state = self.__dict__.copy()
+        state.pop("_ability_cache", None)
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.__dict__["abilities"] = AbilityList(self.__dict__.get("abilities", []))
+
+    def _flatten(self):
+        """Yield the abilities in the order they are searched, then this character and theirs."""
+        yield from self.abilities
+        yield self
+        for ability in self.abilities:
+            if isinstance(ability, AbilityModifier):
+                yield from ability._flatten()
+            else:
+                yield ability
+
+    def effective_abilities(self):
+        """Get this character's abilities, including those gained through nested abilities.
+
+        The table is cached until this or any other character's abilities change.
+
+        Returns:
+            dict: The first ability that is an instance of each class, keyed by class
+        """
+        cache = self.__dict__.get("_ability_cache")
+        generation = abilities_generation()
+        if cache is None or cache[0] != generation:
+            table = {}
+            for ability in self._flatten():
+                for cls in type(ability).__mro__:
+                    table.setdefault(cls, ability)
+            cache = (generation, table)
+            self._ability_cache = cache
+        return cache[1]
+
+    def _invalidate_abilities(self):
+        self.__dict__.pop("_ability_cache", None)
+
     def refresh(self):
         super().refresh()
         self.abilities = []
+        self._invalidate_abilities()
 
     def add_ability(self, role):
         """Add an ability to this character."""
         self.abilities.append(role(self.parent))
+        self._invalidate_abilities()
 
     def clear_ability(self):
         """Remove an ability from this character."""
@@ -242,6 +329,7 @@ class AbilityModifier(
         if not removed_ability:
             if len(self.abilities):
                 removed_ability = self.abilities.pop()
+        self._invalidate_abilities()
         return removed_ability
 
     def seating_order(self, seatingOrder):
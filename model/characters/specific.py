@@ -3,7 +3,6 @@ Specific character classes for Blood on the Clocktower game.
 """
 
 import asyncio
-import itertools
 
 import bot_client
 import global_vars
@@ -1640,43 +1639,10 @@ class OrganGrinder(base.Minion, base.NominationModifier):
             await announcement.pin()
             this_day = global_vars.game.days[-1]
             this_day.votes[-1].announcements.append(announcement.id)
-            message_tally = {
-                X: 0 for X in itertools.combinations(global_vars.game.seatingOrder, 2)
-            }
-            
-            has_had_multiple_votes = len(this_day.votes) > 1
-            last_vote_message = None if not has_had_multiple_votes else await global_vars.channel.fetch_message(
-                this_day.votes[-2].announcements[0])
-            for person in global_vars.game.seatingOrder:
-                for msg in person.message_history:
-                    if msg["from_player"] == person:
-                        if has_had_multiple_votes:
-                            if msg["time"] >= last_vote_message.created_at:
-                                if (person, msg["to_player"]) in message_tally:
-                                    message_tally[(person, msg["to_player"])] += 1
-                                elif (msg["to_player"], person) in message_tally:
-                                    message_tally[(msg["to_player"], person)] += 1
-                                else:
-                                    message_tally[(person, msg["to_player"])] = 1
-                        else:
-                            if msg["day"] == len(global_vars.game.days):
-                                if (person, msg["to_player"]) in message_tally:
-                                    message_tally[(person, msg["to_player"])] += 1
-                                elif (msg["to_player"], person) in message_tally:
-                                    message_tally[(msg["to_player"], person)] += 1
-                                else:
-                                    message_tally[(person, msg["to_player"])] = 1
-            sorted_tally = sorted(message_tally.items(), key=lambda x: -x[1])
-            messageText = "**Message Tally:**"
-            for pair in sorted_tally:
-                if pair[1] > 0:
-                    messageText += "\n> {person1} - {person2}: {n}".format(
-                        person1=pair[0][0].display_name, person2=pair[0][1].display_name, n=pair[1]
-                    )
-                else:
-                    messageText += "\n> All other pairs: 0"
-                    break
-            await utils.message_utils.safe_send(global_vars.channel, messageText)
+            from model.game.whisper_tally import tally_report
+
+            since_vote = this_day.votes[-2] if len(this_day.votes) > 1 else None
+            await utils.message_utils.safe_send(global_vars.channel, tally_report(global_vars.game, since_vote))
             return False
         return proceed
 
@@ -1827,31 +1793,9 @@ class Riot(base.Demon, base.NominationModifier):
         
         if not this_day.riot_active:
             # show tally on first nomination
-            import itertools
-            message_tally = {
-                X: 0 for X in itertools.combinations(global_vars.game.seatingOrder, 2)
-            }
-            for person in global_vars.game.seatingOrder:
-                for msg in person.message_history:
-                    if msg["from_player"] == person:
-                        if msg["day"] == len(global_vars.game.days):
-                            if (person, msg["to_player"]) in message_tally:
-                                message_tally[(person, msg["to_player"])] += 1
-                            elif (msg["to_player"], person) in message_tally:
-                                message_tally[(msg["to_player"], person)] += 1
-                            else:
-                                message_tally[(person, msg["to_player"])] = 1
-            sorted_tally = sorted(message_tally.items(), key=lambda x: -x[1])
-            messageText = "**Message Tally:**"
-            for pair in sorted_tally:
-                if pair[1] > 0:
-                    messageText += "\n> {person1} - {person2}: {n}".format(
-                        person1=pair[0][0].display_name, person2=pair[0][1].display_name, n=pair[1]
-                    )
-                else:
-                    messageText += "\n> All other pairs: 0"
-                    break
-            await utils.message_utils.safe_send(global_vars.channel, messageText)
+            from model.game.whisper_tally import tally_report
+
+            await utils.message_utils.safe_send(global_vars.channel, tally_report(global_vars.game))
             
         this_day.riot_active = True
         
@@ -0,0 +1,96 @@
+"""Lookup tables from ability classes to the players who have them.
+
+Finding out whether a Voudon is in play, or whether a voter is a screaming Banshee,
+used to walk every player's character and nested abilities several times per vote.
+The game instead keeps, for every class of ability, the players holding one, with
+abilities gained through a Philosopher, Apprentice, Cannibal, Pixie, Amnesiac or any
+other AbilityModifier included. The tables are rebuilt whenever the seating order
+changes or any player's character or abilities change. Being dead or poisoned does
+not take an ability away, so callers check those on the few holders themselves.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence, TypeVar
+
+from model.characters import AbilityModifier, abilities_generation
+from utils import character_utils
+
+if TYPE_CHECKING:
+    from model.characters import Character
+    from model.player import Player
+
+C = TypeVar('C')
+
+
+def _abilities_of(character: Character) -> dict[type, Character]:
+    """Get a character's abilities keyed by every class they are an instance of."""
+    if isinstance(character, AbilityModifier):
+        return character.effective_abilities()
+    return {cls: character for cls in type(character).__mro__}
+
+
+def _state(seating_order: Sequence[Player]) -> tuple:
+    return seating_order, getattr(seating_order, "version", None), abilities_generation()
+
+
+class AbilityIndex:
+    """The abilities of the players in a game, keyed by ability class."""
+
+    def __init__(self, seating_order: Sequence[Player]):
+        """Build the index.
+
+        Args:
+            seating_order: The players in the game
+        """
+        self._state = _state(seating_order)
+        self._abilities: dict[Player, dict[type, Character]] = {}
+        self._holders: dict[type, list[tuple[Player, Character]]] = {}
+        for person in seating_order:
+            abilities = self._abilities[person] = _abilities_of(person.character)
+            for cls, ability in abilities.items():
+                self._holders.setdefault(cls, []).append((person, ability))
+
+    def is_current(self, seating_order: Sequence[Player]) -> bool:
+        """Check whether the index still reflects a game's players.
+
+        Args:
+            seating_order: The current seating order of the game
+
+        Returns:
+            bool: True if neither the seating order nor anyone's abilities changed since
+                the index was built
+        """
+        seating, version, generation = self._state
+        return (
+                seating_order is seating
+                and version is not None
+                and (version, generation) == _state(seating_order)[1:]
+        )
+
+    def holders(self, ability_class: type[C]) -> list[tuple[Player, C]]:
+        """Get the players who have an ability.
+
+        Args:
+            ability_class: The class of the ability
+
+        Returns:
+            The players with the ability and their instance of it, in seating order
+        """
+        return self._holders.get(ability_class, [])
+
+    def ability(self, person: Player, ability_class: type[C]) -> C | None:
+        """Get a player's instance of an ability.
+
+        Args:
+            person: The player
+            ability_class: The class of the ability
+
+        Returns:
+            The ability if the player has it, otherwise None
+        """
+        abilities = self._abilities.get(person)
+        if abilities is None:
+            # Not seated, e.g. a storyteller
+            return character_utils.the_ability(person.character, ability_class)
+        return abilities.get(ability_class)
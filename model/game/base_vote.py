@@ -7,6 +7,8 @@ import discord
 import global_vars
 import model.settings
 from model import nomination_buttons
+from model.game.vote_tally import LiveVoteTally
+from model.persistence import Tracked, journal
 from utils import message_utils, player_utils
 
 
@@ -17,7 +19,7 @@ class VoteOutcome(Enum):
     FAIL = "FAIL"
 
 
-class BaseVote(ABC):
+class BaseVote(Tracked, ABC):
     """Base class for voting systems with shared logic.
 
     Attributes:
@@ -33,6 +35,8 @@ class BaseVote(ABC):
         majority: The number of votes needed for a majority
         position: The current position in the vote order
         done: Whether the vote is done
+        live_tally: Whether votes are shown in one message edited as they come in, rather than
+            announced one message each
     """
 
     # Type annotations for instance attributes
@@ -48,8 +52,12 @@ class BaseVote(ABC):
     majority: int
     position: int
     done: bool
+    # Votes from backups made before the live tally existed announce each vote
+    live_tally: bool = False
     _vote_lock: asyncio.Lock
 
+    _untracked_attributes = frozenset({"_vote_lock", "_live_tally"})
+
     def __init__(self, nominee: model.player.Player | None, nominator: model.player.Player | None) -> None:
         """Initialize a BaseVote.
 
@@ -69,18 +77,20 @@ class BaseVote(ABC):
         self.majority = self._calculate_majority()
         self.position = 0
         self.done = False
+        self.live_tally = global_vars.game.live_vote_tally
         self._vote_lock = asyncio.Lock()  # Prevent race conditions on voting
 
     # Do not allow pickling of the vote lock
     def __getstate__(self):
-        """Exclude _vote_lock from pickling since asyncio.Lock is not serializable."""
+        """Exclude _vote_lock and the live tally from pickling since they are not serializable."""
         state = self.__dict__.copy()
-        state.pop('_vote_lock', None)
+        for name in self._untracked_attributes:
+            state.pop(name, None)
         return state
 
     def __setstate__(self, state):
         """Recreate _vote_lock after unpickling."""
-        self.__dict__.update(state)
+        super().__setstate__(state)
         self._vote_lock = asyncio.Lock()
 
     # Abstract methods (must be implemented by subclasses)
@@ -143,13 +153,6 @@ class BaseVote(ABC):
             voter: The player voting
             vt: The vote weight (0 or 1)
         """
-        # Manage hand state based on vote
-        if vt > 0:  # Yes vote
-            voter.hand_raised = True
-        else:  # No vote
-            voter.hand_raised = False
-        voter.hand_locked_for_vote = True
-
         # Update seating order message immediately
         asyncio.create_task(global_vars.game.update_seating_order_message())
 
@@ -197,7 +200,8 @@ class BaseVote(ABC):
 
         # Call for manual vote
         await message_utils.safe_send(global_vars.channel,
-                                      f"{to_call_user.mention}, your vote on {nominee_name}. Current votes: {self.votes}.")
+                                      f"{to_call_user.mention}, your vote on {nominee_name}. Current votes: {self.votes}.",
+                                      priority=message_utils.Priority.URGENT)
 
         # Activate vote buttons for this player's turn to vote
         await nomination_buttons.activate_vote_buttons_for_player(to_call_user_id)
@@ -210,8 +214,10 @@ class BaseVote(ABC):
             yes_no = ["no", "yes"][default[0]]
             mins = str(time // 60)
             await message_utils.safe_send(to_call_user, f"Will enter a {yes_no} vote in {mins} minutes.")
+            # Storytellers get the calls of a vote in digests rather than one DM per voter
             await message_utils.notify_storytellers(
-                f"{to_call_display_name}'s vote on {nominee_name}. Their default is {yes_no} in {mins} minutes. Current votes: {self.votes}.")
+                f"{to_call_display_name}'s vote on {nominee_name}. Their default is {yes_no} in {mins} minutes. Current votes: {self.votes}.",
+                digest=True)
             await asyncio.sleep(time)
             this_nomination = global_vars.game.days[-1].votes[-1]
             if to_call_player == this_nomination.order[this_nomination.position]:
@@ -219,7 +225,8 @@ class BaseVote(ABC):
                 await self.vote(default[0], voter=to_call_player)
         else:
             await message_utils.notify_storytellers(
-                f"{to_call_display_name}'s vote on {nominee_name}. They have no default. Current votes: {self.votes}.")
+                f"{to_call_display_name}'s vote on {nominee_name}. They have no default. Current votes: {self.votes}.",
+                digest=True)
 
     async def vote(self, vt: int, voter: model.player.Player, operator: discord.Member | None = None) -> None:
         """Executes a vote.
@@ -257,37 +264,89 @@ class BaseVote(ABC):
                     await message_utils.safe_send(operator, reason)
                 return
 
+            # Vote tracking
+            with journal.recording("vote", lambda: {**self._journal_key(), "voter": voter.user.id, "vt": vt}):
+                self._record_vote(voter, vt)
+
             # Apply vote effects
             self._apply_vote_effects(voter, vt)
-
-            # Vote tracking
-            self.history.append(vt)
-            self.votes += self.values[voter][vt]
-            if vt > 0:
-                self.voted.append(voter)
         # end critical section with vote lock
 
         # Announcement
-        text = "yes" if vt > 0 else "no"
-        self.announcements.append(
-            (
-                await message_utils.safe_send(
-                    global_vars.channel,
-                    f"{voter.display_name} votes {text}. {str(self.votes)} votes.",
-                )
-            ).id
-        )
-        await (await global_vars.channel.fetch_message(self.announcements[-1])).pin()
+        if self.live_tally:
+            announcement = await self._live_tally_message().show(self)
+        else:
+            text = "yes" if vt > 0 else "no"
+            announcement = await message_utils.safe_send(
+                global_vars.channel,
+                f"{voter.display_name} votes {text}. {str(self.votes)} votes.",
+                priority=message_utils.Priority.URGENT,
+            )
 
         # Next vote
-        self.position += 1
+        with journal.recording("vote_announced", lambda: {**self._journal_key(), "announcement": announcement.id}):
+            self._record_announcement(announcement.id)
+        if not self.live_tally:
+            await (await global_vars.channel.fetch_message(self.announcements[-1])).pin()
+
         if self.position == len(self.order):
             await self.end_vote()
             return
         await self.call_next()
 
+    def _live_tally_message(self) -> LiveVoteTally:
+        """Get the live tally of this vote, creating it on first use.
+
+        A vote restored from a backup starts a new tally message; the old one is still
+        unpinned when the vote ends.
+        """
+        tally = self.__dict__.get("_live_tally")
+        if tally is None:
+            tally = LiveVoteTally()
+            self._live_tally = tally
+        return tally
+
+    def _record_vote(self, voter: model.player.Player, vt: int) -> None:
+        """Record a vote in the tally and in the voter's hand state.
+
+        Args:
+            voter: The player voting
+            vt: The vote weight (0 or 1)
+        """
+        voter.hand_raised = vt > 0
+        voter.hand_locked_for_vote = True
+
+        self.history.append(vt)
+        self.votes += self.values[voter][vt]
+        if vt > 0:
+            self.voted.append(voter)
+
+    def _record_announcement(self, announcement_id: int) -> None:
+        """Record the announcement of the current vote and move on to the next voter.
+
+        Args:
+            announcement_id: The id of the announcement message
+        """
+        self.announcements.append(announcement_id)
+        self.position += 1
+
+    def _journal_key(self) -> dict[str, int]:
+        """Locate this vote in the game for the journal.
+
+        Returns:
+            dict: The index of the day and of the vote within that day
+        """
+        for day_index, day in enumerate(global_vars.game.days):
+            for vote_index, vote in enumerate(day.votes):
+                if vote is self:
+                    return {"day": day_index, "vote": vote_index}
+        raise LookupError("Vote is not part of the current game")
+
     async def end_vote(self) -> None:
         """When the vote is over."""
+        # Storytellers hear about the last calls of the vote before its result
+        await message_utils.flush_digest()
+
         # Format voter list
         voters_text = self._format_voters_list()
 
@@ -295,6 +354,11 @@ class BaseVote(ABC):
         outcome = self._determine_outcome()
         await self._apply_outcome_effects(outcome)
 
+        # The live tally shows every vote before the result is announced
+        tally = self.__dict__.get("_live_tally")
+        if tally is not None:
+            await tally.flush()
+
         # Send announcement
         message = self._get_outcome_message(outcome)
         await self._send_final_announcement(voters_text, message)
@@ -338,7 +402,13 @@ class BaseVote(ABC):
 
     async def _cleanup_vote_messages(self) -> None:
         """Unpin individual vote messages."""
-        for msg_id in self.announcements:
+        tally = self.__dict__.get("_live_tally")
+        if tally is not None and tally.message is not None:
+            await tally.unpin()
+        # The live tally is recorded as the announcement of every vote it shows
+        for msg_id in dict.fromkeys(self.announcements):
+            if tally is not None and tally.message is not None and msg_id == tally.message.id:
+                continue
             try:
                 message = await global_vars.channel.fetch_message(msg_id)
                 await message.unpin()
@@ -413,10 +483,25 @@ class BaseVote(ABC):
         if self.nominee:
             self.nominee.can_be_nominated = True
 
-        for msg in self.announcements:
+        tally = self.__dict__.get("_live_tally")
+        if tally is not None and tally.message is not None:
+            await tally.unpin()
+        for msg in dict.fromkeys(self.announcements):
+            if tally is not None and tally.message is not None and msg == tally.message.id:
+                continue
             try:
                 await (await global_vars.channel.fetch_message(msg)).unpin()
             except discord.errors.NotFound:
                 pass
         self.done = True
         global_vars.game.days[-1].votes.remove(self)
+
+
+@journal.replayer("vote")
+def _replay_vote(game, day: int, vote: int, voter: int, vt: int) -> None:
+    game.days[day].votes[vote]._record_vote(journal.find_player(game, voter), vt)
+
+
+@journal.replayer("vote_announced")
+def _replay_vote_announced(game, day: int, vote: int, announcement: int) -> None:
+    game.days[day].votes[vote]._record_announcement(announcement)
@@ -1,4 +1,3 @@
-import itertools
 import math
 
 import discord
@@ -8,10 +7,12 @@ import global_vars
 import model.characters
 import model.game.whisper_mode
 import model.nomination_buttons
+from model.game.whisper_tally import tally_report
+from model.persistence import Tracked, journal
 from utils import message_utils, game_utils
 
 
-class Day:
+class Day(Tracked):
     """Stores information about a specific day.
     
     Attributes:
@@ -51,39 +52,49 @@ class Day:
         self.riot_active = False
         self.st_riot_kill_override = False
 
+    def _set_night(self, game):
+        """Close the day and make it nighttime.
+
+        Args:
+            game: The game this day belongs to
+        """
+        game.isDay = False
+        game.whisper_mode = model.game.whisper_mode.WhisperMode.ALL
+        self.isNoms = False
+        self.isPms = False
+
     async def open_pms(self):
         """Opens PMs."""
-        self.isPms = True
-        for memb in global_vars.gamemaster_role.members:
-            await message_utils.safe_send(memb, "PMs are now open.")
+        with journal.recording("pms", lambda: {"is_open": True}):
+            self.isPms = True
+        await message_utils.broadcast(global_vars.gamemaster_role.members, "PMs are now open.")
 
         await game_utils.update_presence(bot_client.client)
 
     async def open_noms(self):
         """Opens nominations."""
-        self.isNoms = True
+        with journal.recording("noms", lambda: {"is_open": True}):
+            self.isNoms = True
         if len(self.votes) == 0:
-            for person in global_vars.game.seatingOrder:
-                if isinstance(person.character, model.characters.NomsCalledModifier):
-                    person.character.on_noms_called()
-        for memb in global_vars.gamemaster_role.members:
-            await message_utils.safe_send(memb, "Nominations are now open.")
+            for character in global_vars.game.hooks.subscribers(model.characters.NomsCalledModifier):
+                character.on_noms_called()
+        await message_utils.broadcast(global_vars.gamemaster_role.members, "Nominations are now open.")
 
         await game_utils.update_presence(bot_client.client)
 
     async def close_pms(self):
         """Closes PMs."""
-        self.isPms = False
-        for memb in global_vars.gamemaster_role.members:
-            await message_utils.safe_send(memb, "PMs are now closed.")
+        with journal.recording("pms", lambda: {"is_open": False}):
+            self.isPms = False
+        await message_utils.broadcast(global_vars.gamemaster_role.members, "PMs are now closed.")
 
         await game_utils.update_presence(bot_client.client)
 
     async def close_noms(self):
         """Closes nominations."""
-        self.isNoms = False
-        for memb in global_vars.gamemaster_role.members:
-            await message_utils.safe_send(memb, "Nominations are now closed.")
+        with journal.recording("noms", lambda: {"is_open": False}):
+            self.isNoms = False
+        await message_utils.broadcast(global_vars.gamemaster_role.members, "Nominations are now closed.")
 
         await game_utils.update_presence(bot_client.client)
 
@@ -140,11 +151,10 @@ class Day:
             # FIXME:there might be a case where a player earlier in the seating order makes the nomination not proceed
             #  but one later in the seating order may be relevant. Short circuit here stops two Riot messages, e.g.
             #  There may need to be some rework based on NominationModifier priority
-            for person in global_vars.game.seatingOrder:
-                if isinstance(person.character, model.characters.NominationModifier) and proceed:
-                    proceed = await person.character.on_nomination(
-                        nominee, nominator, proceed
-                    )
+            for character in global_vars.game.hooks.subscribers(model.characters.NominationModifier):
+                if not proceed:
+                    break
+                proceed = await character.on_nomination(nominee, nominator, proceed)
             if not proceed:
                 # do not proceed with collecting votes
                 return
@@ -177,11 +187,10 @@ class Day:
             #  but one later in the seating order may be relevant. Short circuit here stops two Riot messages, e.g.
             #  There may need to be some rework based on NominationModifier priority
             proceed = True
-            for person in global_vars.game.seatingOrder:
-                if isinstance(person.character, model.characters.NominationModifier) and proceed:
-                    proceed = await person.character.on_nomination(
-                        nominee, nominator, proceed
-                    )
+            for character in global_vars.game.hooks.subscribers(model.characters.NominationModifier):
+                if not proceed:
+                    break
+                proceed = await character.on_nomination(nominee, nominator, proceed)
             if not proceed:
                 # do not proceed with collecting votes
                 return
@@ -231,61 +240,27 @@ class Day:
             # FIXME:there might be a case where a player earlier in the seating order makes the nomination not proceed
             #  but one later in the seating order may be relevant. Short circuit here stops two Riot messages, e.g.
             #  There may need to be some rework based on NominationModifier priority
-            for person in global_vars.game.seatingOrder:
-                if isinstance(person.character, model.characters.NominationModifier) and proceed:
-                    proceed = await person.character.on_nomination(
-                        nominee, nominator, proceed
-                    )
+            for character in global_vars.game.hooks.subscribers(model.characters.NominationModifier):
+                if not proceed:
+                    break
+                proceed = await character.on_nomination(nominee, nominator, proceed)
             if not proceed:
                 # do not proceed with collecting user input for this vote
                 return
 
         if (global_vars.game.show_tally):
-            message_tally = {X: 0 for X in itertools.combinations(global_vars.game.seatingOrder, 2)}
-
-            has_had_multiple_votes = len(self.votes) > 1
-            last_vote_message = None if not has_had_multiple_votes else await global_vars.channel.fetch_message(
-                self.votes[-2].announcements[0])
-
-            for person in global_vars.game.seatingOrder:
-                for msg in person.message_history:
-                    if msg["from_player"] == person:
-                        if has_had_multiple_votes:
-                            if msg["time"] >= last_vote_message.created_at:
-                                if (person, msg["to_player"]) in message_tally:
-                                    message_tally[(person, msg["to_player"])] += 1
-                                elif (msg["to_player"], person) in message_tally:
-                                    message_tally[(msg["to_player"], person)] += 1
-                                else:
-                                    message_tally[(person, msg["to_player"])] = 1
-                        else:
-                            if msg["day"] == len(global_vars.game.days):
-                                if (person, msg["to_player"]) in message_tally:
-                                    message_tally[(person, msg["to_player"])] += 1
-                                elif (msg["to_player"], person) in message_tally:
-                                    message_tally[(msg["to_player"], person)] += 1
-                                else:
-                                    message_tally[(person, msg["to_player"])] = 1
-            sorted_tally = sorted(message_tally.items(), key=lambda x: -x[1])
-            messageText = "**Message Tally:**"
-            for pair in sorted_tally:
-                if pair[1] > 0:
-                    messageText += "\n> {person1} - {person2}: {n}".format(
-                        person1=pair[0][0].display_name, person2=pair[0][1].display_name, n=pair[1]
-                    )
-                else:
-                    messageText += "\n> All other pairs: 0"
-                    break
-            await message_utils.safe_send(global_vars.channel, messageText)
+            since_vote = self.votes[-2] if len(self.votes) > 1 else None
+            await message_utils.safe_send(global_vars.channel, tally_report(global_vars.game, since_vote))
+            # The next nomination's tally starts from here
+            global_vars.game.whisper_tally.checkpoint()
 
         self.votes[-1].announcements.append(announcement.id)
         await self.votes[-1].call_next()
 
     async def end(self):
         """Ends the day."""
-        for person in global_vars.game.seatingOrder:
-            if isinstance(person.character, model.characters.DayEndModifier):
-                person.character.on_day_end()
+        for character in global_vars.game.hooks.subscribers(model.characters.DayEndModifier):
+            character.on_day_end()
 
         for msg in self.voteEndMessages:
             try:
@@ -311,10 +286,8 @@ class Day:
             except discord.errors.DiscordServerError:
                 print("Discord server error: ", str(msg))
 
-        global_vars.game.isDay = False
-        global_vars.game.whisper_mode = model.game.whisper_mode.WhisperMode.ALL
-        self.isNoms = False
-        self.isPms = False
+        with journal.recording("end_day", dict):
+            self._set_night(global_vars.game)
 
         if not self.isExecutionToday:
             await message_utils.safe_send(global_vars.channel, "No one was executed.")
@@ -323,48 +296,27 @@ class Day:
 
         if not global_vars.game.days[-1].riot_active:
             if global_vars.game.show_tally:
-                message_tally = {X: 0 for X in itertools.combinations(global_vars.game.seatingOrder, 2)}
-                has_had_multiple_votes = len(self.votes) > 0
-
-                last_vote_message = None if not has_had_multiple_votes else (
-                    await global_vars.channel.fetch_message(self.votes[-1].announcements[0]) if self.votes and
-                                                                                                self.votes[
-                                                                                                    -1].announcements else None
-                )
-                for person in global_vars.game.seatingOrder:
-                    for msg in person.message_history:
-                        if msg["from_player"] == person:
-                            if has_had_multiple_votes:
-                                if msg["time"] >= last_vote_message.created_at:
-                                    if (person, msg["to_player"]) in message_tally:
-                                        message_tally[(person, msg["to_player"])] += 1
-                                    elif (msg["to_player"], person) in message_tally:
-                                        message_tally[(msg["to_player"], person)] += 1
-                                    else:
-                                        message_tally[(person, msg["to_player"])] = 1
-                            else:
-                                if msg["day"] == len(global_vars.game.days):
-                                    if (person, msg["to_player"]) in message_tally:
-                                        message_tally[(person, msg["to_player"])] += 1
-                                    elif (msg["to_player"], person) in message_tally:
-                                        message_tally[(msg["to_player"], person)] += 1
-                                    else:
-                                        message_tally[(person, msg["to_player"])] = 1
-                sorted_tally = sorted(message_tally.items(), key=lambda x: -x[1])
-                messageText = "**Message Tally:**"
-                for pair in sorted_tally:
-                    if pair[1] > 0:
-                        messageText += "\n> {person1} - {person2}: {n}".format(
-                            person1=pair[0][0].display_name, person2=pair[0][1].display_name, n=pair[1]
-                        )
-                    else:
-                        messageText += "\n> All other pairs: 0"
-                        break
-                await message_utils.safe_send(global_vars.channel, messageText)
+                since_vote = self.votes[-1] if self.votes else None
+                await message_utils.safe_send(global_vars.channel, tally_report(global_vars.game, since_vote))
 
         await game_utils.update_presence(bot_client.client)
 
 
+@journal.replayer("pms")
+def _replay_pms(game, is_open):
+    game.days[-1].isPms = is_open
+
+
+@journal.replayer("noms")
+def _replay_noms(game, is_open):
+    game.days[-1].isNoms = is_open
+
+
+@journal.replayer("end_day")
+def _replay_end_day(game):
+    game.days[-1]._set_night(game)
+
+
 # Import at the end to avoid circular imports
 from model.game.vote import Vote
 from model.game.traveler_vote import TravelerVote
@@ -1,14 +1,24 @@
+from datetime import datetime, timezone
+
 import discord.errors
 
 import bot_client
 import global_vars
 from model.channels import channel_utils
-from model.characters import DayStartModifier, Storyteller, SeatingOrderModifier
+from model.characters import DayStartModifier, Storyteller
+from model.game.ability_index import AbilityIndex
+from model.game.hook_registry import HookRegistry
+from model.game.player_index import PlayerIndex
+from model.game.seating_message import SeatingMessageRenderer
+from model.game.seating_ring import SeatingRing
+from model.game.whisper_log import SENDER, WhisperLog
+from model.game.whisper_tally import WhisperTally
 from model.game.whisper_mode import WhisperMode
+from model.persistence import Tracked, journal
 from utils import message_utils, game_utils
 
 
-class Game:
+class Game(Tracked):
     """Represents a game of Blood on the Clocktower.
     
     Attributes:
@@ -20,9 +30,16 @@ class Game:
         seatingOrderMessage: The message with the seating order
         storytellers: List of storyteller players
         show_tally: Whether to show the whisper tally
+        live_vote_tally: Whether votes are shown in one message per nomination, edited as they come in
         has_automated_life_and_death: Whether life and death is automated
+        journal_sequence: Sequence number of the last journaled mutation applied to the game
+        whispers: The log of every whisper sent in the game
     """
 
+    # Derived from the seating order and storytellers, see players_index, abilities and hooks
+    _untracked_attributes = frozenset({"_player_index", "_ability_index", "_hook_registry", "_seating_ring",
+                                       "_whisper_tally", "_seating_message"})
+
     days: list['model.game.day.Day']
     isDay: bool
     script: 'model.game.script.Script'
@@ -32,7 +49,11 @@ class Game:
     info_channel_seating_order_message: 'discord.Message | None'
     storytellers: list['model.player.Player']
     show_tally: bool
+    # Games from backups made before the live vote tally existed announce each vote
+    live_vote_tally: bool = False
     has_automated_life_and_death: bool
+    journal_sequence: int
+    whispers: WhisperLog
 
     def __init__(self, seating_order, seating_order_message, info_channel_seating_order_message, script,
                  skip_storytellers=False):
@@ -59,53 +80,167 @@ class Game:
             for person in global_vars.gamemaster_role.members
         ] if not skip_storytellers else []
         self.show_tally = False
+        self.live_vote_tally = False
         self.has_automated_life_and_death = False
+        self.journal_sequence = 0
+        self.whispers = WhisperLog()
+        self.share_whispers(self.seatingOrder + self.storytellers)
+
+    def __getstate__(self):
+        """Exclude the indexes from backups; they are rebuilt on first use."""
+        state = self.__dict__.copy()
+        for name in self._untracked_attributes:
+            state.pop(name, None)
+        return state
+
+    @property
+    def players_index(self) -> PlayerIndex:
+        """The players and storytellers keyed by user id and channel id.
+
+        Rebuilt whenever the seating order or the storytellers have changed.
+        """
+        index = self.__dict__.get("_player_index")
+        if index is None or not index.is_current(self.seatingOrder, self.storytellers):
+            index = PlayerIndex(self.seatingOrder, self.storytellers)
+            self._player_index = index
+        return index
+
+    @property
+    def abilities(self) -> AbilityIndex:
+        """The abilities of the players, keyed by ability class.
+
+        Rebuilt whenever the seating order or anyone's character or abilities have changed.
+        """
+        index = self.__dict__.get("_ability_index")
+        if index is None or not index.is_current(self.seatingOrder):
+            index = AbilityIndex(self.seatingOrder)
+            self._ability_index = index
+        return index
+
+    @property
+    def hooks(self) -> HookRegistry:
+        """The players' characters, grouped by the events they modify.
+
+        Rebuilt whenever the seating order or anyone's character or abilities have changed.
+        """
+        registry = self.__dict__.get("_hook_registry")
+        if registry is None or not registry.is_current(self.seatingOrder):
+            registry = HookRegistry(self.seatingOrder)
+            self._hook_registry = registry
+        return registry
+
+    @property
+    def seating(self) -> SeatingRing:
+        """The seating order as a ring, for seat-relative lookups.
+
+        Rebuilt whenever the seating order has changed.
+        """
+        ring = self.__dict__.get("_seating_ring")
+        if ring is None or not ring.is_current(self.seatingOrder):
+            ring = SeatingRing(self.seatingOrder)
+            self._seating_ring = ring
+        return ring
+
+    @property
+    def whisper_tally(self) -> WhisperTally:
+        """Counts of the whispers between each pair of players.
+
+        Built from the senders' message histories on first use, then kept up to date as
+        whispers are sent. Whether the sender is seated is checked when a tally is shown.
+        """
+        tally = self.__dict__.get("_whisper_tally")
+        if tally is None:
+            people = self.whispers.people
+            tally = WhisperTally(
+                (people[whisper.sender], people[whisper.recipient], whisper.day,
+                 datetime.fromtimestamp(whisper.time, timezone.utc))
+                for whisper in self.whispers
+                if whisper.holders & SENDER
+            )
+            self._whisper_tally = tally
+        return tally
+
+    def share_whispers(self, people) -> None:
+        """Give players the game's whisper log.
+
+        Message histories of players restored from a backup made before whispers were
+        logged are merged into it.
+
+        Args:
+            people: The players
+        """
+        legacy = {}
+        for person in people:
+            history = person.__dict__.pop("_legacy_history", None)
+            if history:
+                legacy[person] = history
+            person.whisper_log = self.whispers
+        if legacy:
+            self.whispers.adopt(legacy)
+
+    def record_whisper(self, sender, recipient, day: int, time) -> None:
+        """Count a whisper in the message tally.
+
+        Args:
+            sender: The player who sent the whisper
+            recipient: The player who received it
+            day: The day it was sent on
+            time: When it was sent
+        """
+        tally = self.__dict__.get("_whisper_tally")
+        # Until the tally is first used it is built from the message histories
+        if tally is not None:
+            tally.record(sender, recipient, day, time)
+
+    def get_player(self, user_id: int) -> 'model.player.Player | None':
+        """Find a player in the seating order by their user id.
+
+        Args:
+            user_id: The Discord user id
+
+        Returns:
+            The player, or None if they are not playing
+        """
+        return self.players_index.players.get(user_id)
+
+    def get_storyteller(self, user_id: int) -> 'model.player.Player | None':
+        """Find a storyteller by their user id.
+
+        Args:
+            user_id: The Discord user id
+
+        Returns:
+            The storyteller, or None if they are not a storyteller of this game
+        """
+        return self.players_index.storytellers.get(user_id)
+
+    def get_player_by_channel(self, channel_id: int) -> 'model.player.Player | None':
+        """Find the player whose storyteller channel has the given id.
+
+        Args:
+            channel_id: The Discord channel id
+
+        Returns:
+            The player, or None if the channel is not a player's storyteller channel
+        """
+        return self.players_index.channels.get(channel_id)
+
+    @property
+    def seating_message(self) -> SeatingMessageRenderer:
+        """The renderer keeping the seating order messages up to date."""
+        renderer = self.__dict__.get("_seating_message")
+        if renderer is None:
+            renderer = SeatingMessageRenderer()
+            self._seating_message = renderer
+        return renderer
 
     async def update_seating_order_message(self):
-        """Updates the pinned seating order message with current hand status."""
-        message_text = "**Seating Order:**"
-        for person in self.seatingOrder:
-            person_display_name = person.display_name
-            if person.is_ghost:
-                if person.dead_votes <= 0:
-                    person_display_name = "~~" + person_display_name + "~~ X"
-                else:
-                    person_display_name = (
-                        "~~" + person_display_name + "~~ " + "O" * person.dead_votes
-                    )
-
-            if person.hand_raised:
-                person_display_name += " ✋"
-
-            message_text += "\n{}".format(person_display_name)
-
-            if isinstance(person.character, SeatingOrderModifier):
-                message_text += person.character.seating_order_message(self.seatingOrder)
-
-        if self.seatingOrderMessage:
-            try:
-                await self.seatingOrderMessage.edit(content=message_text)
-            except discord.errors.NotFound:
-                # The message might have been deleted, handle this case if necessary
-                print(f"Warning: Seating order message (ID: {self.seatingOrderMessage.id}) not found. Could not update.")
-            except Exception as e:
-                print(f"Error updating seating order message: {e}")
-
-        if global_vars.info_channel:
-            if self.info_channel_seating_order_message:
-                try:
-                    await self.info_channel_seating_order_message.edit(content=message_text)
-                except discord.errors.NotFound:
-                    self.info_channel_seating_order_message = None  # Reset if not found
-                except Exception as e:
-                    print(f"Error updating info channel seating order message: {e}")
-
-            if not self.info_channel_seating_order_message:  # If message doesn't exist or was reset
-                try:
-                    self.info_channel_seating_order_message = await message_utils.safe_send(global_vars.info_channel,
-                                                                                            message_text)
-                except Exception as e:
-                    print(f"Error sending or pinning info channel seating order message: {e}")
+        """Updates the pinned seating order messages with current hand status.
+
+        Messages already showing the current seating order are not edited, and updates
+        asked for while one is in progress are combined into one.
+        """
+        await self.seating_message.update(self)
 
     async def end(self, winner):
         """Ends the game.
@@ -138,15 +273,8 @@ class Game:
             f"{global_vars.player_role.mention}, {'The game is over.' if winner == 'tie' else f'{winner} has won.'} Good game!",
         )
 
-        """
-        # save backup
-        i = 0
-        while True:
-            i += 1
-            if not os.path.isfile('game_{}.pckl'.format(str(i))):
-                break
-        backup('game_{}.pckl'.format(str(i)))
-        """
+        # keep a record of the game
+        game_utils.archive_game(self, winner)
 
         # delete old backup
         game_utils.remove_backup("current_game.pckl")
@@ -161,24 +289,36 @@ class Game:
         Args:
             new_seating_order: The new seating order
         """
-        # Seating order
-        self.seatingOrder = new_seating_order
-
-        # Update player positions
-        for index, person in enumerate(self.seatingOrder):
-            person.position = index
+        with journal.recording("reseat", lambda: {"order": [person.user.id for person in new_seating_order]}):
+            self._set_seating_order(new_seating_order)
 
         # Update the seating order message using the dedicated method
         await self.update_seating_order_message()
 
         await channel_utils.reorder_channels([x.st_channel for x in self.seatingOrder])
 
+    def _set_seating_order(self, new_seating_order):
+        """Set the seating order and the positions of the players in it.
+
+        Args:
+            new_seating_order: The new seating order
+        """
+        self.seatingOrder = new_seating_order
+        for index, person in enumerate(self.seatingOrder):
+            person.position = index
+
+    def _begin_day(self):
+        """Add a new day and make it daytime."""
+        self.days.append(model.game.day.Day())
+        self.isDay = True
+
     async def add_traveler(self, person):
         """Add a traveler to the game.
         
         Args:
             person: The traveler to add
         """
+        self.share_whispers([person])
         self.seatingOrder.insert(person.position, person)
         await person.user.add_roles(global_vars.player_role, global_vars.traveler_role)
         await self.reseat(self.seatingOrder)
@@ -213,9 +353,12 @@ class Game:
         if kills is None:
             kills = []
 
+        # Each player is reset and then their character acts, in seat order, so a cancelled
+        # day start leaves the later seats as they were
+        starters = {id(character) for character in global_vars.game.hooks.subscribers(DayStartModifier)}
         for person in global_vars.game.seatingOrder:
             await person.morning()
-            if isinstance(person.character, DayStartModifier):
+            if id(person.character) in starters:
                 if not await person.character.on_day_start(origin, kills):
                     return
 
@@ -230,8 +373,8 @@ class Game:
             ),
         )
 
-        self.days.append(model.game.day.Day())
-        self.isDay = True
+        with journal.recording("start_day", dict):
+            self._begin_day()
 
         if global_vars.whisper_channel:
             message = await message_utils.safe_send(global_vars.whisper_channel, f"Start of day {len(self.days)}")
@@ -240,6 +383,16 @@ class Game:
         await game_utils.update_presence(bot_client.client)
 
 
+@journal.replayer("reseat")
+def _replay_reseat(game, order):
+    game._set_seating_order([journal.find_player(game, user_id) for user_id in order])
+
+
+@journal.replayer("start_day")
+def _replay_start_day(game):
+    game._begin_day()
+
+
 # Import at the end to avoid circular imports
 import model.game.day
 
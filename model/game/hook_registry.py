@@ -0,0 +1,112 @@
+"""Lists of the characters that take part in each game event.
+
+Votes, nominations, the start and end of the day and deaths each used to walk the
+whole seating order checking every character's type. The game instead keeps, for each
+modifier type, the characters of that type in seating order, so dispatching an event
+only touches the characters it concerns. The lists are rebuilt whenever the seating
+order changes or any player's character or abilities change.
+
+Characters hold their own abilities, so only the players' characters themselves are
+listed; an AbilityModifier passes events on to its abilities.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import TYPE_CHECKING, Sequence, TypeVar
+
+from model.characters import (
+    AbilityModifier, DayEndModifier, DayStartModifier, DeathModifier, NominationModifier, NomsCalledModifier,
+    SeatingOrderModifier, VoteBeginningModifier, VoteModifier, abilities_generation
+)
+
+if TYPE_CHECKING:
+    from model.player import Player
+
+C = TypeVar('C')
+
+HOOKS = (
+    SeatingOrderModifier, DayStartModifier, NomsCalledModifier, NominationModifier, DayEndModifier,
+    VoteBeginningModifier, VoteModifier, DeathModifier,
+)
+
+
+def _state(seating_order: Sequence[Player]) -> tuple:
+    return seating_order, getattr(seating_order, "version", None), abilities_generation()
+
+
+def _death_priority(character) -> int:
+    return character.on_death_priority() if hasattr(character, 'on_death_priority') else 0
+
+
+class HookRegistry:
+    """The characters of a game's players, grouped by the events they modify."""
+
+    def __init__(self, seating_order: Sequence[Player]):
+        """Build the registry.
+
+        Args:
+            seating_order: The players in the game
+        """
+        self._state = _state(seating_order)
+        self._subscribers: dict[type, list] = {hook: [] for hook in HOOKS}
+        # Death modifiers whose priority is fixed, sorted once, and those whose priority
+        # depends on their abilities, which are placed on every death
+        self._fixed_deaths: list[tuple[int, int, DeathModifier]] = []
+        self._variable_deaths: list[tuple[int, DeathModifier]] = []
+        for seat, person in enumerate(seating_order):
+            character = person.character
+            for hook in HOOKS:
+                if isinstance(character, hook):
+                    self._subscribers[hook].append(character)
+            if hasattr(character, 'on_death'):
+                if isinstance(character, AbilityModifier):
+                    self._variable_deaths.append((seat, character))
+                else:
+                    self._fixed_deaths.append((_death_priority(character), seat, character))
+        self._fixed_deaths.sort(key=lambda entry: entry[:2])
+
+    def is_current(self, seating_order: Sequence[Player]) -> bool:
+        """Check whether the registry still reflects a game's players.
+
+        Args:
+            seating_order: The current seating order of the game
+
+        Returns:
+            bool: True if neither the seating order nor anyone's characters changed since
+                the registry was built
+        """
+        seating, version, generation = self._state
+        return (
+                seating_order is seating
+                and version is not None
+                and (version, generation) == _state(seating_order)[1:]
+        )
+
+    def subscribers(self, hook: type[C]) -> list[C]:
+        """Get the characters that modify an event.
+
+        Args:
+            hook: The modifier class, e.g. VoteModifier
+
+        Returns:
+            The characters of that class, in seating order
+        """
+        return self._subscribers[hook]
+
+    def death_modifiers(self) -> list[DeathModifier]:
+        """Get the characters that modify deaths, in the order they should act.
+
+        Returns:
+            The death modifiers, by ascending priority and then in seating order
+        """
+        if not self._variable_deaths:
+            return [character for _, _, character in self._fixed_deaths]
+        variable = sorted(
+            ((_death_priority(character), seat, character) for seat, character in self._variable_deaths),
+            key=lambda entry: entry[:2],
+        )
+        return [
+            character
+            for _, _, character in heapq.merge(self._fixed_deaths, variable, key=lambda entry: entry[:2])
+        ]
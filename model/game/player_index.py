@@ -0,0 +1,67 @@
+"""Lookup tables from Discord ids to the players of a game.
+
+Players are looked up by user id on almost every message, so the game keeps dicts
+from ids to players instead of scanning its seating order each time. The tables are
+derived from ``seatingOrder`` and ``storytellers`` and rebuilt whenever either list
+is rebound or mutated in place, which covers reseating, travelers joining or leaving,
+storytellers changing and restoring a backup.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    from model.player import Player
+
+
+def _version(people: Sequence[Player]) -> int | None:
+    # Lists that do not count their mutations are never trusted to be unchanged
+    return getattr(people, "version", None)
+
+
+class PlayerIndex:
+    """Players and storytellers of a game, keyed by user id and storyteller channel id."""
+
+    def __init__(self, seating_order: Sequence[Player], storytellers: Sequence[Player]):
+        """Build the index.
+
+        Args:
+            seating_order: The players in the game
+            storytellers: The storytellers of the game
+        """
+        self._seating_order = seating_order
+        self._storytellers = storytellers
+        self._versions = (_version(seating_order), _version(storytellers))
+        self.players: dict[int, Player] = {}
+        self.storytellers: dict[int, Player] = {}
+        self.channels: dict[int, Player] = {}
+        # Reversed so that the first of any duplicates wins, as with a linear scan
+        for person in reversed(seating_order):
+            user_id = person.user_id
+            if user_id is not None:
+                self.players[user_id] = person
+            channel_id = person.st_channel_id
+            if channel_id is not None:
+                self.channels[channel_id] = person
+        for person in reversed(storytellers):
+            user_id = person.user_id
+            if user_id is not None:
+                self.storytellers[user_id] = person
+
+    def is_current(self, seating_order: Sequence[Player], storytellers: Sequence[Player]) -> bool:
+        """Check whether the index still reflects a game's players.
+
+        Args:
+            seating_order: The current seating order of the game
+            storytellers: The current storytellers of the game
+
+        Returns:
+            bool: True if neither list was replaced or changed since the index was built
+        """
+        return (
+                seating_order is self._seating_order
+                and storytellers is self._storytellers
+                and None not in self._versions
+                and self._versions == (_version(seating_order), _version(storytellers))
+        )
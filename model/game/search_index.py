@@ -0,0 +1,162 @@
+"""An inverted index over the content of a game's whispers.
+
+The search command used to gather every player's message history, drop the second copy
+of each whisper, sort them by time and check the search text against every one. The
+whisper log instead keeps, for each word used in a whisper, the rows of the log that use
+it. A search narrows down to the rows holding every word of every term, and only checks
+the text of those, so it stays quick however many whispers the game has. A term still
+matches inside words, as the old search did: the index also keeps every suffix of every
+word in sorted order, so the words containing a term's word are the ones with a suffix
+starting with it, found by bisecting rather than by scanning the whole vocabulary.
+
+Unlike the old search, which looked for the whole text as written, a search matches the
+whispers holding every word of the text in any order; a "quoted phrase" is matched as a
+whole.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+import shlex
+from dataclasses import dataclass, field
+from typing import Iterable
+
+_WORD = re.compile(r"\w+")
+
+
+def words(text: str) -> list[str]:
+    """Split text into the lowercase words the index is keyed by.
+
+    Args:
+        text: The text
+
+    Returns:
+        The words, in order
+    """
+    return _WORD.findall(text.lower())
+
+
+@dataclass
+class SearchQuery:
+    """A parsed search.
+
+    Attributes:
+        terms: Words or quoted phrases which must all appear in a whisper, lowercase
+        day: The only day to search, if any
+        person: The name of a player who must have sent or received the whisper, if any
+    """
+
+    terms: list[str] = field(default_factory=list)
+    day: int | None = None
+    person: str | None = None
+
+
+def parse_query(text: str) -> SearchQuery:
+    """Parse the argument of the search command.
+
+    Words are matched separately and "quoted phrases" as a whole; ``day:N`` limits the
+    search to a day and ``with:name`` to the whispers of a player.
+
+    Args:
+        text: The search text
+
+    Returns:
+        The parsed search
+    """
+    try:
+        parts = shlex.split(text)
+    except ValueError:
+        # An unclosed quote; search for the text as it was written
+        parts = text.split()
+    query = SearchQuery()
+    for part in parts:
+        key, _, value = part.partition(":")
+        if key.lower() == "day" and value.isdigit():
+            query.day = int(value)
+        elif key.lower() == "with" and value:
+            query.person = value
+        elif part:
+            query.terms.append(part.lower())
+    return query
+
+
+class SearchIndex:
+    """The rows of a whisper log using each word."""
+
+    def __init__(self, contents: Iterable[str] = ()):
+        """Build the index.
+
+        Args:
+            contents: The content of the rows already in the log, in order
+        """
+        self._postings: dict[str, list[int]] = {}
+        self._rows = 0
+        for content in contents:
+            self._add_row(content)
+        # Every suffix of every indexed word, with the word, in sorted order
+        self._suffixes: list[tuple[str, str]] = sorted(
+            (word[start:], word) for word in self._postings for start in range(len(word))
+        )
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def add(self, content: str) -> None:
+        """Index the next row of the log.
+
+        Args:
+            content: The content of the whisper
+        """
+        for word in self._add_row(content):
+            for start in range(len(word)):
+                bisect.insort(self._suffixes, (word[start:], word))
+
+    def _add_row(self, content: str) -> list[str]:
+        """Add the next row to the postings, returning the words not indexed before."""
+        row = self._rows
+        self._rows += 1
+        new_words = []
+        for word in set(words(content)):
+            rows = self._postings.get(word)
+            if rows is None:
+                rows = self._postings[word] = []
+                new_words.append(word)
+            rows.append(row)
+        return new_words
+
+    def _containing(self, word: str) -> set[int]:
+        """Get the rows using a word containing the given word."""
+        matched = set()
+        seen = set()
+        position = bisect.bisect_left(self._suffixes, (word,))
+        while position < len(self._suffixes):
+            suffix, indexed = self._suffixes[position]
+            if not suffix.startswith(word):
+                break
+            if indexed not in seen:
+                seen.add(indexed)
+                matched.update(self._postings[indexed])
+            position += 1
+        return matched
+
+    def candidates(self, terms: Iterable[str]) -> list[int] | None:
+        """Find the rows which may contain every term.
+
+        Rows are only ruled out when they lack a word of a term, so the content of the
+        candidates must still be checked against the terms themselves.
+
+        Args:
+            terms: The lowercase search terms
+
+        Returns:
+            The rows in log order, or None if no term has a word to look up
+        """
+        matched: set[int] | None = None
+        for term in terms:
+            for word in words(term):
+                rows = self._containing(word)
+                matched = rows if matched is None else matched & rows
+                if not matched:
+                    return []
+        return None if matched is None else sorted(matched)
@@ -0,0 +1,130 @@
+"""The pinned seating order messages of a game.
+
+Every vote, raised hand, death and reseat updates the seating order messages, and a vote
+asks for an update for each voter in quick succession. Each of those used to rebuild the
+whole text and edit both messages. The renderer instead keeps every player's line, so only
+players whose state changed are formatted again, and remembers what each message last
+showed, so an update that changes nothing edits nothing. Updates never overlap: updates
+asked for while one is editing are folded into a single follow-up showing the latest state.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Sequence
+
+import discord.errors
+
+import global_vars
+from model.characters import SeatingOrderModifier
+from utils import message_utils
+
+if TYPE_CHECKING:
+    from model.game.game import Game
+    from model.player import Player
+
+HEADER = "**Seating Order:**"
+
+
+class SeatingMessageRenderer:
+    """Keeps a game's seating order messages showing the current seating order."""
+
+    def __init__(self):
+        # Each player's state and the line rendered for it
+        self._lines: dict[Player, tuple[tuple, str]] = {}
+        # The message each channel's update last went to, and the hash of the text it shows
+        self._shown: dict[str, tuple[discord.Message, int]] = {}
+        self._task: asyncio.Task | None = None
+        self._stale = False
+
+    def render(self, seating_order: Sequence[Player]) -> str:
+        """Render the seating order message.
+
+        Args:
+            seating_order: The players in seating order
+
+        Returns:
+            The text of the message
+        """
+        parts = [HEADER]
+        for person in seating_order:
+            parts.append(self._line(person))
+            if isinstance(person.character, SeatingOrderModifier):
+                parts[-1] += person.character.seating_order_message(seating_order)
+        return "\n".join(parts)
+
+    def _line(self, person: Player) -> str:
+        state = (person.display_name, person.is_ghost, person.dead_votes, person.hand_raised)
+        cached = self._lines.get(person)
+        if cached is not None and cached[0] == state:
+            return cached[1]
+
+        line = person.display_name
+        if person.is_ghost:
+            line = f"~~{line}~~ " + ("O" * person.dead_votes if person.dead_votes > 0 else "X")
+        if person.hand_raised:
+            line += " ✋"
+        self._lines[person] = (state, line)
+        return line
+
+    async def update(self, game: Game) -> None:
+        """Bring the game's seating order messages up to date.
+
+        Returns once the messages show the game as it was when this was called, or later.
+
+        Args:
+            game: The game whose messages to update
+        """
+        self._stale = True
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._task = asyncio.get_running_loop().create_task(self._run(game))
+        await asyncio.shield(task)
+
+    async def _run(self, game: Game) -> None:
+        while self._stale:
+            self._stale = False
+            text = self.render(game.seatingOrder)
+            await asyncio.gather(self._update_town_square(game, text), self._update_info_channel(game, text))
+
+    def _is_shown(self, channel: str, message: discord.Message, text: str) -> bool:
+        shown = self._shown.get(channel)
+        return shown is not None and shown[0] is message and shown[1] == hash(text)
+
+    async def _update_town_square(self, game: Game, text: str) -> None:
+        message = game.seatingOrderMessage
+        if not message or self._is_shown("town_square", message, text):
+            return
+        try:
+            await message.edit(content=text)
+            self._shown["town_square"] = (message, hash(text))
+        except discord.errors.NotFound:
+            # The message might have been deleted, handle this case if necessary
+            print(f"Warning: Seating order message (ID: {message.id}) not found. Could not update.")
+        except Exception as e:
+            print(f"Error updating seating order message: {e}")
+
+    async def _update_info_channel(self, game: Game, text: str) -> None:
+        if not global_vars.info_channel:
+            return
+
+        message = game.info_channel_seating_order_message
+        if message:
+            if self._is_shown("info_channel", message, text):
+                return
+            try:
+                await message.edit(content=text)
+                self._shown["info_channel"] = (message, hash(text))
+            except discord.errors.NotFound:
+                game.info_channel_seating_order_message = None  # Reset if not found
+            except Exception as e:
+                print(f"Error updating info channel seating order message: {e}")
+
+        if not game.info_channel_seating_order_message:  # If message doesn't exist or was reset
+            try:
+                message = await message_utils.safe_send(global_vars.info_channel, text)
+                game.info_channel_seating_order_message = message
+                if message:
+                    self._shown["info_channel"] = (message, hash(text))
+            except Exception as e:
+                print(f"Error sending or pinning info channel seating order message: {e}")
@@ -0,0 +1,167 @@
+"""The seating order of a game as a ring.
+
+Finding a player's neighbours, the order of a vote or the seats to swap used to search
+and slice the seating order list every time. The game instead keeps each player's seat,
+so a position is a dict lookup, and walks clockwise from any seat without copying the
+list. The nearest living neighbours of every seat are worked out in one pass the first
+time they are needed after someone dies or is revived. The ring is rebuilt whenever the
+seating order changes.
+"""
+
+from __future__ import annotations
+
+from itertools import chain, islice
+from typing import TYPE_CHECKING, Iterator, Sequence
+
+import model.player
+
+if TYPE_CHECKING:
+    from model.player import Player
+
+
+class SeatingRing:
+    """The players of a game in seating order, wrapping around from the last to the first."""
+
+    def __init__(self, seating_order: Sequence[Player]):
+        """Build the ring.
+
+        Args:
+            seating_order: The players in the game
+        """
+        self._seating_order = seating_order
+        self._version = getattr(seating_order, "version", None)
+        self._seats = tuple(seating_order)
+        self._positions = {person: seat for seat, person in enumerate(self._seats)}
+        # The lives generation the living neighbours were found at, and the neighbours
+        self._living: tuple[int, list[Player | None], list[Player | None]] | None = None
+
+    def is_current(self, seating_order: Sequence[Player]) -> bool:
+        """Check whether the ring still reflects a game's seating order.
+
+        Args:
+            seating_order: The current seating order of the game
+
+        Returns:
+            bool: True if the seating order has not changed since the ring was built
+        """
+        return (
+                seating_order is self._seating_order
+                and self._version is not None
+                and getattr(seating_order, "version", None) == self._version
+        )
+
+    def __len__(self) -> int:
+        return len(self._seats)
+
+    def __iter__(self) -> Iterator[Player]:
+        return iter(self._seats)
+
+    def __contains__(self, person: object) -> bool:
+        return person in self._positions
+
+    def position(self, person: Player) -> int | None:
+        """Get a player's seat.
+
+        Args:
+            person: The player
+
+        Returns:
+            The index of their seat, or None if they are not seated
+        """
+        return self._positions.get(person)
+
+    def clockwise_from(self, person: Player, include_start: bool = True) -> Iterator[Player]:
+        """Walk once around the table from a player's seat.
+
+        Args:
+            person: The player to start from
+            include_start: Whether to start with the player, rather than end with them
+
+        Returns:
+            An iterator over every seated player
+
+        Raises:
+            ValueError: If the player is not seated
+        """
+        seat = self._positions.get(person)
+        if seat is None:
+            raise ValueError(f"{person!r} is not in the seating order")
+        if not include_start:
+            seat += 1
+        return chain(islice(self._seats, seat, None), islice(self._seats, seat))
+
+    def neighbors(self, person: Player) -> tuple[Player, Player]:
+        """Get the players seated either side of a player, dead or alive.
+
+        Args:
+            person: The player
+
+        Returns:
+            The players to their left and right
+
+        Raises:
+            ValueError: If the player is not seated
+        """
+        seat = self._positions.get(person)
+        if seat is None:
+            raise ValueError(f"{person!r} is not in the seating order")
+        return self._seats[seat - 1], self._seats[(seat + 1) % len(self._seats)]
+
+    def living_neighbors(self, person: Player) -> list[Player]:
+        """Get the nearest living players either side of a player.
+
+        Args:
+            person: The player, who may be dead themselves
+
+        Returns:
+            The nearest living players to their left and right, or an empty list if they
+                are not seated or nobody else is alive
+        """
+        seat = self._positions.get(person)
+        if seat is None:
+            return []
+        generation = model.player.lives_generation()
+        if self._living is None or self._living[0] != generation:
+            self._living = (generation, *self._find_living_neighbors())
+        _, left, right = self._living
+        return [left[seat], right[seat]] if left[seat] is not None else []
+
+    def _find_living_neighbors(self) -> tuple[list[Player | None], list[Player | None]]:
+        """Find the nearest living player to the left and right of every seat."""
+        count = len(self._seats)
+        left: list[Player | None] = [None] * count
+        right: list[Player | None] = [None] * count
+        # Go round twice so that every seat has seen the living players before it; a seat
+        # only sees itself again if nobody else is alive
+        last_left = last_right = None
+        for step in range(2 * count):
+            seat = step % count
+            mirrored = count - 1 - seat
+            if step >= count:
+                left[seat] = self._seats[last_left] if last_left not in (None, seat) else None
+                right[mirrored] = self._seats[last_right] if last_right not in (None, mirrored) else None
+            if not self._seats[seat].is_ghost:
+                last_left = seat
+            if not self._seats[mirrored].is_ghost:
+                last_right = mirrored
+        return left, right
+
+    def swapped(self, first: Player, second: Player) -> list[Player]:
+        """Get the seating order with two players' seats exchanged.
+
+        Args:
+            first: One of the players
+            second: The other player
+
+        Returns:
+            A new seating order
+
+        Raises:
+            ValueError: If either player is not seated
+        """
+        if first not in self._positions or second not in self._positions:
+            raise ValueError("Both players must be in the seating order")
+        seats = list(self._seats)
+        a, b = self._positions[first], self._positions[second]
+        seats[a], seats[b] = seats[b], seats[a]
+        return seats
@@ -14,9 +14,7 @@ class TravelerVote(BaseVote):
     # Abstract method implementations
     def _get_voting_order(self) -> list[model.player.Player]:
         """Get the order of players for voting."""
-        seating_order = global_vars.game.seatingOrder
-        nominee_index = seating_order.index(self.nominee)
-        return seating_order[nominee_index + 1:] + seating_order[:nominee_index + 1]
+        return list(global_vars.game.seating.clockwise_from(self.nominee, include_start=False))
 
     def _calculate_majority(self) -> int:
         """Calculate the majority needed for this vote type."""
@@ -4,7 +4,7 @@ import math
 import global_vars
 import model.characters
 from model.game.base_vote import BaseVote, VoteOutcome
-from utils import character_utils, player_utils
+from utils import player_utils
 
 
 def in_play_voudon() -> model.player.Player | None:
@@ -13,8 +13,8 @@ def in_play_voudon() -> model.player.Player | None:
     Returns:
         The Voudon player if one is in play and not a ghost, otherwise None
     """
-    return next((x for x in global_vars.game.seatingOrder if
-                 character_utils.the_ability(x.character, model.characters.Voudon) and not x.is_ghost), None)
+    return next((person for person, _ in global_vars.game.abilities.holders(model.characters.Voudon)
+                 if not person.is_ghost), None)
 
 
 def remove_banshee_nomination(banshee_ability_of_player) -> None:
@@ -55,8 +55,13 @@ async def is_storyteller(arg, member_possibilities_fn=None, server_members=None,
     if member_possibilities_fn is None:
         member_possibilities_fn = player_utils.generate_possibilities
 
-    # Use provided server_members or get from global_vars
-    members = server_members if server_members is not None else _server.members
+    # Use provided server_members or the index of the server's members
+    if server_members is not None:
+        members = server_members
+    elif server is not None:
+        members = server.members
+    else:
+        members = player_utils.member_index()
 
     # Generate possibilities for the provided arg
     options = await member_possibilities_fn(arg, members)
@@ -89,36 +94,33 @@ class Vote(BaseVote):
         super().__init__(nominee, nominator)
 
         # Apply vote beginning modifiers
-        for person in global_vars.game.seatingOrder:
-            if isinstance(person.character, model.characters.VoteBeginningModifier):
-                (
-                    self.order,
-                    self.values,
-                    self.majority,
-                ) = person.character.modify_vote_values(
-                    self.order, self.values, self.majority
-                )
+        for character in global_vars.game.hooks.subscribers(model.characters.VoteBeginningModifier):
+            (
+                self.order,
+                self.values,
+                self.majority,
+            ) = character.modify_vote_values(
+                self.order, self.values, self.majority
+            )
 
     # Abstract method implementations
     def _get_voting_order(self) -> list['model.player.Player']:
         """Get the order of players for voting."""
-        seating_order = global_vars.game.seatingOrder
+        seating = global_vars.game.seating
         # When nominating the storyteller, just use the seating order
         if self.nominee is None:
-            ordered_voters = seating_order
+            voters = iter(seating)
         else:
-            nominee_index = seating_order.index(self.nominee)
-            ordered_voters = seating_order[nominee_index + 1:] + seating_order[: nominee_index + 1]
-
-        # augment order with Banshees
-        order_with_banshees = []
-        for person in ordered_voters:
-            order_with_banshees.append(person)
-            banshee_ability = character_utils.the_ability(person.character, model.characters.Banshee)
-            if banshee_ability and banshee_ability.is_screaming:
-                order_with_banshees.append(person)
+            voters = seating.clockwise_from(self.nominee, include_start=False)
 
-        return order_with_banshees
+        # Screaming Banshees vote twice
+        screaming = {
+            person for person, banshee in global_vars.game.abilities.holders(model.characters.Banshee)
+            if banshee.is_screaming
+        }
+        if not screaming:
+            return list(voters)
+        return [voter for person in voters for voter in (person,) * (2 if person in screaming else 1)]
 
     def _calculate_majority(self) -> int:
         """Calculate the majority needed for this vote type."""
@@ -143,9 +145,8 @@ class Vote(BaseVote):
         # TODO: Consider removing this logic
         # I think we should remove this logic, it's not currently used and the fact we're just looping through
         # all players in order means if we had more than one VoteModifier in play, the order is effectively arbitrary.
-        for person in global_vars.game.seatingOrder:
-            if isinstance(person.character, model.characters.VoteModifier):
-                dies, tie = person.character.on_vote_conclusion(dies, tie)
+        for character in global_vars.game.hooks.subscribers(model.characters.VoteModifier):
+            dies, tie = character.on_vote_conclusion(dies, tie)
 
         return VoteOutcome.PASS if dies else VoteOutcome.TIE if tie else VoteOutcome.FAIL
 
@@ -180,7 +181,7 @@ class Vote(BaseVote):
 
     def _validate_vote(self, voter: 'model.player.Player', vt: int) -> tuple[bool, str]:
         """Validate if a vote is allowed."""
-        potential_banshee = character_utils.the_ability(voter.character, model.characters.Banshee)
+        potential_banshee = global_vars.game.abilities.ability(voter, model.characters.Banshee)
         voudon_in_play = in_play_voudon()
         player_is_active_banshee = potential_banshee and potential_banshee.is_screaming
 
@@ -196,7 +197,7 @@ class Vote(BaseVote):
         # Call parent to handle hand state and seating order update
         super()._apply_vote_effects(voter, vt)
 
-        potential_banshee = character_utils.the_ability(voter.character, model.characters.Banshee)
+        potential_banshee = global_vars.game.abilities.ability(voter, model.characters.Banshee)
         voudon_in_play = in_play_voudon()
         player_is_active_banshee = potential_banshee and potential_banshee.is_screaming
 
@@ -206,17 +207,15 @@ class Vote(BaseVote):
             asyncio.create_task(voter.remove_dead_vote())
 
         # On vote character powers
-        for person in global_vars.game.seatingOrder:
-            if isinstance(person.character, model.characters.VoteModifier):
-                person.character.on_vote()
+        for character in global_vars.game.hooks.subscribers(model.characters.VoteModifier):
+            character.on_vote()
 
     def _should_skip_voter(self, voter: 'model.player.Player') -> bool:
         """Check if a player should be skipped (not asked to vote)."""
 
         # Call vote modifiers
-        for person in global_vars.game.seatingOrder:
-            if isinstance(person.character, model.characters.VoteModifier):
-                person.character.on_vote_call(voter)
+        for character in global_vars.game.hooks.subscribers(model.characters.VoteModifier):
+            character.on_vote_call(voter)
 
         the_voudon = in_play_voudon()
         if the_voudon:
@@ -224,7 +223,7 @@ class Vote(BaseVote):
            return not ((voter == the_voudon) or voter.is_ghost)
 
         # Skip ghosts without dead votes (unless they have special abilities)
-        player_banshee_ability = character_utils.the_ability(voter.character, model.characters.Banshee)
+        player_banshee_ability = global_vars.game.abilities.ability(voter, model.characters.Banshee)
         player_is_active_banshee = player_banshee_ability and player_banshee_ability.is_screaming
         return voter.is_ghost and voter.dead_votes < 1 and not player_is_active_banshee and not the_voudon
 
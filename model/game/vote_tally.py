@@ -0,0 +1,124 @@
+"""A live tally of the votes on a nomination, kept in one message.
+
+Normally every vote is announced in its own message, which is then fetched to be pinned,
+and fetched again to be unpinned when the vote ends. With the live tally, the first vote
+posts and pins a single message, and later votes edit it in place. Edits are made at most
+once every EDIT_INTERVAL seconds, and votes cast in the meantime are shown together in the
+next edit. A failed edit is retried after RETRY_DELAY seconds, doubling each time, and
+after EDIT_ATTEMPTS failures in a row is left for the next vote to try again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from typing import TYPE_CHECKING
+
+import discord
+
+import global_vars
+from utils import message_utils, player_utils
+
+if TYPE_CHECKING:
+    from model.game.base_vote import BaseVote
+
+# Fewest seconds between two edits of a tally message
+EDIT_INTERVAL = 1.0
+# Seconds before retrying the first failed edit, and failed edits in a row before giving up
+RETRY_DELAY = 1.0
+EDIT_ATTEMPTS = 4
+
+
+class LiveVoteTally:
+    """The message showing the votes cast on a nomination so far."""
+
+    def __init__(self):
+        self.message: discord.Message | None = None
+        # The text the message shows, and the text it should show
+        self._shown: str | None = None
+        self._text: str | None = None
+        self._last_edit = -math.inf
+        self._editing: asyncio.Task | None = None
+
+    @staticmethod
+    def render(vote: BaseVote) -> str:
+        """Render the tally of a vote.
+
+        Args:
+            vote: The vote to show
+
+        Returns:
+            The text of the tally message
+        """
+        nominee_name = player_utils.get_player_display_name(vote.nominee)
+        nominator_name = player_utils.get_player_display_name(vote.nominator)
+        lines = [f"**Votes on {nominee_name}** (nominated by {nominator_name}): {vote.votes} votes."]
+        for voter, vt in zip(vote.order, vote.history):
+            lines.append(f"{voter.display_name} votes {'yes' if vt > 0 else 'no'}.")
+        return "\n".join(lines)
+
+    async def show(self, vote: BaseVote) -> discord.Message | None:
+        """Show the latest votes, posting and pinning the message on the first call.
+
+        Later calls return at once; the message is edited in the background.
+
+        Args:
+            vote: The vote to show
+
+        Returns:
+            The tally message, or None if it could not be sent
+        """
+        self._text = self.render(vote)
+        if self.message is None:
+            self.message = await message_utils.safe_send(
+                global_vars.channel, self._text, priority=message_utils.Priority.URGENT
+            )
+            if self.message is not None:
+                self._shown = self._text
+                await self.message.pin()
+            return self.message
+
+        if self._editing is None or self._editing.done():
+            self._editing = asyncio.get_running_loop().create_task(self._edit())
+        return self.message
+
+    async def _edit(self) -> None:
+        loop = asyncio.get_running_loop()
+        failures = 0
+        while self._text != self._shown:
+            wait = self._last_edit + EDIT_INTERVAL - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            text = self._text
+            self._last_edit = loop.time()
+            try:
+                await self.message.edit(content=text)
+            except discord.errors.NotFound:
+                print("Missing message: ", str(self.message.id))
+                return
+            except discord.errors.HTTPException as e:
+                print(f"Error updating vote tally message: {e}")
+                failures += 1
+                if failures >= EDIT_ATTEMPTS:
+                    # The message still shows the old text, so the next vote tries again
+                    return
+                await asyncio.sleep(RETRY_DELAY * 2 ** (failures - 1))
+                continue
+            self._shown = text
+            failures = 0
+
+    async def flush(self) -> None:
+        """Wait until the message shows the latest votes."""
+        if self._editing is not None and not self._editing.done():
+            await self._editing
+
+    async def unpin(self) -> None:
+        """Unpin the message, once it shows the latest votes."""
+        await self.flush()
+        if self.message is not None:
+            try:
+                await self.message.unpin()
+            except discord.errors.NotFound:
+                print("Missing message: ", str(self.message.id))
+            except discord.errors.DiscordServerError:
+                print("Discord server error: ", str(self.message.id))
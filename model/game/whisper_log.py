@@ -0,0 +1,273 @@
+"""The whispers sent in a game, each stored once.
+
+Every whisper used to be stored twice, as a dict in both the sender's and the
+recipient's message history, each holding the players themselves, the content, the time
+and a jump URL, so a long game backed up every whisper twice over. The game instead
+keeps one log of compact rows, shared by its players, holding the positions of the two
+players in the log's list of people, the day, the time as a Unix timestamp, the content
+and both jump URLs. Each row records
+which of its two players have it in their history, so that the per-player lists of rows
+can be rebuilt rather than backed up.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, NamedTuple
+
+from model.game.search_index import SearchIndex
+from model.persistence import Tracked
+
+if TYPE_CHECKING:
+    from model.player import MessageDict, Player
+
+# Which players of a whisper have it in their history
+SENDER = 1
+RECIPIENT = 2
+
+
+class Whisper(NamedTuple):
+    """A whisper, as stored in the log."""
+
+    # Positions in the log's list of people
+    sender: int
+    recipient: int
+    day: int
+    time: float
+    content: str
+    recipient_jump: str
+    sender_jump: str
+    holders: int = SENDER | RECIPIENT
+
+
+def _timestamp(time: datetime) -> float:
+    """Get a Unix timestamp, reading times without a time zone as UTC."""
+    if time.tzinfo is None:
+        time = time.replace(tzinfo=timezone.utc)
+    return time.timestamp()
+
+
+class WhisperLog(Tracked):
+    """An append-only log of the whispers in a game."""
+
+    # Rebuilt from the rows and people
+    _untracked_attributes = frozenset({"_histories", "_positions", "_search_index"})
+    # Lists of immutable rows, which a backup copies without copying the rows
+    _shared_attributes = frozenset({"whispers"})
+
+    whispers: list[Whisper]
+    people: list[Player]
+
+    def __init__(self):
+        self.whispers = []
+        self.people = []
+        self._positions: dict[Player, int] = {}
+        self._histories: dict[int, list[int]] = {}
+        self._search_index: SearchIndex | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Exclude the lookups from backups; they are rebuilt on restore."""
+        return {"whispers": self.whispers, "people": self.people}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        super().__setstate__(state)
+        self.whispers[:] = [Whisper(*row) for row in self.whispers]
+        self._positions = {person: position for position, person in enumerate(self.people)}
+        self._search_index = None
+        self._index()
+
+    def _index(self) -> None:
+        self._histories = {}
+        for row, whisper in enumerate(self.whispers):
+            self._add_to_histories(row, whisper)
+
+    def _add_to_histories(self, row: int, whisper: Whisper) -> None:
+        if whisper.holders & RECIPIENT:
+            self._histories.setdefault(whisper.recipient, []).append(row)
+        if whisper.holders & SENDER:
+            self._histories.setdefault(whisper.sender, []).append(row)
+
+    def _position(self, person: Player) -> int:
+        position = self._positions.get(person)
+        if position is None:
+            position = self._positions[person] = len(self.people)
+            self.people.append(person)
+        return position
+
+    def record(
+            self,
+            sender: Player,
+            recipient: Player,
+            content: str,
+            day: int,
+            time: datetime,
+            recipient_jump: str,
+            sender_jump: str,
+            holders: int = SENDER | RECIPIENT,
+    ) -> None:
+        """Add a whisper to the log.
+
+        Args:
+            sender: The player sending the whisper
+            recipient: The player receiving it
+            content: The message content
+            day: The day it was sent on
+            time: When it was delivered
+            recipient_jump: The jump URL to the delivered message
+            sender_jump: The jump URL to the original message
+            holders: Which of the two players have it in their history
+        """
+        whisper = Whisper(self._position(sender), self._position(recipient), day, _timestamp(time), content,
+                          recipient_jump, sender_jump, holders)
+        self.whispers.append(whisper)
+        self._add_to_histories(len(self.whispers) - 1, whisper)
+        if self._search_index is not None:
+            self._search_index.add(content)
+
+    def __len__(self) -> int:
+        return len(self.whispers)
+
+    def __iter__(self) -> Iterator[Whisper]:
+        return iter(self.whispers)
+
+    def message(self, whisper: Whisper, jump: str | None = None) -> MessageDict:
+        """Expand a row of the log into a message.
+
+        Args:
+            whisper: The row
+            jump: The jump URL to include; the sender's by default
+
+        Returns:
+            The message
+        """
+        return {
+            "from_player": self.people[whisper.sender],
+            "to_player": self.people[whisper.recipient],
+            "content": whisper.content,
+            "day": whisper.day,
+            "time": datetime.fromtimestamp(whisper.time, timezone.utc),
+            "jump": whisper.sender_jump if jump is None else jump,
+        }
+
+    def messages(self) -> Iterator[MessageDict]:
+        """Get every whisper in the log, once each, in the order they were sent.
+
+        Returns:
+            The whispers as messages
+        """
+        return (self.message(whisper) for whisper in self.whispers)
+
+    def history(self, person: Player) -> list[MessageDict]:
+        """Get a player's message history.
+
+        Args:
+            person: The player
+
+        Returns:
+            The whispers they sent or received, oldest first, each with the jump URL to
+                their own copy
+        """
+        position = self._positions.get(person)
+        return [
+            self.message(whisper, whisper.recipient_jump if whisper.recipient == position else whisper.sender_jump)
+            for whisper in map(self.whispers.__getitem__, self._histories.get(position, ()))
+        ]
+
+    def replace_history(self, person: Player, messages: Iterable[MessageDict]) -> None:
+        """Replace a player's message history.
+
+        The whispers leave the player's history but stay in the other player's.
+
+        Args:
+            person: The player
+            messages: Their new message history
+        """
+        position = self._positions.get(person)
+        for row in self._histories.pop(position, []):
+            whisper = self.whispers[row]
+            self.whispers[row] = whisper._replace(
+                holders=whisper.holders & ~(SENDER if whisper.sender == position else RECIPIENT)
+            )
+        self._index()
+        for msg in messages:
+            sent = msg["from_player"] is person
+            jump = msg.get("jump", "")
+            self.record(msg["from_player"], msg["to_player"], msg["content"], msg["day"], msg["time"],
+                        "" if sent else jump, jump if sent else "", SENDER if sent else RECIPIENT)
+
+    def adopt(self, histories: dict[Player, list[MessageDict]]) -> None:
+        """Merge message histories from a backup made before whispers were logged.
+
+        Each whisper was stored in both players' histories; the two copies become one row.
+
+        Args:
+            histories: The message history of each player
+        """
+        rows: dict[tuple, list[int]] = {}
+        merged = sorted(
+            ((msg, person) for person, history in histories.items() for msg in history),
+            key=lambda entry: _timestamp(entry[0]["time"]),
+        )
+        for msg, person in merged:
+            sender, recipient = self._position(msg["from_player"]), self._position(msg["to_player"])
+            key = (sender, recipient, msg["day"], _timestamp(msg["time"]), msg["content"])
+            holder = SENDER if msg["from_player"] is person else RECIPIENT
+            copies = rows.setdefault(key, [])
+            row = next((row for row in copies if not self.whispers[row].holders & holder), None)
+            if row is not None:
+                whisper = self.whispers[row]
+                jumps = {"sender_jump": msg["jump"]} if holder == SENDER else {"recipient_jump": msg["jump"]}
+                self.whispers[row] = whisper._replace(holders=whisper.holders | holder, **jumps)
+                continue
+            copies.append(len(self.whispers))
+            self.record(msg["from_player"], msg["to_player"], msg["content"], msg["day"], msg["time"],
+                        "" if holder == SENDER else msg["jump"], msg["jump"] if holder == SENDER else "",
+                        holder)
+        self._index()
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """The index of the words used in each row, built from the rows when first used."""
+        if self._search_index is None:
+            self._search_index = SearchIndex(whisper.content for whisper in self.whispers)
+        return self._search_index
+
+    def search(
+            self,
+            terms: list[str],
+            day: int | None = None,
+            person: Player | None = None,
+            holder: Player | None = None,
+    ) -> list[Whisper]:
+        """Find the whispers containing every term.
+
+        Args:
+            terms: Lowercase words or phrases, each of which must appear in the content
+            day: Only search whispers sent on this day
+            person: Only search whispers sent or received by this player
+            holder: Only search this player's message history
+
+        Returns:
+            The matching whispers, in the order they were sent
+        """
+        rows = self.search_index.candidates(terms)
+        if holder is not None:
+            held = self._histories.get(self._positions.get(holder), [])
+            rows = held if rows is None else sorted(set(rows).intersection(held))
+        elif rows is None:
+            rows = range(len(self.whispers))
+        position = self._positions.get(person) if person is not None else None
+        if person is not None and position is None:
+            return []
+
+        found = []
+        for row in rows:
+            whisper = self.whispers[row]
+            if day is not None and whisper.day != day:
+                continue
+            if position is not None and position not in (whisper.sender, whisper.recipient):
+                continue
+            content = whisper.content.lower()
+            if all(term in content for term in terms):
+                found.append(whisper)
+        return found
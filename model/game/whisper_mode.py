@@ -60,8 +60,6 @@ async def choose_whisper_candidates(game, author):
     if game.whisper_mode == WhisperMode.NEIGHBORS:
         # determine neighbors
         player_self = player_utils.get_player(author)
-        author_index = game.seatingOrder.index(player_self)
-        neighbor_left = game.seatingOrder[(author_index - 1) % len(game.seatingOrder)]
-        neighbor_right = game.seatingOrder[(author_index + 1) % len(game.seatingOrder)]
+        neighbor_left, neighbor_right = game.seating.neighbors(player_self)
         return [neighbor_left, player_self, neighbor_right] + game.storytellers
     return []
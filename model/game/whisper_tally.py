@@ -0,0 +1,208 @@
+"""Counts of the whispers exchanged between each pair of players.
+
+The message tally shown at nominations and at the end of the day used to seed a count
+for every pair of players and then walk every player's whole message history, fetching
+the previous nomination from Discord to find where the window started. The game instead
+counts whispers as they are sent, in a square table with a row for each sender and a
+column for each recipient. Any window is the difference between the table now and a
+snapshot of it at the window's start; snapshots hold only the pairs that had whispered,
+and are taken at each nomination or worked out from the nearest earlier one when first
+asked for.
+
+As when the tally was counted from the histories of the seated players, a whisper counts
+if its sender is seated when the tally is shown, not when it was sent: every whisper is
+recorded, and whispers from people who are not seated are left out of each window.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime
+from operator import itemgetter
+from typing import TYPE_CHECKING, Container, Iterable
+
+import discord
+
+if TYPE_CHECKING:
+    from model.game.base_vote import BaseVote
+    from model.game.game import Game
+    from model.game.seating_ring import SeatingRing
+    from model.player import Player
+
+# A recorded whisper: when it was sent, on which day, and the table slots of the sender and recipient
+_Entry = tuple[datetime, int, int, int]
+# Whisper counts keyed by the slots of a sender and recipient
+_Snapshot = dict[tuple[int, int], int]
+
+
+class WhisperTally:
+    """Running counts of whispers between pairs of players."""
+
+    def __init__(self, whispers: Iterable[tuple[Player, Player, int, datetime]] = ()):
+        """Build the tally.
+
+        Args:
+            whispers: Whispers already sent, as (sender, recipient, day, time)
+        """
+        self._slots: dict[Player, int] = {}
+        self._people: list[Player] = []
+        self._capacity = 0
+        self._counts = array('L')
+        self._pairs: list[tuple[int, int]] = []
+        self._log: list[_Entry] = []
+        # Snapshots of the counts, keyed by how many whispers of the log they include
+        self._snapshots: dict[int, _Snapshot] = {0: {}}
+        for sender, recipient, day, time in sorted(whispers, key=itemgetter(3)):
+            self.record(sender, recipient, day, time)
+
+    def _slot(self, person: Player) -> int:
+        slot = self._slots.get(person)
+        if slot is None:
+            slot = self._slots[person] = len(self._people)
+            self._people.append(person)
+            if slot >= self._capacity:
+                self._grow(max(8, 2 * self._capacity))
+        return slot
+
+    def _grow(self, capacity: int) -> None:
+        counts = array('L', bytes(capacity * capacity * array('L').itemsize))
+        for a, b in self._pairs:
+            counts[a * capacity + b] = self._counts[a * self._capacity + b]
+        self._counts, self._capacity = counts, capacity
+
+    def record(self, sender: Player, recipient: Player, day: int, time: datetime) -> None:
+        """Count a whisper.
+
+        Args:
+            sender: The player who sent the whisper
+            recipient: The player who received it
+            day: The day it was sent on
+            time: When it was sent
+        """
+        a, b = self._slot(sender), self._slot(recipient)
+        entry = (time, day, a, b)
+        if self._log and time < self._log[-1][0]:
+            # Delivered out of order; snapshots past it no longer match the log
+            position = bisect_left(self._log, time, key=itemgetter(0))
+            insort(self._log, entry, key=itemgetter(0))
+            for taken in [taken for taken in self._snapshots if taken > position]:
+                del self._snapshots[taken]
+        else:
+            self._log.append(entry)
+        index = a * self._capacity + b
+        if not self._counts[index]:
+            self._pairs.append((a, b))
+        self._counts[index] += 1
+
+    def checkpoint(self) -> None:
+        """Snapshot the counts so far, to start a window from now cheaply."""
+        self._snapshot(len(self._log))
+
+    def _snapshot(self, position: int) -> _Snapshot:
+        """Get the counts of the first position whispers of the log."""
+        snapshot = self._snapshots.get(position)
+        if snapshot is None:
+            if position == len(self._log):
+                snapshot = {pair: self._counts[pair[0] * self._capacity + pair[1]] for pair in self._pairs}
+            else:
+                start = max(taken for taken in self._snapshots if taken < position)
+                snapshot = dict(self._snapshots[start])
+                for _, _, a, b in self._log[start:position]:
+                    snapshot[a, b] = snapshot.get((a, b), 0) + 1
+            self._snapshots[position] = snapshot
+        return snapshot
+
+    def _window(self, position: int, senders: Container[Player] | None) -> list[tuple[Player, Player, int]]:
+        start = self._snapshot(position)
+        # Counts in both directions are added up, keyed by the lower slot first
+        window: dict[tuple[int, int], int] = {}
+        for a, b in self._pairs:
+            count = self._counts[a * self._capacity + b] - start.get((a, b), 0)
+            if count and (senders is None or self._people[a] in senders):
+                pair = (a, b) if a < b else (b, a)
+                window[pair] = window.get(pair, 0) + count
+        return [(self._people[a], self._people[b], count) for (a, b), count in window.items()]
+
+    def since(self, time: datetime, senders: Container[Player] | None = None) -> list[tuple[Player, Player, int]]:
+        """Count the whispers sent at or after a time.
+
+        Args:
+            time: The start of the window
+            senders: Only count whispers sent by these people, if given
+
+        Returns:
+            Each pair who whispered in the window, with how many times
+        """
+        return self._window(bisect_left(self._log, time, key=itemgetter(0)), senders)
+
+    def on_day(self, day: int, senders: Container[Player] | None = None) -> list[tuple[Player, Player, int]]:
+        """Count the whispers sent on a day, or since it if it is the current day.
+
+        Args:
+            day: The day number
+            senders: Only count whispers sent by these people, if given
+
+        Returns:
+            Each pair who whispered on the day, with how many times
+        """
+        return self._window(bisect_left(self._log, day, key=itemgetter(1)), senders)
+
+    def __len__(self) -> int:
+        return len(self._log)
+
+
+def format_tally(
+        window: list[tuple[Player, Player, int]],
+        seating: SeatingRing,
+        heading: str = "**Message Tally:**",
+) -> str:
+    """Format a message tally, busiest pairs first.
+
+    Args:
+        window: The pairs who whispered and how many times, from a WhisperTally
+        seating: The seating order, to order pairs and find the pairs who never whispered
+        heading: The first line of the report
+
+    Returns:
+        The report, ending with a line for the pairs who never whispered, if any
+    """
+    def seat(person: Player) -> int:
+        position = seating.position(person)
+        return len(seating) if position is None else position
+
+    rows = []
+    seated_pairs = 0
+    for first, second, count in window:
+        if seat(second) < seat(first):
+            first, second = second, first
+        if second in seating:
+            seated_pairs += 1
+        rows.append((-count, seat(first), seat(second), first, second, count))
+    rows.sort(key=itemgetter(0, 1, 2))
+
+    message_text = heading
+    for _, _, _, first, second, count in rows:
+        message_text += f"\n> {first.display_name} - {second.display_name}: {count}"
+    if seated_pairs < len(seating) * (len(seating) - 1) // 2:
+        message_text += "\n> All other pairs: 0"
+    return message_text
+
+
+def tally_report(game: Game, since_vote: BaseVote | None = None, heading: str = "**Message Tally:**") -> str:
+    """Format the message tally since a vote was announced, or for the current day.
+
+    Args:
+        game: The game
+        since_vote: The vote whose announcement starts the window, if any
+        heading: The first line of the report
+
+    Returns:
+        The report
+    """
+    if since_vote is not None and since_vote.announcements:
+        # Announcement ids are snowflakes, which encode when the message was sent
+        window = game.whisper_tally.since(discord.utils.snowflake_time(since_vote.announcements[0]), game.seating)
+    else:
+        window = game.whisper_tally.on_day(len(game.days), game.seating)
+    return format_tally(window, game.seating, heading)
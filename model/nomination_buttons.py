@@ -7,7 +7,7 @@ import global_vars
 import model.characters
 from model import game, player
 from model.game.vote import in_play_voudon
-from utils import character_utils, message_utils, player_utils
+from utils import message_utils, player_utils
 
 # Global tracking of nomination button messages by player ID
 _active_nomination_messages: dict[int, tuple[discord.Message, 'NominationButtonsView']] = {}
@@ -58,11 +58,8 @@ class NominationButtonsView(discord.ui.View):
         if global_vars.game is game.NULL_GAME:
             return False
 
-        # Find the player object
-        for player_obj in global_vars.game.seatingOrder:
-            if player_obj.user.id == self.player_id:
-                return player_obj.hand_raised
-        return False
+        player_obj = global_vars.game.get_player(self.player_id)
+        return player_obj.hand_raised if player_obj else False
 
     def update_for_voting_turn(self):
         """Update buttons when it's this player's turn to vote."""
@@ -343,9 +340,7 @@ async def send_nomination_buttons_to_st_channels(nominee_name: str, nominator_na
             # Dead players without ghost votes can't vote (unless special abilities apply)
             # Exception: exile votes - all dead players can vote on exiles
             if player_obj.is_ghost and player_obj.dead_votes < 1 and not is_exile:
-                player_banshee_ability = character_utils.the_ability(
-                    player_obj.character, model.characters.Banshee
-                )
+                player_banshee_ability = global_vars.game.abilities.ability(player_obj, model.characters.Banshee)
                 player_is_active_banshee = player_banshee_ability and player_banshee_ability.is_screaming
                 if not player_is_active_banshee and not voudon_player:
                     can_vote = False
@@ -397,11 +392,7 @@ async def update_buttons_for_voting_turn(player_id: int) -> None:
         view.update_for_voting_turn()
 
         # Get player display name for the message
-        player_obj = None
-        for p in global_vars.game.seatingOrder:
-            if p.user.id == player_id:
-                player_obj = p
-                break
+        player_obj = global_vars.game.get_player(player_id)
 
         if player_obj:
             # Update message text to mention it's their turn
@@ -0,0 +1,3 @@
+from .tracking import Tracked, TrackedDict, TrackedList, is_dirty, mark_clean, mark_dirty
+
+__all__ = ['Tracked', 'TrackedDict', 'TrackedList', 'is_dirty', 'mark_clean', 'mark_dirty']
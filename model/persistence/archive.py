@@ -0,0 +1,308 @@
+"""Archive of finished games.
+
+When a game ends its backup is deleted, so the archive keeps a queryable record of it
+in a sqlite database: the seating with characters and alignments, every vote with the
+individual ballots, who was dead at the end and the day each of them died, and the
+metadata (but not the content) of every whisper. Indexes on player, character and date
+keep post-game statistics over many games fast.
+"""
+
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+ARCHIVE_FILE = "game_archive.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    ended_at TEXT NOT NULL,
+    winner TEXT NOT NULL,
+    script TEXT NOT NULL,
+    days INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    user_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    seat INTEGER,
+    character TEXT NOT NULL,
+    alignment TEXT NOT NULL,
+    died INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS votes (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    day INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    nominator_id INTEGER,
+    nominee_id INTEGER,
+    traveler INTEGER NOT NULL,
+    votes REAL NOT NULL,
+    majority REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ballots (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    day INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    voter_id INTEGER NOT NULL,
+    vote INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deaths (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    user_id INTEGER NOT NULL,
+    day INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS whispers (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    day INTEGER NOT NULL,
+    sender_id INTEGER NOT NULL,
+    recipient_id INTEGER NOT NULL,
+    sent_at TEXT NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_ended_at ON games(ended_at);
+CREATE INDEX IF NOT EXISTS players_user ON players(user_id);
+CREATE INDEX IF NOT EXISTS players_character ON players(character);
+CREATE INDEX IF NOT EXISTS players_game ON players(game_id);
+CREATE INDEX IF NOT EXISTS votes_game ON votes(game_id, day);
+CREATE INDEX IF NOT EXISTS ballots_voter ON ballots(voter_id);
+CREATE INDEX IF NOT EXISTS deaths_game ON deaths(game_id, day);
+CREATE INDEX IF NOT EXISTS deaths_user ON deaths(user_id);
+CREATE INDEX IF NOT EXISTS whispers_game ON whispers(game_id, day);
+CREATE INDEX IF NOT EXISTS whispers_sender ON whispers(sender_id);
+CREATE INDEX IF NOT EXISTS whispers_recipient ON whispers(recipient_id);
+"""
+
+
+@dataclass
+class ArchivedGame:
+    """A finished game as stored in the archive.
+
+    Attributes:
+        id: The archive id of the game
+        ended_at: When the game ended, in UTC
+        winner: The winning team ('good', 'evil', or 'tie')
+        script: The character ids on the script
+        days: The number of days played
+    """
+
+    id: int
+    ended_at: datetime
+    winner: str
+    script: list[str]
+    days: int
+
+
+@dataclass
+class PlayerGame:
+    """One player's seat in an archived game.
+
+    Attributes:
+        game: The archived game
+        character: The name of the character class the player ended the game as
+        alignment: The alignment the player ended the game with
+        died: Whether the player was dead at the end of the game
+    """
+
+    game: ArchivedGame
+    character: str
+    alignment: str
+    died: bool
+
+    @property
+    def won(self) -> bool:
+        """Whether the player's team won."""
+        return self.alignment == self.game.winner
+
+
+@dataclass
+class Record:
+    """Game counts for a player or character.
+
+    Attributes:
+        games: Number of games played
+        wins: Number of games won
+        deaths: Number of games ended dead
+    """
+
+    games: int = 0
+    wins: int = 0
+    deaths: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        """The fraction of games won."""
+        return self.wins / self.games if self.games else 0.0
+
+
+class GameArchive:
+    """A sqlite database of finished games.
+
+    Use as a context manager, or call ``close`` when done.
+    """
+
+    path: str
+
+    def __init__(self, path: str = ARCHIVE_FILE):
+        """Open an archive, creating it if needed.
+
+        Args:
+            path: The path of the database file
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+
+    def record(self, game: Any, winner: str, ended_at: datetime | None = None) -> int:
+        """Archive a finished game.
+
+        Args:
+            game: The game that ended
+            winner: The winning team ('good', 'evil', or 'tie')
+            ended_at: When the game ended; defaults to now
+
+        Returns:
+            int: The archive id of the game
+        """
+        from model.game.whisper_log import RECIPIENT
+        from model.characters import Traveler
+
+        ended_at = ended_at or datetime.now(timezone.utc)
+        with self._connection as connection:
+            game_id = connection.execute(
+                "INSERT INTO games (ended_at, winner, script, days) VALUES (?, ?, ?, ?)",
+                (ended_at.isoformat(), winner.lower(), json.dumps(list(game.script._list)), len(game.days)),
+            ).lastrowid
+
+            connection.executemany(
+                "INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (game_id, person.user_id, person.display_name, person.position,
+                     type(person.character).__name__, person.alignment, person.is_ghost)
+                    for person in game.seatingOrder
+                ],
+            )
+            # Players restored from backups made before death days were recorded have none
+            connection.executemany(
+                "INSERT INTO deaths VALUES (?, ?, ?)",
+                [
+                    (game_id, person.user_id, person.death_day)
+                    for person in game.seatingOrder
+                    if person.is_ghost and person.death_day is not None
+                ],
+            )
+
+            for day_number, day in enumerate(game.days, start=1):
+                for number, vote in enumerate(day.votes, start=1):
+                    connection.execute(
+                        "INSERT INTO votes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (game_id, day_number, number, _user_id(vote.nominator), _user_id(vote.nominee),
+                         vote.nominee is not None and isinstance(vote.nominee.character, Traveler),
+                         vote.votes, vote.majority),
+                    )
+                    connection.executemany(
+                        "INSERT INTO ballots VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (game_id, day_number, number, voter.user_id, ballot)
+                            for voter, ballot in zip(vote.order, vote.history)
+                        ],
+                    )
+
+            people = game.whispers.people
+            connection.executemany(
+                "INSERT INTO whispers VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (game_id, whisper.day, people[whisper.sender].user_id, people[whisper.recipient].user_id,
+                     datetime.fromtimestamp(whisper.time, timezone.utc).isoformat(), len(whisper.content))
+                    for whisper in game.whispers
+                    if whisper.holders & RECIPIENT
+                ],
+            )
+        return game_id
+
+    def games(self, start: datetime | None = None, end: datetime | None = None) -> list[ArchivedGame]:
+        """List archived games, most recent first.
+
+        Args:
+            start: Only include games that ended at or after this time
+            end: Only include games that ended before this time
+
+        Returns:
+            list[ArchivedGame]: The matching games
+        """
+        rows = self._connection.execute(
+            "SELECT * FROM games WHERE ended_at >= ? AND ended_at < ? ORDER BY ended_at DESC",
+            (_timestamp(start, ""), _timestamp(end, "~")),
+        )
+        return [_archived_game(row) for row in rows]
+
+    def games_for_player(self, user_id: int) -> list[PlayerGame]:
+        """List the archived games a player was seated in, most recent first.
+
+        Args:
+            user_id: The Discord user id of the player
+
+        Returns:
+            list[PlayerGame]: The player's games
+        """
+        rows = self._connection.execute(
+            "SELECT games.*, character, alignment, died FROM players JOIN games ON games.id = game_id"
+            " WHERE user_id = ? ORDER BY ended_at DESC",
+            (user_id,),
+        )
+        return [PlayerGame(_archived_game(row[:5]), row[5], row[6], bool(row[7])) for row in rows]
+
+    def player_record(self, user_id: int) -> Record:
+        """Count a player's games, wins and deaths.
+
+        Args:
+            user_id: The Discord user id of the player
+
+        Returns:
+            Record: The player's record
+        """
+        return self._record("user_id", user_id)
+
+    def character_record(self, character: str) -> Record:
+        """Count the games, wins and deaths of a character.
+
+        Args:
+            character: The name of the character class, e.g. "Imp"
+
+        Returns:
+            Record: The character's record
+        """
+        return self._record("character", character)
+
+    def _record(self, column: str, value: Any) -> Record:
+        games, wins, deaths = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(alignment = winner), 0), COALESCE(SUM(died), 0)"
+            f" FROM players JOIN games ON games.id = game_id WHERE {column} = ?",
+            (value,),
+        ).fetchone()
+        return Record(games, wins, deaths)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def __enter__(self) -> 'GameArchive':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _user_id(person: Any) -> int | None:
+    return person.user_id if person is not None else None
+
+
+def _timestamp(moment: datetime | None, default: str) -> str:
+    return moment.astimezone(timezone.utc).isoformat() if moment is not None else default
+
+
+def _archived_game(row: tuple) -> ArchivedGame:
+    game_id, ended_at, winner, script, days = row
+    return ArchivedGame(game_id, datetime.fromisoformat(ended_at), winner, json.loads(script), days)
@@ -0,0 +1,349 @@
+"""Background writer for game backups.
+
+Serializing and writing a large game on the event loop stalls vote handling and the
+gateway heartbeat. ``BackupService`` takes an isolated snapshot of the state on the
+loop and hands it to a single worker thread for serialization and disk I/O.
+
+Requests are debounced: a burst of requests collapses into one pending write, which
+is delayed by ``delay`` seconds after the latest request but never more than
+``max_staleness`` seconds after the first one that is not yet on disk. While a write
+is in flight, further requests wait for it and then produce a single follow-up write.
+
+Without a running event loop, as in scripts and synchronous tests, backups are
+written immediately.
+
+Two snapshot modes are available; see ``SnapshotMode``. The default deep-copies the
+state on the loop and serializes the copy on a worker thread. The fork mode instead
+forks the process, like Redis' BGSAVE: the child serializes its copy-on-write image of
+the live game and exits, so the loop only pauses for the fork itself.
+
+The bot is multithreaded, and a forked child only has the thread that forked it; a lock
+another thread held at the fork stays held in the child forever. Everything the child
+needs is therefore imported before forking, the child never logs, and a child that has
+not finished within ``fork_timeout`` seconds is killed and fork mode is given up in
+favour of thread mode.
+"""
+
+import asyncio
+import os
+import signal
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import bot_client
+from model.persistence import tracking
+
+
+@dataclass
+class BackupMetrics:
+    """Counters describing the work done by a BackupService.
+
+    Attributes:
+        requests: Number of backup requests received
+        coalesced: Number of requests folded into an already pending write
+        writes: Number of backups written
+        failures: Number of backups that failed to write
+        queue_depth: Number of writes pending or in flight
+        last_snapshot_seconds: Time spent on the event loop taking the last snapshot
+        last_write_seconds: Time the worker spent on the last write
+        max_write_seconds: Longest time the worker spent on a write
+        total_write_seconds: Total time the worker spent writing
+    """
+
+    requests: int = 0
+    coalesced: int = 0
+    writes: int = 0
+    failures: int = 0
+    queue_depth: int = 0
+    last_snapshot_seconds: float = 0.0
+    last_write_seconds: float = 0.0
+    max_write_seconds: float = 0.0
+    total_write_seconds: float = 0.0
+
+    @property
+    def mean_write_seconds(self) -> float:
+        """The average time the worker spent on a write."""
+        return self.total_write_seconds / self.writes if self.writes else 0.0
+
+
+class SnapshotMode:
+    """How a BackupService isolates the state it writes in the background."""
+
+    THREAD = "thread"  # Copy the state on the loop and write it from a worker thread
+    FORK = "fork"  # Fork the process and write the state from the child
+
+
+class BackupService:
+    """Schedules backups so that serialization and disk I/O happen off the event loop.
+
+    The service is given three callables:
+
+    - ``snapshot(file_name, isolate)`` runs on the loop and returns the data to write. When
+      ``isolate`` is true the data must not share mutable state with the live game.
+    - ``write(file_name, data)`` runs on the worker thread, or in a forked child process,
+      and writes the data.
+    - ``written(file_name, data)`` runs on the loop once the data is safely on disk.
+    - ``prepare()``, if given, runs on the loop before forking, and imports everything
+      ``write`` needs so that the child never has to.
+
+    Fork mode is only used where ``os.fork`` exists; elsewhere the service behaves as in
+    thread mode.
+    """
+
+    def __init__(
+            self,
+            snapshot: Callable[[str, bool], Any],
+            write: Callable[[str, Any], None],
+            written: Callable[[str, Any], None],
+            delay: float = 0.5,
+            max_staleness: float = 2.0,
+            snapshot_mode: str = SnapshotMode.THREAD,
+            prepare: Callable[[], None] | None = None,
+            fork_timeout: float = 60.0):
+        """Initialize a BackupService.
+
+        Args:
+            snapshot: Takes the snapshot of the state to back up
+            write: Writes a snapshot to disk
+            written: Called once a snapshot has been written
+            delay: Seconds to wait for further requests before writing
+            max_staleness: Maximum seconds a requested backup may be delayed
+            snapshot_mode: How background writes are isolated from the live state; a SnapshotMode
+            prepare: Gets the process ready to fork a writer
+            fork_timeout: Seconds a forked writer may take before it is killed
+        """
+        self._snapshot = snapshot
+        self._write = write
+        self._written = written
+        self.delay = delay
+        self.max_staleness = max_staleness
+        self.snapshot_mode = snapshot_mode
+        self._prepare = prepare
+        self.fork_timeout = fork_timeout
+        self.metrics = BackupMetrics()
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: str | None = None
+        self._pending_since: float | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._in_flight: Future | None = None
+        self._in_flight_job: tuple[str, Any] | None = None
+
+    def request(self, file_name: str) -> None:
+        """Ask for the current state to be backed up.
+
+        Args:
+            file_name: The name of the backup file
+        """
+        self.metrics.requests += 1
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_now(file_name)
+            return
+
+        now = loop.time()
+        if self._pending is not None:
+            self.metrics.coalesced += 1
+        else:
+            self._pending_since = now
+        self._pending = file_name
+
+        if self._in_flight is not None:
+            # The follow-up write is started when the current one completes
+            self._update_queue_depth()
+            return
+
+        deadline = min(now + self.delay, self._pending_since + self.max_staleness)
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_at(deadline, self._start_pending)
+        self._update_queue_depth()
+
+    def flush(self) -> None:
+        """Write any pending backup and wait for all writes to finish.
+
+        Blocks the calling thread; intended for shutdown.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._wait_in_flight()
+        if self._pending is not None:
+            file_name = self._pending
+            self._pending = None
+            self._pending_since = None
+            self._write_now(file_name)
+        self._update_queue_depth()
+
+    def cancel(self) -> None:
+        """Drop any pending backup and wait for an in-flight write to finish."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = None
+        self._pending_since = None
+        self._wait_in_flight()
+        self._update_queue_depth()
+
+    def _wait_in_flight(self) -> None:
+        """Block until the in-flight write, if any, has finished."""
+        if self._in_flight is not None:
+            future = self._in_flight
+            future.exception()
+            self._finish(future)
+
+    def _write_now(self, file_name: str) -> None:
+        """Snapshot and write on the calling thread."""
+        self._wait_in_flight()
+        data = self._snapshot(file_name, False)
+        tracking.mark_clean()
+        try:
+            self._timed_write(self._write, file_name, data)
+        except Exception:
+            tracking.mark_dirty()
+            raise
+        self._written(file_name, data)
+
+    def _start_pending(self) -> None:
+        """Snapshot the state on the loop and hand it to the worker."""
+        self._timer = None
+        file_name = self._pending
+        if file_name is None or self._in_flight is not None:
+            return
+        self._pending = None
+        self._pending_since = None
+
+        forking = self._forking()
+        start = time.perf_counter()
+        try:
+            # A forked child already has a private copy-on-write image of the state
+            data = self._snapshot(file_name, not forking)
+        except Exception as e:
+            # The state cannot be isolated; fall back to writing it on the loop
+            bot_client.logger.warning(f"Could not snapshot game for background backup: {e}")
+            self._write_now(file_name)
+            return
+        tracking.mark_clean()
+
+        if forking:
+            try:
+                pid = self._fork_writer(file_name, data)
+            except OSError as e:
+                bot_client.logger.warning(f"Could not fork for background backup: {e}")
+                self._write_now(file_name)
+                return
+            job = (_wait_for_child, pid, self.fork_timeout)
+        else:
+            job = (self._write, file_name, data)
+        self.metrics.last_snapshot_seconds = time.perf_counter() - start
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backup")
+        loop = asyncio.get_running_loop()
+        self._in_flight = self._executor.submit(self._timed_write, *job)
+        self._in_flight_job = (file_name, data)
+        self._in_flight.add_done_callback(
+            lambda future: loop.call_soon_threadsafe(self._finish_and_continue, future)
+        )
+        self._update_queue_depth()
+
+    def _forking(self) -> bool:
+        """Check whether background writes happen in a forked child."""
+        return self.snapshot_mode == SnapshotMode.FORK and hasattr(os, "fork")
+
+    def _fork_writer(self, file_name: str, data: Any) -> int:
+        """Fork a child process that writes a snapshot and exits.
+
+        Returns:
+            int: The pid of the child
+        """
+        if self._prepare is not None:
+            self._prepare()
+        pid = os.fork()
+        if pid == 0:
+            # Never return into the parent's event loop from the child
+            code = 1
+            try:
+                self._write(file_name, data)
+                code = 0
+            except BaseException:
+                # Straight to the file descriptor: the logging and stderr locks may be held
+                # by threads that do not exist in the child
+                os.write(2, traceback.format_exc().encode("utf-8", "replace"))
+            finally:
+                os._exit(code)
+        return pid
+
+    def _finish_and_continue(self, future: Future) -> None:
+        """Handle a completed write on the loop and start the next one if requested."""
+        self._finish(future)
+        if self._pending is not None and self._in_flight is None and self._timer is None:
+            self._start_pending()
+
+    def _finish(self, future: Future) -> None:
+        """Handle a completed write."""
+        if future is not self._in_flight:
+            # Already handled by flush or cancel
+            return
+        file_name, data = self._in_flight_job
+        self._in_flight = None
+        self._in_flight_job = None
+        try:
+            future.result()
+        except Exception as e:
+            bot_client.logger.error(f"Backup to {file_name} failed: {e}")
+            tracking.mark_dirty()
+            if isinstance(e, TimeoutError) and self.snapshot_mode == SnapshotMode.FORK:
+                bot_client.logger.warning("Forked backup writer hung; writing backups from a thread instead")
+                self.snapshot_mode = SnapshotMode.THREAD
+        else:
+            self._written(file_name, data)
+        self._update_queue_depth()
+
+    def _timed_write(self, write: Callable[..., None], *args: Any) -> None:
+        """Write a snapshot, recording how long it took."""
+        start = time.perf_counter()
+        try:
+            write(*args)
+        except Exception:
+            self.metrics.failures += 1
+            raise
+        elapsed = time.perf_counter() - start
+        self.metrics.writes += 1
+        self.metrics.last_write_seconds = elapsed
+        self.metrics.max_write_seconds = max(self.metrics.max_write_seconds, elapsed)
+        self.metrics.total_write_seconds += elapsed
+
+    def _update_queue_depth(self) -> None:
+        self.metrics.queue_depth = (self._pending is not None) + (self._in_flight is not None)
+
+
+def _wait_for_child(pid: int, timeout: float) -> None:
+    """Wait for a forked writer to exit, killing it if it takes too long.
+
+    Args:
+        pid: The pid of the child
+        timeout: Seconds to wait before killing the child
+
+    Raises:
+        ChildProcessError: If the child failed to write the snapshot
+        TimeoutError: If the child did not finish in time and was killed
+    """
+    deadline = time.monotonic() + timeout
+    interval = 0.005
+    while True:
+        waited, status = os.waitpid(pid, os.WNOHANG)
+        if waited:
+            break
+        if time.monotonic() >= deadline:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            raise TimeoutError(f"Snapshot process {pid} did not finish within {timeout} seconds")
+        time.sleep(interval)
+        interval = min(interval * 2, 0.1)
+    code = os.waitstatus_to_exitcode(status)
+    if code != 0:
+        raise ChildProcessError(f"Snapshot process {pid} exited with status {code}")
@@ -0,0 +1,284 @@
+"""Write-ahead journal of game-state mutations.
+
+A full backup rewrites the whole game, which is wasteful when the only thing that
+happened was a whisper or a single vote. Frequent mutations are instead appended to
+a journal next to the backup as one JSON line each, fsynced before the mutation is
+applied. Every ``COMPACT_EVERY`` events the state is flagged dirty so that the next
+backup writes a full snapshot, which folds the journal back in and truncates it.
+
+Loading a game is the snapshot plus a replay of the journal tail. Replay handlers are
+registered next to the model methods they call, so a journaled mutation runs the same
+code live and on replay. Each event carries a sequence number and the game remembers
+the last one applied, so events that are already part of a snapshot are skipped.
+
+A mutation is only journaled while the tracked state is clean. If anything else has
+changed since the last snapshot, the mutation is applied normally and the next backup
+writes a full snapshot instead. Once that snapshot has been taken, the journal is also
+suspended until the snapshot is on disk: the journal only ever extends the snapshot on
+disk, and the mutations the new snapshot holds are in neither of them. If the write
+fails, nothing more is journaled until a later snapshot succeeds, so a crash loses the
+latest changes rather than replaying some of them onto an older snapshot.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+import bot_client
+from model.persistence import tracking
+
+# Number of journaled events after which the next backup writes a full snapshot
+COMPACT_EVERY = 50
+
+_replayers: dict[str, Callable[..., None]] = {}
+
+
+class Journal:
+    """An append-only journal attached to a single game.
+
+    Attributes:
+        path: The path of the journal file
+        game: The game whose mutations are journaled
+        events: Number of events written since the last snapshot
+        suspended: Whether a snapshot newer than the one the journal extends has been taken
+    """
+
+    path: str
+    game: Any
+    events: int
+    suspended: bool
+
+    def __init__(self, path: str, game: Any, events: int = 0):
+        """Initialize a Journal.
+
+        Args:
+            path: The path of the journal file
+            game: The game whose mutations are journaled
+            events: Number of events already in the journal file
+        """
+        self.path = path
+        self.game = game
+        self.events = events
+        self.suspended = False
+        self._fd: int | None = None
+
+    def append(self, event: str, data: dict[str, Any]) -> int:
+        """Durably append an event to the journal.
+
+        Args:
+            event: The name of the event
+            data: The JSON-serializable payload of the event
+
+        Returns:
+            int: The sequence number of the event
+        """
+        sequence = self.game.journal_sequence + 1
+        line = json.dumps({"seq": sequence, "event": event, "data": data}, separators=(",", ":")) + "\n"
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        os.write(self._fd, line.encode("utf-8"))
+        os.fsync(self._fd)
+        self.events += 1
+        return sequence
+
+    def close(self) -> None:
+        """Close the journal file."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+_active: Journal | None = None
+
+
+def journal_file(backup_file: str) -> str:
+    """Get the journal file that belongs to a backup file.
+
+    Args:
+        backup_file: The name of the backup file
+
+    Returns:
+        str: The name of the journal file
+    """
+    return os.path.splitext(backup_file)[0] + ".journal"
+
+
+def replayer(event: str) -> Callable[[Callable[..., None]], Callable[..., None]]:
+    """Register the function that replays an event.
+
+    The function is called with the game and the event payload as keyword arguments.
+
+    Args:
+        event: The name of the event
+
+    Returns:
+        The decorator registering the function
+    """
+
+    def decorator(func: Callable[..., None]) -> Callable[..., None]:
+        _replayers[event] = func
+        return func
+
+    return decorator
+
+
+def attach(backup_file: str, game: Any, snapshot_sequence: int | None = None) -> None:
+    """Start journaling mutations of a game next to its backup.
+
+    Args:
+        backup_file: The name of the backup file
+        game: The game to journal
+        snapshot_sequence: The journal sequence number included in a freshly written
+            snapshot; older events are dropped from the journal. None keeps every event.
+    """
+    global _active
+    detach()
+    path = journal_file(backup_file)
+    kept = []
+    if os.path.exists(path):
+        with open(path, "rb") as file:
+            lines = file.readlines()
+        kept = lines if snapshot_sequence is None else [
+            line for line in lines if _sequence(line) > snapshot_sequence
+        ]
+        if not kept:
+            os.truncate(path, 0)
+        elif len(kept) < len(lines):
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as file:
+                file.writelines(kept)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+    _active = Journal(path, game, len(kept))
+
+
+def _sequence(line: bytes) -> int:
+    """Get the sequence number of a journal line, or 0 if it is torn."""
+    try:
+        return json.loads(line)["seq"]
+    except ValueError:
+        return 0
+
+
+def detach() -> None:
+    """Stop journaling."""
+    global _active
+    if _active is not None:
+        _active.close()
+        _active = None
+
+
+def suspend() -> None:
+    """Stop journaling until the next snapshot is written and the journal attached to it.
+
+    Called when a snapshot is taken, because mutations made since the last snapshot on disk
+    may only be in the new one.
+    """
+    if _active is not None:
+        _active.suspended = True
+
+
+def discard(backup_file: str) -> None:
+    """Stop journaling and delete the journal belonging to a backup.
+
+    Args:
+        backup_file: The name of the backup file
+    """
+    detach()
+    path = journal_file(backup_file)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@contextmanager
+def recording(event: str, data: Callable[[], dict[str, Any]]) -> Iterator[None]:
+    """Journal the mutation applied in the body of the with statement.
+
+    The body must be synchronous and must make exactly the changes that the replayer
+    registered for the event makes.
+
+    Args:
+        event: The name of the event
+        data: Builds the payload of the event; only called if the event is journaled
+    """
+    import global_vars
+
+    journal = _active
+    if journal is None or journal.suspended or journal.game is not global_vars.game or tracking.is_dirty():
+        yield
+        return
+
+    try:
+        payload = data()
+    except LookupError:
+        # The mutated object is not reachable from the game; the next backup will cover it
+        yield
+        return
+
+    sequence = journal.append(event, payload)
+    try:
+        with tracking.suppressed():
+            journal.game.journal_sequence = sequence
+            yield
+    except BaseException:
+        # The journal may no longer match the game, so fall back to a snapshot
+        tracking.mark_dirty()
+        raise
+
+    if journal.events >= COMPACT_EVERY:
+        tracking.mark_dirty()
+
+
+def replay(backup_file: str, game: Any) -> int:
+    """Replay the journal belonging to a backup onto a loaded game.
+
+    Args:
+        backup_file: The name of the backup file
+        game: The game loaded from the snapshot
+
+    Returns:
+        int: The number of events replayed
+    """
+    path = journal_file(backup_file)
+    if not os.path.exists(path):
+        return 0
+
+    replayed = 0
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A torn write at the tail; nothing after it was ever applied
+                break
+            if record["seq"] <= game.journal_sequence:
+                continue
+            try:
+                _replayers[record["event"]](game, **record["data"])
+            except Exception as e:
+                bot_client.logger.warning(f"Could not replay journal event {record['seq']}: {e}")
+                break
+            game.journal_sequence = record["seq"]
+            replayed += 1
+    return replayed
+
+
+def find_player(game: Any, user_id: int) -> Any:
+    """Find a player or storyteller in a game by their user id.
+
+    Args:
+        game: The game to search
+        user_id: The Discord user id
+
+    Returns:
+        The matching player
+
+    Raises:
+        KeyError: If no player in the game has that user id
+    """
+    person = game.get_player(user_id) or game.get_storyteller(user_id)
+    if person is None:
+        raise KeyError(user_id)
+    return person
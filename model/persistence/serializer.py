@@ -0,0 +1,308 @@
+"""Schema-versioned JSON encoding of the game-state.
+
+dill pickles whole object graphs, and every backed-up attribute separately, so each
+player ends up pickled many times over through message histories, votes and
+characters. This serializer writes an explicit, versioned JSON form instead:
+
+- players are stored once, keyed by their Discord user id, and referenced as
+  ``{"$p": user_id}`` everywhere else;
+- other model objects (days, votes, characters, the script, the whisper log) are
+  stored once in an object table and referenced as ``{"$r": index}``;
+- tuples, datetimes and dicts whose keys are not plain strings are tagged with
+  ``$tuple``, ``$dt`` and ``$map``.
+
+The result is a set of zlib-compressed snapshot sections: ``__schema__``,
+``__players__``, ``__objects__`` and one section per game attribute. Only types registered here can be
+encoded; anything else raises ``SerializationError`` rather than being silently
+pickled.
+
+A backup written while the game continues is first captured with ``capture``, which
+copies only the containers and the state of each model object and shares everything
+immutable, down to the whisper log's rows. The capture is cheap enough to take on the
+event loop, and is encoded later like the game-state itself.
+"""
+
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Callable
+
+# 2: whispers are stored once in the game's WhisperLog rather than in each player's history
+SCHEMA_VERSION = 2
+
+# Whispers repeat the same keys and jump URLs many times, so even fast compression pays off
+COMPRESSION_LEVEL = 3
+
+SCHEMA_SECTION = "__schema__"
+PLAYERS_SECTION = "__players__"
+OBJECTS_SECTION = "__objects__"
+
+
+class SerializationError(Exception):
+    """Raised when game-state cannot be encoded or decoded."""
+
+
+def _types() -> dict[str, type]:
+    """Get the model classes that can be stored in the object table, by tag."""
+    from model.characters.registry import CHARACTER_REGISTRY
+    from model.game.day import Day
+    from model.game.script import Script
+    from model.game.traveler_vote import TravelerVote
+    from model.game.vote import Vote
+    from model.game.whisper_log import WhisperLog
+
+    types = {"Day": Day, "Vote": Vote, "TravelerVote": TravelerVote, "Script": Script, "WhisperLog": WhisperLog}
+    types.update({f"character.{name}": cls for name, cls in CHARACTER_REGISTRY.items()})
+    return types
+
+
+def preload() -> None:
+    """Import every model class the serializer encodes, ahead of forking a writer."""
+    _types()
+
+
+class _Captured:
+    """The state of a model object, copied so that it can be encoded while the object changes."""
+
+    __slots__ = ("cls", "state")
+
+    def __init__(self, cls: type):
+        self.cls = cls
+        self.state: dict[str, Any] = {}
+
+
+def _dumps(value: Any) -> bytes:
+    data = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return zlib.compress(data, COMPRESSION_LEVEL)
+
+
+def _loads(data: bytes) -> Any:
+    try:
+        return json.loads(zlib.decompress(data))
+    except (zlib.error, ValueError) as e:
+        raise SerializationError(f"Malformed section: {e}") from e
+
+
+def _object_state(value: Any) -> dict[str, Any]:
+    """Get the state to store for an object, honouring custom pickling hooks."""
+    if "__getstate__" in vars(type(value)) or any(
+            "__getstate__" in vars(base) for base in type(value).__mro__[1:-1]):
+        return value.__getstate__()
+    return vars(value)
+
+
+def _state(value: Any) -> dict[str, Any]:
+    """Get the state to store for an object or a captured object."""
+    return value.state if isinstance(value, _Captured) else _object_state(value)
+
+
+class _Capturer:
+    """Copies one game-state, sharing players and objects between attributes like the encoder."""
+
+    def __init__(self):
+        from model.player import Player
+
+        self._player_class = Player
+        self._classes = set(_types().values())
+        self._captured: dict[int, _Captured] = {}
+
+    def capture(self, value: Any) -> Any:
+        if value is None or isinstance(value, (bool, int, float, str, datetime)):
+            return value
+        if isinstance(value, list):
+            return [self.capture(item) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self.capture(item) for item in value)
+        if isinstance(value, dict):
+            return {self.capture(key): self.capture(item) for key, item in value.items()}
+        if not isinstance(value, self._player_class) and type(value) not in self._classes:
+            raise SerializationError(f"Cannot serialize {type(value).__name__}")
+
+        captured = self._captured.get(id(value))
+        if captured is None:
+            # Registered before recursing, so that cycles through the object end here
+            captured = self._captured[id(value)] = _Captured(type(value))
+            shared = getattr(value, "_shared_attributes", frozenset())
+            captured.state = {
+                name: list(item) if name in shared else self.capture(item)
+                for name, item in _object_state(value).items()
+            }
+        return captured
+
+
+class _Encoder:
+    """Encodes one game-state, sharing players and objects between sections."""
+
+    def __init__(self):
+        from model.player import Player
+
+        self._player_class = Player
+        self._tags = {cls: tag for tag, cls in _types().items()}
+        self.players: dict[int, Any] = {}
+        self._player_ids: dict[int, int] = {}
+        self.objects: list[Any] = []
+        self._object_indices: dict[int, int] = {}
+        # Keeps encoded objects alive so that their ids are not reused
+        self._seen: list[Any] = []
+
+    def encode(self, value: Any) -> Any:
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, list):
+            return [self.encode(item) for item in value]
+        if isinstance(value, tuple):
+            return {"$tuple": [self.encode(item) for item in value]}
+        if isinstance(value, dict):
+            if all(isinstance(key, str) and not key.startswith("$") for key in value):
+                return {key: self.encode(item) for key, item in value.items()}
+            return {"$map": [[self.encode(key), self.encode(item)] for key, item in value.items()]}
+        if isinstance(value, datetime):
+            return {"$dt": value.isoformat()}
+        cls = value.cls if isinstance(value, _Captured) else type(value)
+        if issubclass(cls, self._player_class):
+            return self._encode_player(value)
+        tag = self._tags.get(cls)
+        if tag is not None:
+            return self._encode_object(value, tag)
+        raise SerializationError(f"Cannot serialize {type(value).__name__}")
+
+    def _encode_player(self, player: Any) -> dict[str, int]:
+        user_id = self._player_ids.get(id(player))
+        if user_id is None:
+            state = _state(player)
+            user_id = state["user"]
+            self._player_ids[id(player)] = user_id
+            self._seen.append(player)
+            if user_id not in self.players:
+                self.players[user_id] = None  # Reserve the id before recursing into references to the player
+                self.players[user_id] = self.encode(state)
+        return {"$p": user_id}
+
+    def _encode_object(self, value: Any, tag: str) -> dict[str, int]:
+        index = self._object_indices.get(id(value))
+        if index is None:
+            index = len(self.objects)
+            self._object_indices[id(value)] = index
+            self._seen.append(value)
+            self.objects.append(None)
+            self.objects[index] = {"t": tag, "s": self.encode(_state(value))}
+        return {"$r": index}
+
+
+class _Decoder:
+    """Rebuilds the players and objects of one game-state, then decodes values that refer to them."""
+
+    def __init__(self, players: dict[str, Any], objects: list[Any]):
+        from model.player import Player
+
+        types = _types()
+        try:
+            self.players = {int(user_id): Player.__new__(Player) for user_id in players}
+            self.objects = [types[entry["t"]].__new__(types[entry["t"]]) for entry in objects]
+        except KeyError as e:
+            raise SerializationError(f"Unknown type {e}") from e
+
+        # Every object exists before any state is restored, so references can point anywhere
+        for user_id, state in players.items():
+            self.players[int(user_id)].__setstate__(self.decode(state))
+        for obj, entry in zip(self.objects, objects):
+            state = self.decode(entry["s"])
+            if hasattr(obj, "__setstate__"):
+                obj.__setstate__(state)
+            else:
+                obj.__dict__.update(state)
+
+    def decode(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        if "$p" in value:
+            return self.players[value["$p"]]
+        if "$r" in value:
+            return self.objects[value["$r"]]
+        if "$tuple" in value:
+            return tuple(self.decode(item) for item in value["$tuple"])
+        if "$map" in value:
+            return {self.decode(key): self.decode(item) for key, item in value["$map"]}
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        return {key: self.decode(item) for key, item in value.items()}
+
+
+def capture(state: dict[str, Any]) -> dict[str, Any]:
+    """Copy backed-up game attributes so that they can be encoded while the game changes.
+
+    Containers and the state of model objects are copied; immutable values, and the rows
+    of attributes a class lists in ``_shared_attributes``, are shared with the game.
+
+    Args:
+        state: The value of each backed-up attribute by name
+
+    Returns:
+        dict[str, Any]: The captured attributes, which ``encode_sections`` accepts
+
+    Raises:
+        SerializationError: If the state contains a type this serializer does not support
+    """
+    capturer = _Capturer()
+    return {name: capturer.capture(value) for name, value in state.items()}
+
+
+def encode_sections(state: dict[str, Any]) -> dict[str, bytes]:
+    """Encode backed-up game attributes as snapshot sections.
+
+    Args:
+        state: The value of each backed-up attribute by name
+
+    Returns:
+        dict[str, bytes]: The snapshot sections
+
+    Raises:
+        SerializationError: If the state contains a type this serializer does not support
+    """
+    encoder = _Encoder()
+    attributes = {name: _dumps(encoder.encode(value)) for name, value in state.items()}
+    return {
+        SCHEMA_SECTION: _dumps({"version": SCHEMA_VERSION}),
+        PLAYERS_SECTION: _dumps(encoder.players),
+        OBJECTS_SECTION: _dumps(encoder.objects),
+        **attributes,
+    }
+
+
+def is_encoded(names: list[str]) -> bool:
+    """Check whether a snapshot was written by this serializer.
+
+    Args:
+        names: The section names of the snapshot
+
+    Returns:
+        bool: True if the sections can be read with ``decode_sections``
+    """
+    return SCHEMA_SECTION in names
+
+
+def decode_sections(names: list[str], read: Callable[[str], bytes]) -> dict[str, Any]:
+    """Decode snapshot sections written by ``encode_sections``.
+
+    Args:
+        names: The section names of the snapshot
+        read: Returns the payload of a section
+
+    Returns:
+        dict[str, Any]: The value of each backed-up attribute by name
+
+    Raises:
+        SerializationError: If the sections were written by a newer schema or are malformed
+    """
+    version = _loads(read(SCHEMA_SECTION))["version"]
+    if version > SCHEMA_VERSION:
+        raise SerializationError(f"Backup uses schema version {version}, newer than {SCHEMA_VERSION}")
+
+    decoder = _Decoder(_loads(read(PLAYERS_SECTION)), _loads(read(OBJECTS_SECTION)))
+    return {
+        name: decoder.decode(_loads(read(name)))
+        for name in names
+        if name not in (SCHEMA_SECTION, PLAYERS_SECTION, OBJECTS_SECTION)
+    }
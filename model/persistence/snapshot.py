@@ -0,0 +1,185 @@
+"""Single-file snapshot container for game backups.
+
+A snapshot is one file holding one section per backed-up attribute::
+
+    magic (8 bytes) | version (u16) | section count (u32)
+    per section: name length (u16) | name (utf-8) | offset (u64) | length (u64) | crc32 (u32)
+    header crc32 (u32)
+    section payloads
+
+Snapshots are written to a temporary file which is fsynced and then renamed over the
+previous snapshot, so a reader sees either the old or the new snapshot and never a
+half-written one. Readers memory-map the file and only touch the sections they ask for;
+each section's checksum is verified when it is read.
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from typing import Any, Callable
+
+MAGIC = b"BOTCSNAP"
+VERSION = 1
+
+_PREAMBLE = struct.Struct("<8sHI")
+_NAME_LENGTH = struct.Struct("<H")
+_ENTRY = struct.Struct("<QQI")
+_CRC = struct.Struct("<I")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is malformed or corrupt."""
+
+
+def is_snapshot(prefix: bytes) -> bool:
+    """Check whether the start of a file is a snapshot header.
+
+    Args:
+        prefix: At least the first ``len(MAGIC)`` bytes of the file
+
+    Returns:
+        bool: True if the file is a snapshot container
+    """
+    return prefix[:len(MAGIC)] == MAGIC
+
+
+def write_snapshot(path: str, sections: dict[str, bytes]) -> None:
+    """Atomically write a snapshot.
+
+    Args:
+        path: The path of the snapshot file
+        sections: The payload of each section by name
+    """
+    names = [name.encode("utf-8") for name in sections]
+    header_size = (_PREAMBLE.size + sum(_NAME_LENGTH.size + len(name) + _ENTRY.size for name in names)
+                   + _CRC.size)
+
+    header = bytearray(_PREAMBLE.pack(MAGIC, VERSION, len(sections)))
+    offset = header_size
+    for name, payload in zip(names, sections.values()):
+        header += _NAME_LENGTH.pack(len(name)) + name
+        header += _ENTRY.pack(offset, len(payload), zlib.crc32(payload))
+        offset += len(payload)
+    header += _CRC.pack(zlib.crc32(header))
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(header)
+        for payload in sections.values():
+            file.write(payload)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    _fsync_directory(path)
+
+
+def _fsync_directory(path: str) -> None:
+    """Make a rename in the directory containing ``path`` durable, where supported."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class SnapshotReader:
+    """Random access to the sections of a snapshot file.
+
+    Use as a context manager.
+    """
+
+    path: str
+    version: int
+
+    def __init__(self, path: str):
+        """Open a snapshot and read its header.
+
+        Args:
+            path: The path of the snapshot file
+
+        Raises:
+            SnapshotError: If the file is not a valid snapshot
+        """
+        self.path = path
+        self._sections: dict[str, tuple[int, int, int]] = {}
+        with open(path, "rb") as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise SnapshotError(f"{path} is empty") from e
+        try:
+            self._read_header()
+        except BaseException:
+            self._map.close()
+            raise
+
+    def _read_header(self) -> None:
+        data = self._map
+        if len(data) < _PREAMBLE.size:
+            raise SnapshotError(f"{self.path} is truncated")
+        magic, self.version, count = _PREAMBLE.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path} is not a snapshot")
+        if self.version > VERSION:
+            raise SnapshotError(f"{self.path} has unsupported version {self.version}")
+
+        position = _PREAMBLE.size
+        try:
+            for _ in range(count):
+                (length,) = _NAME_LENGTH.unpack_from(data, position)
+                position += _NAME_LENGTH.size
+                name = bytes(data[position:position + length]).decode("utf-8")
+                position += length
+                self._sections[name] = _ENTRY.unpack_from(data, position)
+                position += _ENTRY.size
+            (header_crc,) = _CRC.unpack_from(data, position)
+        except struct.error as e:
+            raise SnapshotError(f"{self.path} has a truncated header") from e
+        if zlib.crc32(data[:position]) != header_crc:
+            raise SnapshotError(f"{self.path} has a corrupt header")
+
+    def names(self) -> list[str]:
+        """List the sections in the snapshot.
+
+        Returns:
+            list[str]: The section names, in the order they were written
+        """
+        return list(self._sections)
+
+    def load(self, name: str, loads: Callable[[memoryview], Any]) -> Any:
+        """Deserialize a single section.
+
+        Args:
+            name: The name of the section
+            loads: Deserializes the payload, which is backed by the memory-mapped file
+
+        Returns:
+            The deserialized section
+
+        Raises:
+            KeyError: If there is no such section
+            SnapshotError: If the section is truncated or fails its checksum
+        """
+        offset, length, crc = self._sections[name]
+        if offset + length > len(self._map):
+            raise SnapshotError(f"Section {name} of {self.path} is truncated")
+        with memoryview(self._map) as view, view[offset:offset + length] as payload:
+            if zlib.crc32(payload) != crc:
+                raise SnapshotError(f"Section {name} of {self.path} is corrupt")
+            return loads(payload)
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        self._map.close()
+
+    def __enter__(self) -> 'SnapshotReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
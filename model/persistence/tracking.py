@@ -0,0 +1,194 @@
+"""Dirty tracking for the persisted game state.
+
+The game is backed up after almost every message, but most messages do not change
+anything that is persisted. Classes that make up the backed-up state inherit from
+``Tracked`` so that rebinding an attribute, or mutating a list or dict attribute in
+place, flags the state as dirty. Backups are skipped while the state is clean.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+_dirty = True
+_suppressed = 0
+
+_MISSING = object()
+_SCALAR_TYPES = (bool, int, float, str, bytes, type(None))
+
+
+def is_dirty() -> bool:
+    """Check whether tracked state has changed since the last backup.
+
+    Returns:
+        bool: True if the state needs to be written out
+    """
+    return _dirty
+
+
+def mark_dirty() -> None:
+    """Flag the tracked state as changed."""
+    global _dirty
+    if not _suppressed:
+        _dirty = True
+
+
+def mark_clean() -> None:
+    """Flag the tracked state as in sync with the latest backup."""
+    global _dirty
+    _dirty = False
+
+
+@contextmanager
+def suppressed() -> Iterator[None]:
+    """Apply mutations without flagging the state as dirty.
+
+    Used for mutations that are persisted some other way, such as the journal.
+    """
+    global _suppressed
+    _suppressed += 1
+    try:
+        yield
+    finally:
+        _suppressed -= 1
+
+
+class TrackedList(list):
+    """A list that marks the game state dirty when mutated in place.
+
+    ``version`` counts in-place mutations, so that indexes built from the list can tell
+    when they are stale.
+    """
+
+    version = 0
+
+    def _mutated(self):
+        mark_dirty()
+        self.version += 1
+
+    def __setitem__(self, index, value):
+        self._mutated()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index):
+        self._mutated()
+        super().__delitem__(index)
+
+    def __iadd__(self, other):
+        self._mutated()
+        return super().__iadd__(other)
+
+    def __imul__(self, other):
+        self._mutated()
+        return super().__imul__(other)
+
+    def append(self, value):
+        self._mutated()
+        super().append(value)
+
+    def extend(self, values):
+        self._mutated()
+        super().extend(values)
+
+    def insert(self, index, value):
+        self._mutated()
+        super().insert(index, value)
+
+    def remove(self, value):
+        self._mutated()
+        super().remove(value)
+
+    def pop(self, *args):
+        self._mutated()
+        return super().pop(*args)
+
+    def clear(self):
+        self._mutated()
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._mutated()
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._mutated()
+        super().reverse()
+
+
+class TrackedDict(dict):
+    """A dict that marks the game state dirty when mutated in place."""
+
+    def __setitem__(self, key, value):
+        mark_dirty()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        mark_dirty()
+        super().__delitem__(key)
+
+    def __ior__(self, other):
+        mark_dirty()
+        return super().__ior__(other)
+
+    def pop(self, *args):
+        mark_dirty()
+        return super().pop(*args)
+
+    def popitem(self):
+        mark_dirty()
+        return super().popitem()
+
+    def clear(self):
+        mark_dirty()
+        super().clear()
+
+    def update(self, *args, **kwargs):
+        mark_dirty()
+        super().update(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            mark_dirty()
+        return super().setdefault(key, default)
+
+
+def track(value: Any) -> Any:
+    """Wrap plain lists and dicts so that in-place mutations are tracked.
+
+    Args:
+        value: The value about to be stored on a tracked object
+
+    Returns:
+        The value, or a tracked copy of it if it is a plain list or dict
+    """
+    if type(value) is list:
+        return TrackedList(value)
+    if type(value) is dict:
+        return TrackedDict(value)
+    return value
+
+
+class Tracked:
+    """Mixin for objects whose attributes are part of the backed-up game state.
+
+    Attributes listed in ``_untracked_attributes`` are stored normally but never
+    mark the state dirty; use it for bookkeeping that does not need to survive a
+    restart.
+    """
+
+    _untracked_attributes: frozenset[str] = frozenset()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in self._untracked_attributes:
+            value = track(value)
+            current = self.__dict__.get(name, _MISSING)
+            if current is not value and not (
+                    isinstance(value, _SCALAR_TYPES) and type(current) is type(value) and current == value
+            ):
+                mark_dirty()
+        object.__setattr__(self, name, value)
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the object after unpickling, re-wrapping containers."""
+        for name, value in state.items():
+            self.__dict__[name] = value if name in self._untracked_attributes else track(value)
+        mark_dirty()
@@ -13,7 +13,9 @@ import discord
 import bot_client
 import global_vars
 import model.channels
-from model.characters import Character
+from model.characters import Character, abilities_changed
+from model.game.whisper_log import WhisperLog
+from model.persistence import Tracked, journal
 
 # Constants
 STORYTELLER_ALIGNMENT = "neutral"
@@ -29,9 +31,26 @@ class MessageDict(TypedDict):
     jump: str
 
 
-class Player:
+# Counts deaths and revivals, so that anything derived from who is alive can tell when it
+# is stale
+_lives_generation = 0
+
+
+def lives_generation() -> int:
+    """Get a number that changes whenever a player dies or is revived."""
+    return _lives_generation
+
+
+# Attributes holding Discord objects, stored as ids, with the guild method that resolves them
+_DISCORD_ATTRIBUTES = {"user": "get_member", "st_channel": "get_channel"}
+
+
+class Player(Tracked):
     """Stores information about a player in the game."""
 
+    # Updated on every message in the town square; not worth a backup on its own
+    _untracked_attributes = frozenset({"last_active"})
+
     character: Character
     alignment: str
     user: discord.Member
@@ -47,7 +66,7 @@ class Player:
     can_be_nominated: bool
     has_skipped: bool
     has_checked_in: bool
-    message_history: list[MessageDict]
+    whisper_log: WhisperLog | None
     riot_nominee: bool
     last_active: float
     hand_raised: bool
@@ -77,6 +96,7 @@ class Player:
         self.display_name = user.display_name  # Display name with nickname if applicable
         self.position = position  # Position in the seating order
         self.is_ghost = False  # Is the player dead?
+        self.death_day = None  # The number of days started when the player died, if dead
         self.dead_votes = 0 # Number of dead votes the player has.
         self.is_active = False  # Has the player spoken today?
         self.is_inactive = False  # Is the player marked inactive by STs?
@@ -84,7 +104,7 @@ class Player:
         self.can_be_nominated = True  # Can the player be nominated?
         self.has_skipped = False  # Has the player skipped their nomination?
         self.has_checked_in = False  # Has the player checked in?
-        self.message_history = []
+        self.whisper_log = None  # The log of the game's whispers, shared with the other players
         self.riot_nominee = False
         self.last_active = datetime.now().timestamp() # Timestamp of last activity
         self.hand_raised = False
@@ -93,18 +113,87 @@ class Player:
         if global_vars.inactive_role in self.user.roles:
             self.is_inactive = True
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Indexes of abilities depend on which character each player has
+        if name == "character":
+            abilities_changed()
+        elif name == "is_ghost" and self.__dict__.get(name) != value:
+            global _lives_generation
+            _lives_generation += 1
+        super().__setattr__(name, value)
+
     def __getstate__(self) -> dict[str, Any]:
         """Prepare the object for pickling."""
         state = self.__dict__.copy()
-        state["user"] = self.user.id
-        state["st_channel"] = self.st_channel.id if self.st_channel else None
+        state.update(state.pop("_unresolved", {}))
+        if "user" in self.__dict__:
+            state["user"] = self.user.id
+        if "st_channel" in self.__dict__:
+            state["st_channel"] = self.st_channel.id if self.st_channel else None
         return state
 
     def __setstate__(self, state: dict[str, Any]) -> None:
-        """Restore the object after unpickling."""
-        self.__dict__.update(state)
-        self.user = global_vars.server.get_member(state["user"])
-        self.st_channel = global_vars.server.get_channel(state["st_channel"]) if state["st_channel"] else None
+        """Restore the object after unpickling.
+
+        The member and channel are looked up on first use rather than here, so restoring a
+        game does not touch Discord for players that are never accessed.
+        """
+        state = dict(state)
+        ids = {name: state.pop(name) for name in _DISCORD_ATTRIBUTES}
+        if "message_history" in state:
+            # Backed up before whispers were logged; merged into the game's log on load
+            state["_legacy_history"] = state.pop("message_history")
+            state.setdefault("whisper_log", None)
+        # Backed up before death days were recorded
+        state.setdefault("death_day", None)
+        super().__setstate__(state)
+        self.__dict__["_unresolved"] = {name: value for name, value in ids.items() if value is not None}
+        for name, value in ids.items():
+            if value is None:
+                self.__dict__[name] = None
+            else:
+                self.__dict__.pop(name, None)
+
+    def __getattr__(self, name: str) -> Any:
+        """Resolve a member or channel restored by ``__setstate__``."""
+        unresolved = self.__dict__.get("_unresolved")
+        if not unresolved or name not in unresolved:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        value = getattr(global_vars.server, _DISCORD_ATTRIBUTES[name])(unresolved.pop(name))
+        # Resolving an id does not change the game-state, so bypass tracking
+        self.__dict__[name] = value
+        return value
+
+    def _discord_id(self, name: str) -> int | None:
+        """Get the id of a member or channel attribute without resolving it."""
+        unresolved = self.__dict__.get("_unresolved")
+        if unresolved and name in unresolved:
+            return unresolved[name]
+        value = getattr(self, name)
+        return value.id if value is not None else None
+
+    @property
+    def message_history(self) -> list[MessageDict]:
+        """The whispers this player sent or received, oldest first."""
+        return self.whisper_log.history(self) if self.whisper_log is not None else []
+
+    @message_history.setter
+    def message_history(self, messages: list[MessageDict]) -> None:
+        if self.whisper_log is None:
+            if not messages:
+                return
+            self.whisper_log = WhisperLog()
+        self.whisper_log.replace_history(self, messages)
+
+    @property
+    def user_id(self) -> int | None:
+        """The Discord user id of the player."""
+        return self._discord_id("user")
+
+    @property
+    def st_channel_id(self) -> int | None:
+        """The id of the player's storyteller channel, if they have one."""
+        return self._discord_id("st_channel")
 
     async def morning(self) -> None:
         """Reset player state for the morning."""
@@ -135,19 +224,15 @@ class Player:
 
         dies = True
         if global_vars.game.has_automated_life_and_death:
-            on_death_characters = sorted(
-                [person.character for person in global_vars.game.seatingOrder
-                 if hasattr(person.character, 'on_death')],
-                key=lambda c: c.on_death_priority() if hasattr(c, 'on_death_priority') else 0
-            )
-            for player_character in on_death_characters:
+            for player_character in global_vars.game.hooks.death_modifiers():
                 dies = player_character.on_death(self, dies)
 
         if not dies and not force:
             return dies
 
-        self.is_ghost = True
-        self.dead_votes = 1
+        day = len(global_vars.game.days)
+        with journal.recording("kill", lambda: {"player": self.user.id, "day": day}):
+            self._set_dead(True, day)
 
         if not suppress:
             announcement = await message_utils.safe_send(
@@ -160,11 +245,10 @@ class Player:
             await model.channels.ChannelManager(bot_client.client).set_ghost(self.st_channel.id)
         else:
         #     inform storytellers that the player is dead, but that the st channel has not been updated to reflect that
-            for user in global_vars.gamemaster_role.members:
-                await message_utils.safe_send(
-                    user,
-                    f"{self.user.mention} has died, but the ST channel could not be updated to reflect that."
-                )
+            await message_utils.broadcast(
+                global_vars.gamemaster_role.members,
+                f"{self.user.mention} has died, but the ST channel could not be updated to reflect that."
+            )
         await global_vars.game.reseat(global_vars.game.seatingOrder)
 
         return dies
@@ -280,8 +364,8 @@ class Player:
         """Revive the player."""
         from utils import message_utils
 
-        self.is_ghost = False
-        self.dead_votes = 0
+        with journal.recording("revive", lambda: {"player": self.user.id}):
+            self._set_dead(False)
 
         announcement = await message_utils.safe_send(
             global_vars.channel, "{} has come back to life.".format(self.user.mention)
@@ -294,11 +378,10 @@ class Player:
             await model.channels.ChannelManager(bot_client.client).remove_ghost(self.st_channel.id)
         else:
             # Inform storytellers that the player is dead, but that the st channel has not been updated to reflect that
-            for user in global_vars.gamemaster_role.members:
-                await message_utils.safe_send(
-                    user,
-                    f"{self.user.mention} has come back to life, but the ST channel could not be updated to reflect that."
-                )
+            await message_utils.broadcast(
+                global_vars.gamemaster_role.members,
+                f"{self.user.mention} has come back to life, but the ST channel could not be updated to reflect that."
+            )
         await global_vars.game.reseat(global_vars.game.seatingOrder)
 
     async def change_character(self, character_class: type) -> None:
@@ -328,59 +411,90 @@ class Player:
         """
         from utils import message_utils
 
+        # The recipient's copy goes first: it is what the sender is waiting for, and the
+        # record of the whisper needs its time and jump URL
+        error = None
         try:
             message = await message_utils.safe_send(
                 self.user,
                 f"Message from {from_player.display_name}: **{content}**"
             )
         except discord.errors.HTTPException as e:
+            message, error = None, e.text
+        if message is None:
             await message_utils.safe_send(
                 from_player.user,
                 f"Something went wrong with your message to {self.display_name}! Please try again"
             )
             bot_client.logger.info(
                 f"could not send message to {self.display_name}; "
-                f"it is {len(content)} characters long; error {e.text}"
+                f"it is {len(content)} characters long; error {error}"
             )
             return
 
-        # Create message records
-        message_to: MessageDict = {
-            "from_player": from_player,
-            "to_player": self,
+        day = len(global_vars.game.days)
+        with journal.recording("whisper", lambda: {
+            "sender": from_player.user.id,
+            "recipient": self.user.id,
             "content": content,
-            "day": len(global_vars.game.days),
-            "time": message.created_at,
-            "jump": message.jump_url,
-        }
-
-        message_from: MessageDict = {
-            "from_player": from_player,
-            "to_player": self,
-            "content": content,
-            "day": len(global_vars.game.days),
-            "time": message.created_at,
-            "jump": jump,
-        }
-
-        self.message_history.append(message_to)
-        from_player.message_history.append(message_from)
-
-        # Send to storytellers
+            "day": day,
+            "time": message.created_at.isoformat(),
+            "recipient_jump": message.jump_url,
+            "sender_jump": jump,
+        }):
+            self._record_message(from_player, content, day, message.created_at, message.jump_url, jump)
+            global_vars.game.record_whisper(from_player, self, day, message.created_at)
+
+        # The storytellers' copy and the sender's confirmation go out together. Copies for the
+        # whisper channel are low priority, so the outbox merges them when whispers pile up
         if global_vars.whisper_channel:
-            await message_utils.safe_send(
+            log = message_utils.safe_send(
                 global_vars.whisper_channel,
-                f"Message from {from_player.display_name} to {self.display_name}: **{content}**"
+                f"Message from {from_player.display_name} to {self.display_name}: **{content}**",
+                priority=message_utils.Priority.LOW,
             )
         else:
-            for user in global_vars.gamemaster_role.members:
-                if user != self.user:
-                    await message_utils.safe_send(
-                        user,
-                        f"**[**{from_player.display_name} **>** {self.display_name}**]** {content}"
-                    )
+            log = message_utils.broadcast(
+                [user for user in global_vars.gamemaster_role.members if user != self.user],
+                f"**[**{from_player.display_name} **>** {self.display_name}**]** {content}",
+                priority=message_utils.Priority.LOW,
+            )
+        await asyncio.gather(log, message_utils.safe_send(from_player.user, "Message sent!"))
+
+    def _set_dead(self, dead: bool, day: int | None = None) -> None:
+        """Update the state that marks the player as dead or alive.
+
+        Args:
+            dead: Whether the player is now dead
+            day: The number of days started when the player died, if they died
+        """
+        self.is_ghost = dead
+        self.dead_votes = 1 if dead else 0
+        self.death_day = day if dead else None
+
+    def _record_message(
+            self,
+            from_player: 'Player',
+            content: str,
+            day: int,
+            time: datetime,
+            recipient_jump: str,
+            sender_jump: str) -> None:
+        """Record a whisper in the log shared by both players.
 
-        await message_utils.safe_send(from_player.user, "Message sent!")
+        Args:
+            from_player: The player sending the message
+            content: The message content
+            day: The day the message was sent on
+            time: When the message was delivered
+            recipient_jump: The jump URL to the delivered message
+            sender_jump: The jump URL to the original message
+        """
+        log = self.whisper_log if self.whisper_log is not None else from_player.whisper_log
+        if log is None:
+            log = WhisperLog()
+        self.whisper_log = from_player.whisper_log = log
+        log.record(from_player, self, content, day, time, recipient_jump, sender_jump)
 
     async def make_inactive(self) -> None:
         """Mark the player as inactive."""
@@ -401,13 +515,12 @@ class Player:
             ]
 
             if len(not_active) == 1:
-                for memb in global_vars.gamemaster_role.members:
-                    await message_utils.safe_send(
-                        memb, f"Just waiting on {not_active[0].display_name} to speak."
-                    )
+                await message_utils.broadcast(
+                    global_vars.gamemaster_role.members,
+                    f"Just waiting on {not_active[0].display_name} to speak."
+                )
             elif len(not_active) == 0:
-                for memb in global_vars.gamemaster_role.members:
-                    await message_utils.safe_send(memb, "Everyone has spoken!")
+                await message_utils.broadcast(global_vars.gamemaster_role.members, "Everyone has spoken!")
 
             # Notify storytellers about nominations
             can_nominate = [
@@ -420,14 +533,12 @@ class Player:
             ]
 
             if len(can_nominate) == 1:
-                for memb in global_vars.gamemaster_role.members:
-                    await message_utils.safe_send(
-                        memb,
-                        f"Just waiting on {can_nominate[0].display_name} to nominate or skip."
-                    )
+                await message_utils.broadcast(
+                    global_vars.gamemaster_role.members,
+                    f"Just waiting on {can_nominate[0].display_name} to nominate or skip."
+                )
             elif len(can_nominate) == 0:
-                for memb in global_vars.gamemaster_role.members:
-                    await message_utils.safe_send(memb, "Everyone has nominated or skipped!")
+                await message_utils.broadcast(global_vars.gamemaster_role.members, "Everyone has nominated or skipped!")
         else:
             # Night phase
             from utils.player_utils import check_and_print_if_one_or_zero_to_check_in
@@ -473,3 +584,22 @@ class Player:
         except discord.HTTPException as e:
             # Cannot remove role from user who doesn't exist on the server
             bot_client.logger.info("could not remove roles for %s: %s", self.display_name, e.text)
+
+
+@journal.replayer("kill")
+def _replay_kill(game, player: int, day: int | None = None) -> None:
+    # Journals written before death days were recorded have no day
+    journal.find_player(game, player)._set_dead(True, len(game.days) if day is None else day)
+
+
+@journal.replayer("revive")
+def _replay_revive(game, player: int) -> None:
+    journal.find_player(game, player)._set_dead(False)
+
+
+@journal.replayer("whisper")
+def _replay_whisper(game, sender: int, recipient: int, content: str, day: int, time: str, recipient_jump: str,
+                    sender_jump: str) -> None:
+    sender, recipient = journal.find_player(game, sender), journal.find_player(game, recipient)
+    recipient._record_message(sender, content, day, datetime.fromisoformat(time), recipient_jump, sender_jump)
+    game.record_whisper(sender, recipient, day, datetime.fromisoformat(time))
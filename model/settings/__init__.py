@@ -1,4 +1,7 @@
+from ._base_settings import JsonSettingsBackend, SettingsBackend, flush as flush_settings, set_backend
 from .game_settings import GameSettings
 from .global_settings import GlobalSettings
+from .sqlite_backend import SqliteSettingsBackend
 
-__all__ = ['GameSettings', "GlobalSettings"]
\ No newline at end of file
+__all__ = ['GameSettings', "GlobalSettings", 'JsonSettingsBackend', 'SettingsBackend', 'SqliteSettingsBackend',
+           'flush_settings', 'set_backend']
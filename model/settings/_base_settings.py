@@ -1,50 +1,196 @@
 from __future__ import annotations
 
+import copy
 import json
-from dataclasses import dataclass
-from typing import TypeAlias, Any
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import TypeAlias, Any, Hashable
 
 UserId: TypeAlias = int
 UserSettings: TypeAlias = dict[str, Any]
+SettingKey: TypeAlias = tuple[UserId, str]
+
+# Seconds between checks of a cached settings file for changes made outside the bot
+STAT_INTERVAL = 1.0
+
+# Value of a changed setting that was cleared
+DELETED = object()
+
+
+class SettingsBackend(ABC):
+    """Where settings files are persisted.
+
+    Settings are identified by the name of their JSON file, e.g. ``settings.json``, whatever
+    the backend actually stores them in.
+    """
+
+    @abstractmethod
+    def stamp(self, filename: str) -> Hashable:
+        """Get a value that changes whenever the stored settings are changed by someone else."""
+
+    @abstractmethod
+    def read(self, filename: str) -> dict[UserId, UserSettings]:
+        """Read all settings."""
+
+    @abstractmethod
+    def write(self, filename: str, settings: dict[UserId, UserSettings], changes: dict[SettingKey, Any]) -> None:
+        """Persist changed settings.
+
+        Args:
+            filename: The settings file
+            settings: All settings, including the changes
+            changes: The new value of each changed setting, or DELETED if it was cleared
+        """
+
+    def flush(self) -> None:
+        """Make sure every write has been persisted."""
+
+
+class JsonSettingsBackend(SettingsBackend):
+    """Stores settings as JSON files, rewriting the whole file on every write."""
+
+    def stamp(self, filename: str) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def read(self, filename: str) -> dict[UserId, UserSettings]:
+        try:
+            with open(filename, 'r') as f:
+                settings_data = json.load(f)
+        except FileNotFoundError:
+            settings_data = {}
+        # Convert keys from string to int
+        return {int(k): v for k, v in settings_data.items()}
+
+    def write(self, filename: str, settings: dict[UserId, UserSettings], changes: dict[SettingKey, Any]) -> None:
+        with open(filename, 'w') as f:
+            json.dump(settings, f, indent=2)
+
+
+_backend: SettingsBackend = JsonSettingsBackend()
+
+
+def get_backend() -> SettingsBackend:
+    """Get the backend that persists settings."""
+    return _backend
+
+
+def set_backend(backend: SettingsBackend) -> None:
+    """Change the backend that persists settings.
+
+    Args:
+        backend: The new backend
+    """
+    global _backend
+    _backend.flush()
+    _backend = backend
+    invalidate_cache()
+
+
+def flush() -> None:
+    """Persist any settings writes the backend has not yet written."""
+    _backend.flush()
+
+
+@dataclass
+class _CacheEntry:
+    settings: dict[UserId, UserSettings]
+    stamp: Hashable
+    checked: float
+
+
+# Parsed settings by absolute path, shared by every load() in the process
+_cache: dict[str, _CacheEntry] = {}
+
+
+def invalidate_cache(filename: str | None = None) -> None:
+    """Forget cached settings so that the next load() reads them from the backend.
+
+    Args:
+        filename: The settings file to forget, or None for all of them
+    """
+    if filename is None:
+        _cache.clear()
+    else:
+        _cache.pop(os.path.abspath(filename), None)
+
 
 @dataclass
 class _BaseSettings:
     _filename: str
     _settings: dict[UserId, UserSettings]
+    # Whether _settings is the cached dict, which must be copied before it is changed
+    _shared: bool = field(default=False, compare=False, repr=False)
+    # Settings changed since the last save
+    _changed: set[SettingKey] = field(default_factory=set, compare=False, repr=False)
 
-    def __init__(self, filename: str, settings: dict[UserId, UserSettings]) -> None:
+    def __init__(self, filename: str, settings: dict[UserId, UserSettings], shared: bool = False) -> None:
         self._filename = filename
         self._settings = settings
+        self._shared = shared
+        self._changed = set()
 
     # ==============================
     # Generic settings methods
     # ==============================
     def update_settings(self, player_id: UserId, dict_to_merge: UserSettings):
+        self._own()
         self._settings[player_id] = self._settings.get(player_id, {})
         self._settings[player_id].update(dict_to_merge)
+        self._changed.update((player_id, name) for name in dict_to_merge)
 
     def get_settings(self, player_id: UserId, setting_name: str):
-        return self._settings.get(player_id, {}).get(setting_name)
+        value = self._settings.get(player_id, {}).get(setting_name)
+        # Callers may change what they get back; keep the cached settings intact
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
 
     def clear_setting(self, player_id: UserId, setting_name: str):
         player_settings = self._settings.get(player_id)
-        if player_settings:
-            player_settings.pop(setting_name, None)
+        if player_settings and setting_name in player_settings:
+            self._own()
+            self._settings[player_id].pop(setting_name, None)
+            self._changed.add((player_id, setting_name))
+
+    def _own(self):
+        if self._shared:
+            self._settings = copy.deepcopy(self._settings)
+            self._shared = False
 
     # ==============================
     # Serialization/Deserialization
     # ==============================
     def save(self):
-        with open(self._filename, 'w') as f:
-            json.dump(self._settings, f, indent=2)
+        changes = {
+            (player_id, name): self._settings.get(player_id, {}).get(name, DELETED)
+            for player_id, name in self._changed
+        }
+        _backend.write(self._filename, self._settings, changes)
+        self._changed.clear()
+        # The saved settings become the cached settings
+        _cache[os.path.abspath(self._filename)] = _CacheEntry(
+            self._settings, _backend.stamp(self._filename), time.monotonic()
+        )
+        self._shared = True
 
     @classmethod
     def load(cls, filename) -> _BaseSettings:
-        try:
-            with open(filename, 'r') as f:
-                settings_data = json.load(f)
-        except FileNotFoundError:
-            settings_data = {}
-        # Convert keys from string to int
-        normalized_data = {int(k): v for k, v in settings_data.items()}
-        return cls(filename, normalized_data)
+        """Load settings, reading them only if they changed since they were last read or saved.
+
+        The backend is checked for changes at most every STAT_INTERVAL seconds, so repeated
+        loads do no I/O at all.
+        """
+        path = os.path.abspath(filename)
+        entry = _cache.get(path)
+        now = time.monotonic()
+        if entry is None or now - entry.checked >= STAT_INTERVAL:
+            stamp = _backend.stamp(filename)
+            if entry is None or stamp != entry.stamp:
+                entry = _CacheEntry(_backend.read(filename), stamp, now)
+                _cache[path] = entry
+            entry.checked = now
+        return cls(filename, entry.settings, shared=True)
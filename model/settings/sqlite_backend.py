@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+from typing import Any
+
+from model.settings._base_settings import DELETED, JsonSettingsBackend, SettingKey, SettingsBackend, UserId, \
+    UserSettings
+
+# Seconds after the first of a batch of setting writes at which the batch is committed
+WRITE_BEHIND_DELAY = 0.25
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    user_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (user_id, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SqliteSettingsBackend(SettingsBackend):
+    """Stores each setting as a row of a sqlite database, keyed by user id and setting name.
+
+    Each settings file gets a database next to it, e.g. ``settings.json`` is stored in
+    ``settings.db``. The first time a database is opened, the JSON file it replaces is
+    imported into it.
+
+    Writes are queued and committed in one transaction WRITE_BEHIND_DELAY seconds after
+    the first of them, or immediately when there is no running event loop. Later writes
+    join the batch without postponing it, so a steady stream of changes is still
+    committed every WRITE_BEHIND_DELAY seconds. Only the changed settings are written.
+    """
+
+    def __init__(self, delay: float = WRITE_BEHIND_DELAY):
+        """Initialize a SqliteSettingsBackend.
+
+        Args:
+            delay: Seconds after the first pending write at which writes are committed
+        """
+        self.delay = delay
+        self._connections: dict[str, sqlite3.Connection] = {}
+        self._pending: dict[str, dict[SettingKey, Any]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_loop: asyncio.AbstractEventLoop | None = None
+
+    @staticmethod
+    def database_file(filename: str) -> str:
+        """Get the database that stores a settings file.
+
+        Args:
+            filename: The settings file
+
+        Returns:
+            str: The path of the database
+        """
+        return os.path.splitext(filename)[0] + ".db"
+
+    def _connect(self, filename: str) -> sqlite3.Connection:
+        path = os.path.abspath(self.database_file(filename))
+        connection = self._connections.get(path)
+        if connection is None:
+            connection = sqlite3.connect(path)
+            connection.executescript(_SCHEMA)
+            self._import_json(connection, filename)
+            self._connections[path] = connection
+        return connection
+
+    @staticmethod
+    def _import_json(connection: sqlite3.Connection, filename: str) -> None:
+        """Import the JSON settings file the database replaces, once."""
+        with connection:
+            if connection.execute("SELECT 1 FROM meta WHERE key = 'imported'").fetchone():
+                return
+            settings = JsonSettingsBackend().read(filename)
+            connection.executemany(
+                "INSERT OR REPLACE INTO settings VALUES (?, ?, ?)",
+                [
+                    (user_id, name, json.dumps(value))
+                    for user_id, user_settings in settings.items()
+                    for name, value in user_settings.items()
+                ],
+            )
+            connection.execute("INSERT INTO meta VALUES ('imported', ?)", (filename,))
+
+    def stamp(self, filename: str) -> int:
+        # Changes whenever another connection, e.g. another bot process, commits
+        return self._connect(filename).execute("PRAGMA data_version").fetchone()[0]
+
+    def read(self, filename: str) -> dict[UserId, UserSettings]:
+        self.flush()
+        settings: dict[UserId, UserSettings] = {}
+        for user_id, name, value in self._connect(filename).execute("SELECT user_id, name, value FROM settings"):
+            settings.setdefault(user_id, {})[name] = json.loads(value)
+        return settings
+
+    def write(self, filename: str, settings: dict[UserId, UserSettings], changes: dict[SettingKey, Any]) -> None:
+        if not changes:
+            return
+        # Serialize now; the caller may change the values before they are committed
+        pending = self._pending.setdefault(filename, {})
+        pending.update({key: value if value is DELETED else json.dumps(value) for key, value in changes.items()})
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        # Armed once per batch; the loop may differ if a previous one was closed
+        if self._timer is None or self._timer_loop is not loop:
+            self._timer = loop.call_later(self.delay, self.flush)
+            self._timer_loop = loop
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        for filename, changes in pending.items():
+            with self._connect(filename) as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO settings VALUES (?, ?, ?)",
+                    [(user_id, name, value) for (user_id, name), value in changes.items() if value is not DELETED],
+                )
+                connection.executemany(
+                    "DELETE FROM settings WHERE user_id = ? AND name = ?",
+                    [key for key, value in changes.items() if value is DELETED],
+                )
+
+    def close(self) -> None:
+        """Commit pending writes and close the databases."""
+        self.flush()
+        for connection in self._connections.values():
+            connection.close()
+        self._connections.clear()
@@ -152,6 +152,7 @@ async def test_storyteller_endgame_command(mock_discord_setup, setup_test_game):
     # Mock the client presence update and backup functions
     with patch.object(client, 'change_presence', return_value=AsyncMock()), \
             patch('utils.game_utils.remove_backup') as mock_remove_backup, \
+            patch('utils.game_utils.archive_game') as mock_archive_game, \
             patch('utils.game_utils.update_presence', new_callable=AsyncMock):
         # Execute the endgame command with a winner parameter
         mock_send = await run_command_storyteller(
@@ -173,6 +174,9 @@ async def test_storyteller_endgame_command(mock_discord_setup, setup_test_game):
         # Verify appropriate messages were sent
         assert mock_send.called
 
+        # The finished game is archived
+        mock_archive_game.assert_called_once_with(setup_test_game['game'], "good")
+
 
 #######################################
 # Player Management Command Tests
@@ -2,19 +2,25 @@
 Tests for backup, load, and remove_backup functions in bot_impl.py
 """
 
+import os
 from unittest.mock import patch, MagicMock, mock_open, AsyncMock
 
 import pytest
 
 import global_vars
 from model import Game
+from model.characters import Character
 from model.game import Script
+from model.persistence import serializer, tracking
+from model.persistence.snapshot import SnapshotReader
+from model.player import Player
 from tests.fixtures.discord_mocks import mock_discord_setup
-from utils import backup, load, remove_backup
+from utils import backup, game_utils, load, remove_backup
 
 
-def test_backup():
+def test_backup(tmp_path, monkeypatch):
     """Test the backup function."""
+    monkeypatch.chdir(tmp_path)
     # Setup mocks
     mock_game = MagicMock()
     # Use a side_effect with a list to return the attributes we want
@@ -27,23 +33,46 @@ def test_backup():
     # Mock global variables
     original_game = global_vars.game
     global_vars.game = mock_game
+    tracking.mark_dirty()
 
-    # Mock file operations
-    with patch('builtins.open', mock_open()) as mock_file:
-        with patch('dill.dump') as mock_dump:
-            # Call the function under test
-            backup("test_backup.pckl")
-
-            # Verify file is opened for each attribute
-            assert mock_file.call_count == 3  # Once for objects list + once per attribute
+    backup("test_backup.pckl")
 
-            # Verify dill.dump is called with correct arguments
-            assert mock_dump.call_count == 3  # Once for objects list + once per attribute
+    # A single snapshot file holds one section per attribute
+    assert os.listdir(tmp_path) == ["test_backup.pckl"]
+    with SnapshotReader("test_backup.pckl") as reader:
+        names = reader.names()
+        # The seating order message mock is callable, so it is not backed up
+        assert names == ["__schema__", "__players__", "__objects__", "script", "seatingOrder"]
+        state = serializer.decode_sections(names, lambda name: reader.load(name, bytes))
+        assert state["seatingOrder"] == []
+        assert isinstance(state["script"], Script)
 
     # Restore global variable
     global_vars.game = original_game
 
 
+def test_backup_skipped_when_clean():
+    """Test that backup does nothing when the game-state has not changed."""
+    mock_game = MagicMock()
+    mock_game.__dir__ = MagicMock(side_effect=lambda: ["seatingOrder"])
+    mock_game.seatingOrder = []
+
+    original_game = global_vars.game
+    global_vars.game = mock_game
+
+    with patch('model.persistence.snapshot.write_snapshot') as mock_write:
+        tracking.mark_dirty()
+        backup("test_backup.pckl")
+        assert mock_write.call_count == 1
+        assert not tracking.is_dirty()
+
+        # A second backup without changes writes nothing
+        backup("test_backup.pckl")
+        assert mock_write.call_count == 1
+
+    global_vars.game = original_game
+
+
 def test_backup_null_game():
     """Test the backup function with NULL_GAME."""
     # Mock global variables
@@ -99,6 +128,9 @@ async def test_load(mock_discord_setup):
                 assert game.seatingOrderMessage == mock_message
                 assert isinstance(game.script, Script)
 
+                # Legacy backups are rewritten in the current format by the next backup
+                assert tracking.is_dirty()
+
 
 @pytest.mark.asyncio
 async def test_load_missing_file():
@@ -120,6 +152,46 @@ async def test_load_missing_file():
                 assert game is None
 
 
+@pytest.mark.asyncio
+async def test_load_rehydrates_lazily(mock_discord_setup, tmp_path, monkeypatch):
+    """Test that load restores partial messages and leaves players unresolved until used."""
+    monkeypatch.chdir(tmp_path)
+    channels = mock_discord_setup['channels']
+    player = Player(Character, "good", mock_discord_setup['members']['alice'], channels['st_alice'], 0)
+    seating_message = await channels['town_square'].send("**Seating Order:**")
+    info_message = await channels['info'].send("**Seating Order:**")
+    original_game = global_vars.game
+    global_vars.game = Game([player], seating_message, info_message, Script([]), skip_storytellers=True)
+    tracking.mark_dirty()
+    backup("test_backup.pckl")
+    game_utils.flush_backups()
+
+    for channel in (channels['town_square'], channels['info']):
+        channel.get_partial_message = MagicMock(side_effect=lambda message_id: MagicMock(id=message_id))
+        channel.fetch_message = AsyncMock()
+
+    try:
+        with patch('bot_client.logger') as mock_logger:
+            game = await load("test_backup.pckl")
+
+        assert game.seatingOrderMessage.id == seating_message.id
+        assert game.info_channel_seating_order_message.id == info_message.id
+        channels['town_square'].fetch_message.assert_not_awaited()
+        channels['info'].fetch_message.assert_not_awaited()
+
+        loaded = game.seatingOrder[0]
+        assert "user" not in vars(loaded)
+        assert loaded.user is mock_discord_setup['members']['alice']
+        assert loaded.st_channel is channels['st_alice']
+
+        # Each phase is timed
+        message = mock_logger.info.call_args.args[0]
+        assert all(phase in message for phase in ("read", "messages", "replay"))
+    finally:
+        remove_backup("test_backup.pckl")
+        global_vars.game = original_game
+
+
 def test_remove_backup():
     """Test the remove_backup function."""
     # Setup mock game with attributes
@@ -323,7 +323,7 @@ class TestNominationThresholds:
 
         captured_messages = []
 
-        async def capture_safe_send(channel, content):
+        async def capture_safe_send(channel, content, **kwargs):
             captured_messages.append(content)
             mock_msg = MagicMock()
             mock_msg.id = 12345
@@ -372,7 +372,7 @@ class TestNominationThresholds:
 
         captured_messages = []
 
-        async def capture_safe_send(channel, content):
+        async def capture_safe_send(channel, content, **kwargs):
             captured_messages.append(content)
             mock_msg = MagicMock()
             mock_msg.id = 12345
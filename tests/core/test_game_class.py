@@ -147,6 +147,166 @@ async def test_reseat_method(mock_discord_setup, setup_test_game):
         assert " (Modified)" in call_args['content']
 
 
+@pytest.mark.asyncio
+async def test_player_lookups_by_id(mock_discord_setup, setup_test_game):
+    """Test looking up players and storytellers by user id and channel id."""
+    game = setup_test_game['game']
+    players = setup_test_game['players']
+    members = mock_discord_setup['members']
+
+    assert game.get_player(members['alice'].id) is players['alice']
+    assert game.get_player(members['storyteller'].id) is None
+    assert game.get_storyteller(members['storyteller'].id) is players['storyteller']
+    assert game.get_player_by_channel(mock_discord_setup['channels']['st_bob'].id) is players['bob']
+    assert game.get_player_by_channel(mock_discord_setup['channels']['town_square'].id) is None
+
+
+@pytest.mark.asyncio
+async def test_player_index_follows_seating_changes(mock_discord_setup, setup_test_game):
+    """Test that lookups see travelers joining and leaving and storytellers changing."""
+    game = setup_test_game['game']
+    players = setup_test_game['players']
+    alice_id = mock_discord_setup['members']['alice'].id
+    storyteller_id = mock_discord_setup['members']['storyteller'].id
+    index = game.players_index
+
+    # Unchanged lists reuse the index
+    assert game.players_index is index
+
+    game.seatingOrder.remove(players['alice'])
+    assert game.get_player(alice_id) is None
+
+    game.seatingOrder = [players['alice']]
+    assert game.get_player(alice_id) is players['alice']
+
+    game.storytellers.clear()
+    assert game.get_storyteller(storyteller_id) is None
+
+    with patch('model.channels.channel_utils.reorder_channels', new_callable=AsyncMock), \
+            patch('utils.message_utils.safe_send', new_callable=AsyncMock):
+        bob = players['bob']
+        bob.position = 0
+        await game.add_traveler(bob)
+        assert game.get_player(bob.user.id) is bob
+        await game.remove_traveler(bob)
+        assert game.get_player(bob.user.id) is None
+
+
+def test_ability_index_includes_granted_abilities(mock_discord_setup, setup_test_game):
+    """Test finding abilities granted through nested ability modifiers."""
+    from model.characters.specific import Banshee, Cannibal, Philosopher, Voudon
+
+    game = setup_test_game['game']
+    alice, bob = setup_test_game['players']['alice'], setup_test_game['players']['bob']
+    assert game.abilities.holders(Voudon) == []
+
+    alice.character = Philosopher(alice)
+    alice.character.add_ability(Cannibal)
+    alice.character.add_ability(Banshee)
+    banshee = alice.character.abilities[0].abilities[0]
+    assert game.abilities.ability(alice, Banshee) is banshee
+    assert game.abilities.holders(Banshee) == [(alice, banshee)]
+    assert game.abilities.ability(bob, Banshee) is None
+
+    alice.character.clear_ability()
+    assert game.abilities.ability(alice, Banshee) is None
+
+    bob.character = Voudon(bob)
+    assert [person for person, _ in game.abilities.holders(Voudon)] == [bob]
+
+
+def test_ability_index_is_reused_until_abilities_change(mock_discord_setup, setup_test_game):
+    """Test that the index is only rebuilt after a change to someone's abilities."""
+    import copy
+    from model.characters.specific import Banshee, Philosopher
+
+    game = setup_test_game['game']
+    alice = setup_test_game['players']['alice']
+    alice.character = Philosopher(alice)
+    index = game.abilities
+
+    alice.is_ghost = True
+    alice.character.poison()
+    copy.deepcopy(alice.character)
+    assert game.abilities is index
+
+    alice.character.abilities.append(Banshee(alice))
+    assert game.abilities is not index
+    assert game.abilities.ability(alice, Banshee) is alice.character.abilities[0]
+
+
+def test_hooks_follow_seating_order_and_characters(mock_discord_setup, setup_test_game):
+    """Test that event subscribers stay in seating order as characters change."""
+    from model.characters import DayStartModifier
+    from model.characters.specific import Assassin, Lleech
+
+    game = setup_test_game['game']
+    alice, bob, charlie = (setup_test_game['players'][name] for name in ('alice', 'bob', 'charlie'))
+    hooks = game.hooks
+    assert game.hooks is hooks
+
+    charlie.character = Assassin(charlie)
+    alice.character = Lleech(alice)
+    assert game.hooks is not hooks
+    assert game.hooks.subscribers(DayStartModifier) == [alice.character, charlie.character]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_day_start_leaves_later_seats_alone(mock_discord_setup, setup_test_game):
+    """Test that mornings and day-start hooks interleave in seat order, and stop when one cancels."""
+    from model.characters.specific import Assassin
+
+    game = setup_test_game['game']
+    alice, bob, charlie = (setup_test_game['players'][name] for name in ('alice', 'bob', 'charlie'))
+    bob.character = Assassin(bob)
+    calls = []
+    for person in (alice, bob, charlie):
+        person.morning = AsyncMock(side_effect=lambda person=person: calls.append(person.display_name))
+
+    async def cancel(origin, kills):
+        calls.append("day start")
+        return False
+
+    days = len(game.days)
+    with patch.object(bob.character, 'on_day_start', side_effect=cancel), \
+            patch.object(global_vars, 'game', game):
+        await Game.start_day(game)  # The fixture replaces start_day on the game
+
+    assert calls == [alice.display_name, bob.display_name, "day start"]
+    assert len(game.days) == days
+
+
+def test_death_modifiers_act_by_priority(mock_discord_setup, setup_test_game):
+    """Test that death modifiers are ordered by priority, including granted abilities."""
+    from model.characters.specific import Assassin, Philosopher, Sailor, TeaLady
+
+    game = setup_test_game['game']
+    alice, bob, charlie = (setup_test_game['players'][name] for name in ('alice', 'bob', 'charlie'))
+    alice.character = Assassin(alice)
+    bob.character = Sailor(bob)
+    charlie.character = Philosopher(charlie)
+    assert game.hooks.death_modifiers() == [bob.character, charlie.character, alice.character]
+
+    # A Philosopher's priority is that of the ability they gained
+    charlie.character.add_ability(TeaLady)
+    assert game.hooks.death_modifiers() == [charlie.character, bob.character, alice.character]
+    charlie.character.poison()
+    assert game.hooks.death_modifiers() == [bob.character, charlie.character, alice.character]
+
+
+def test_player_index_is_not_backed_up(mock_discord_setup, setup_test_game):
+    """Test that the index is rebuilt after a restore rather than saved with the game."""
+    game = setup_test_game['game']
+    game.get_player(mock_discord_setup['members']['alice'].id)
+
+    state = game.__getstate__()
+    assert "_player_index" not in state
+
+    restored = Game.__new__(Game)
+    restored.__setstate__(state)
+    assert restored.get_player(mock_discord_setup['members']['alice'].id) is game.seatingOrder[0]
+
+
 @pytest.mark.asyncio
 async def test_whisper_mode_changing(mock_discord_setup, setup_test_game):
     """Test changing whisper modes in the Game class."""
@@ -288,8 +448,20 @@ async def test_update_seating_order_message_posts_to_info_channel(mock_info_chan
     game.seatingOrderMessage.edit.assert_called_once_with(content=message_text)
 
 
-    # --- Scenario 2: Subsequent update (existing message in info channel) ---
+    # --- Scenario 2: Update that changes nothing ---
+    await game.update_seating_order_message()
+
+    # Both messages already show the seating order, so neither is edited
+    mock_sent_message_scenario1.edit.assert_not_called()
+    assert game.seatingOrderMessage.edit.call_count == 1
+
+    # --- Scenario 3: Subsequent update (existing message in info channel) ---
     # game.info_channel_seating_order_message is now mock_sent_message_scenario1
+    first_player = game.seatingOrder[0]
+    first_player.hand_raised = True
+    message_text = message_text.replace(
+        f"\n{first_player.display_name}\n", f"\n{first_player.display_name} ✋\n", 1
+    )
     await game.update_seating_order_message()
 
     mock_sent_message_scenario1.edit.assert_called_once_with(content=message_text)
@@ -299,7 +471,7 @@ async def test_update_seating_order_message_posts_to_info_channel(mock_info_chan
     assert game.seatingOrderMessage.edit.call_count == 2
 
 
-    # --- Scenario 3: Message in info channel was deleted ---
+    # --- Scenario 4: Message in info channel was deleted ---
     # game.info_channel_seating_order_message is still mock_sent_message_scenario1
     # Make its edit method raise NotFound
     mock_sent_message_scenario1.edit.side_effect = discord.errors.NotFound(Mock(), "Message not found")
@@ -310,7 +482,8 @@ async def test_update_seating_order_message_posts_to_info_channel(mock_info_chan
     # Instead of replacing mock_info_channel.send, we make the original_send_mock return the new message on its next call
     original_send_mock.return_value = mock_sent_message_scenario3
 
-
+    first_player.hand_raised = False
+    message_text = message_text.replace(" ✋", "", 1)
     await game.update_seating_order_message()
 
     # send should be called again (total 2 times now on original_send_mock)
@@ -367,10 +540,16 @@ async def test_game_functions_correctly_with_none_info_channel_message(mock_info
     mock_info_channel.send.assert_called_once()
     assert game.info_channel_seating_order_message == mock_sent_message
 
-    # Test update_seating_order_message again (should edit existing message)
+    # Test update_seating_order_message again (nothing changed, so nothing is edited)
     mock_sent_message.edit = AsyncMock()
     await game.update_seating_order_message()
 
+    mock_sent_message.edit.assert_not_called()
+
+    # Test update_seating_order_message after a change (should edit existing message)
+    bob.hand_raised = True
+    await game.update_seating_order_message()
+
     mock_sent_message.edit.assert_called_once()
     # send should not be called again
     assert mock_info_channel.send.call_count == 1
@@ -392,6 +571,7 @@ async def test_game_functions_correctly_with_none_info_channel_message(mock_info
     with patch('global_vars.channel', mock_main_channel), \
             patch('global_vars.whisper_channel', None), \
             patch('utils.game_utils.remove_backup'), \
+            patch('utils.game_utils.archive_game'), \
             patch('utils.game_utils.update_presence'):
         await game.end(winner='good')
 
@@ -401,6 +581,7 @@ async def test_game_functions_correctly_with_none_info_channel_message(mock_info
     with patch('global_vars.channel', mock_main_channel), \
             patch('global_vars.whisper_channel', None), \
             patch('utils.game_utils.remove_backup'), \
+            patch('utils.game_utils.archive_game'), \
             patch('utils.game_utils.update_presence'):
         # This should not raise any exceptions
         await game.end(winner='evil')
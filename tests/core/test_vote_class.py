@@ -12,6 +12,8 @@ import global_vars
 from model import Vote, TravelerVote
 from tests.fixtures.discord_mocks import mock_discord_setup, MockMessage, MockChannel
 from tests.fixtures.game_fixtures import setup_test_game, setup_test_vote
+from utils import message_utils
+from utils.outbox import Priority
 
 
 # Mock VoteBeginningModifier since we can't test with an interface
@@ -126,13 +128,17 @@ async def test_vote_call_next():
         with patch('utils.message_utils.safe_send', new_callable=AsyncMock) as mock_safe_send:
             # Call the method under test
             await vote.call_next()
+            # Storytellers are sent the digest of the vote's calls
+            await message_utils.flush_digest()
 
             # Verify safe_send calls
             assert mock_safe_send.call_count == 2
             # Verify message sent to town square
-            mock_safe_send.assert_any_call(mock_channel, f"{mock_user.mention}, your vote on Alice. Current votes: 0.")
+            mock_safe_send.assert_any_call(mock_channel, f"{mock_user.mention}, your vote on Alice. Current votes: 0.",
+                                           priority=Priority.URGENT)
             # Verify message sent to the Storytellers
-            mock_safe_send.assert_any_call(mock_gm, "Bob's vote on Alice. They have no default. Current votes: 0.")
+            mock_safe_send.assert_any_call(mock_gm, "Bob's vote on Alice. They have no default. Current votes: 0.",
+                                           priority=Priority.LOW)
 
 
 @pytest.mark.asyncio
@@ -378,7 +378,9 @@ async def test_whisper_functionality(mock_discord_setup, setup_test_game):
         with patch('model.game.whisper_mode.choose_whisper_candidates',
                    return_value=[setup_test_game['players']['bob']]):
             with patch('utils.game_utils.backup', return_value=None):
-                with patch('utils.message_utils.safe_send', return_value=AsyncMock()) as mock_safe_send:
+                with patch('utils.message_utils.safe_send',
+                           return_value=AsyncMock(created_at=datetime.datetime.now(datetime.timezone.utc))
+                           ) as mock_safe_send:
                     # Mock necessary objects to avoid real Discord operations
                     # Mock whisper_channel to avoid sending to storytellers
                     mock_whisper_channel = AsyncMock()
@@ -696,7 +698,8 @@ async def test_endgame_process(mock_discord_setup, setup_test_game):
 
     # Test ending the game
     with patch('utils.game_utils.backup', return_value=None):
-        with patch('utils.game_utils.remove_backup', return_value=None):
+        with patch('utils.game_utils.remove_backup', return_value=None), \
+                patch('utils.game_utils.archive_game'):
             with patch('utils.game_utils.update_presence', return_value=AsyncMock()):
                 with patch('utils.message_utils.safe_send', return_value=AsyncMock()) as mock_safe_send:
                     # Mock channel pins
@@ -28,6 +28,7 @@ def backup_patches_combined():
     return [
         patch('utils.game_utils.backup', return_value=None),
         patch('utils.game_utils.remove_backup', return_value=None),
+        patch('utils.game_utils.archive_game', return_value=None),
     ]
 
 
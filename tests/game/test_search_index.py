@@ -0,0 +1,88 @@
+"""
+Tests for searching the content of whispers
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+from model.game.search_index import SearchIndex, SearchQuery, parse_query
+from model.game.whisper_log import WhisperLog
+
+START = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _log(*whispers):
+    log = WhisperLog()
+    for minutes, (sender, recipient, content, day) in enumerate(whispers):
+        log.record(sender, recipient, content, day, START + timedelta(minutes=minutes), "", "")
+    return log
+
+
+def test_parse_query_reads_phrases_and_filters():
+    """Test splitting search text into terms, a day and a player."""
+    assert parse_query('Demon "is the Imp" day:2 with:alice') == SearchQuery(["demon", "is the imp"], 2, "alice")
+    assert parse_query("poisoner?") == SearchQuery(["poisoner?"])
+    assert parse_query('unclosed "quote').terms == ["unclosed", '"quote']
+
+
+def test_candidates_match_inside_words():
+    """Test that the index finds every row holding the words of all terms, within longer words."""
+    index = SearchIndex(["I am the Fortune Teller", "misfortunes never end", "teller of tales"])
+    index.add("nothing to see")
+
+    assert len(index) == 4
+    assert index.candidates(["fortune"]) == [0, 1]
+    assert index.candidates(["fortune", "teller"]) == [0]
+    assert index.candidates(["missing"]) == []
+    assert index.candidates(["?"]) is None
+
+    # Words added after the index was built are found inside longer words too
+    assert index.candidates(["thing"]) == [3]
+    assert index.candidates(["ee"]) == [3]
+    assert index.candidates(["t"]) == [0, 1, 2, 3]
+
+
+def test_search_needs_every_term_and_whole_phrases():
+    """Test multi-term and phrase searches, in the order the whispers were sent."""
+    alice, bob = Mock(), Mock()
+    log = _log(
+        (alice, bob, "I think the imp is Charlie", 1),
+        (bob, alice, "the imp? I think not", 1),
+        (alice, bob, "Charlie is the imp, I think", 2),
+    )
+
+    assert [w.content for w in log.search(["think", "imp"])] == [w.content for w in log]
+    assert [w.content for w in log.search(["the imp is"])] == ["I think the imp is Charlie"]
+    assert [w.content for w in log.search(["imp?"])] == ["the imp? I think not"]
+
+
+def test_search_filters_by_day_player_and_history():
+    """Test limiting a search to a day, a player's whispers or a player's own history."""
+    alice, bob, charlie = Mock(), Mock(), Mock()
+    log = _log(
+        (alice, bob, "hello", 1),
+        (bob, charlie, "hello", 1),
+        (charlie, alice, "hello", 2),
+    )
+    log.replace_history(charlie, [])
+
+    assert [w.day for w in log.search(["hello"], day=2)] == [2]
+    assert [(w.sender, w.recipient) for w in log.search(["hello"], person=charlie)] == [(1, 2), (2, 0)]
+    assert log.search(["hello"], holder=charlie) == []
+    assert len(log.search([], holder=alice)) == 2
+    assert log.search(["hello"], person=Mock()) == []
+
+
+def test_index_follows_new_and_restored_whispers():
+    """Test that the index is kept up to date once built, and rebuilt for a restored log."""
+    alice, bob = Mock(), Mock()
+    log = _log((alice, bob, "first", 1))
+    assert len(log.search(["first"])) == 1
+
+    log.record(bob, alice, "second", 1, START, "", "")
+    assert len(log.search_index) == 2
+    assert len(log.search(["second"])) == 1
+
+    restored = WhisperLog.__new__(WhisperLog)
+    restored.__setstate__(log.__getstate__())
+    assert [w.content for w in restored.search(["second"])] == ["second"]
@@ -0,0 +1,76 @@
+"""
+Tests for the renderer keeping the seating order messages up to date
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from model.characters import Traveler
+from tests.fixtures.discord_mocks import mock_discord_setup
+from tests.fixtures.game_fixtures import setup_test_game
+
+
+def _seating_message(edits):
+    """A seating order message recording its edits, each taking a moment to reach Discord."""
+    async def edit(content):
+        edits.append(content)
+        await asyncio.sleep(0.01)
+
+    return Mock(edit=AsyncMock(side_effect=edit))
+
+
+def test_render_marks_the_dead_hands_and_travelers(mock_discord_setup, setup_test_game):
+    """Test each player's line, and that it follows changes to the player."""
+    players = setup_test_game['players']
+    alice, bob, charlie = players['alice'], players['bob'], players['charlie']
+    game = setup_test_game['game']
+    alice.is_ghost, alice.dead_votes = True, 0
+    bob.is_ghost, bob.dead_votes = True, 2
+    charlie.character = Traveler(charlie)
+    charlie.hand_raised = True
+
+    text = game.seating_message.render(game.seatingOrder)
+    assert text.split("\n") == [
+        "**Seating Order:**", "~~Alice~~ X", "~~Bob~~ OO", "Charlie ✋ - Traveler"
+    ]
+
+    charlie.hand_raised = False
+    assert game.seating_message.render(game.seatingOrder).endswith("\nCharlie - Traveler")
+
+
+@pytest.mark.asyncio
+async def test_unchanged_messages_are_not_edited(mock_discord_setup, setup_test_game):
+    """Test that an update edits only when the seating order message would change."""
+    game = setup_test_game['game']
+    edits = []
+    game.seatingOrderMessage = _seating_message(edits)
+
+    with patch('global_vars.info_channel', None):
+        await game.update_seating_order_message()
+        await game.update_seating_order_message()
+        setup_test_game['players']['bob'].hand_raised = True
+        await game.update_seating_order_message()
+
+    assert len(edits) == 2
+    assert "Bob ✋" in edits[-1]
+
+
+@pytest.mark.asyncio
+async def test_a_burst_of_updates_is_folded_into_few_edits(mock_discord_setup, setup_test_game):
+    """Test that a vote's worth of overlapping updates makes a couple of edits showing the latest state."""
+    game = setup_test_game['game']
+    edits = []
+    game.seatingOrderMessage = _seating_message(edits)
+    players = game.seatingOrder
+
+    async def vote(voter):
+        voter.hand_raised = True
+        await game.update_seating_order_message()
+
+    with patch('global_vars.info_channel', None):
+        await asyncio.gather(*(vote(players[i % len(players)]) for i in range(15)))
+
+    assert len(edits) <= 2
+    assert edits[-1].count("✋") == len(players)
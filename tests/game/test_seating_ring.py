@@ -0,0 +1,75 @@
+"""
+Tests for the seating ring used for seat-relative lookups
+"""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from model.game.seating_ring import SeatingRing
+from tests.fixtures.discord_mocks import mock_discord_setup
+from tests.fixtures.game_fixtures import setup_test_game
+
+
+def _seated(setup_test_game):
+    players = setup_test_game['players']
+    return players['alice'], players['bob'], players['charlie']
+
+
+def test_positions_and_clockwise_order(mock_discord_setup, setup_test_game):
+    """Test looking up seats and walking round the table from any seat."""
+    alice, bob, charlie = _seated(setup_test_game)
+    ring = setup_test_game['game'].seating
+
+    assert ring.position(charlie) == 2
+    assert ring.position(setup_test_game['players']['storyteller']) is None
+    assert list(ring.clockwise_from(bob)) == [bob, charlie, alice]
+    assert list(ring.clockwise_from(bob, include_start=False)) == [charlie, alice, bob]
+    assert ring.neighbors(alice) == (charlie, bob)
+    assert ring.swapped(alice, charlie) == [charlie, bob, alice]
+
+    with pytest.raises(ValueError):
+        ring.clockwise_from(setup_test_game['players']['storyteller'])
+
+
+def test_living_neighbors_follow_deaths(mock_discord_setup, setup_test_game):
+    """Test that living neighbours skip the dead and see revivals."""
+    alice, bob, charlie = _seated(setup_test_game)
+    ring = setup_test_game['game'].seating
+    assert ring.living_neighbors(alice) == [charlie, bob]
+
+    bob.is_ghost = True
+    assert ring.living_neighbors(alice) == [charlie, charlie]
+    assert ring.living_neighbors(bob) == [alice, charlie]
+
+    charlie.is_ghost = True
+    assert ring.living_neighbors(alice) == []
+
+    bob.is_ghost = False
+    assert ring.living_neighbors(alice) == [bob, bob]
+
+
+def test_living_neighbors_in_a_larger_ring():
+    """Test the two passes round the table against a direct search."""
+    people = [Mock(is_ghost=dead) for dead in (True, False, True, True, False, False, True)]
+    ring = SeatingRing(people)
+    for seat, person in enumerate(people):
+        left = next(people[(seat - i) % 7] for i in range(1, 7) if not people[(seat - i) % 7].is_ghost)
+        right = next(people[(seat + i) % 7] for i in range(1, 7) if not people[(seat + i) % 7].is_ghost)
+        assert ring.living_neighbors(person) == [left, right]
+
+
+@pytest.mark.asyncio
+async def test_ring_follows_reseats(mock_discord_setup, setup_test_game):
+    """Test that the ring is reused until the seating order changes."""
+    alice, bob, charlie = _seated(setup_test_game)
+    game = setup_test_game['game']
+    ring = game.seating
+    assert game.seating is ring
+
+    with patch('model.channels.channel_utils.reorder_channels', new_callable=AsyncMock):
+        await game.reseat(ring.swapped(alice, bob))
+
+    assert game.seating is not ring
+    assert list(game.seating) == [bob, alice, charlie]
+    assert "_seating_ring" not in game.__getstate__()
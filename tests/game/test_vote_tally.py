@@ -0,0 +1,126 @@
+"""
+Tests for the live vote tally kept in one message per nomination
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import discord
+import pytest
+
+import global_vars
+from model import Vote
+from model.game.vote_tally import LiveVoteTally
+from tests.fixtures.discord_mocks import mock_discord_setup, MockMessage
+from tests.fixtures.game_fixtures import setup_test_game
+from utils.outbox import Priority
+
+
+@pytest.mark.asyncio
+async def test_votes_cast_during_an_edit_are_shown_together():
+    """Test that the tally is posted once, then edited at a limited rate with the latest votes."""
+    edits = []
+
+    async def edit(content):
+        edits.append(content)
+        await asyncio.sleep(0.01)
+
+    message = Mock(pin=AsyncMock(), edit=AsyncMock(side_effect=edit))
+    voters = [SimpleNamespace(display_name=name) for name in ("Alice", "Bob", "Charlie", "Dana")]
+    vote = SimpleNamespace(nominee=voters[0], nominator=voters[1], votes=0, order=voters, history=[])
+    tally = LiveVoteTally()
+
+    with patch('model.game.vote_tally.EDIT_INTERVAL', 0.01), \
+            patch('utils.message_utils.safe_send', AsyncMock(return_value=message)) as mock_safe_send:
+        for vt in (1, 0, 1, 1):
+            vote.history.append(vt)
+            vote.votes += vt
+            assert await tally.show(vote) is message
+        await tally.flush()
+
+    mock_safe_send.assert_called_once_with(
+        global_vars.channel, "**Votes on Alice** (nominated by Bob): 1 votes.\nAlice votes yes.",
+        priority=Priority.URGENT
+    )
+    message.pin.assert_awaited_once()
+    assert len(edits) <= 2
+    assert edits[-1] == tally.render(vote)
+    assert edits[-1].endswith("3 votes.\nAlice votes yes.\nBob votes no.\nCharlie votes yes.\nDana votes yes.")
+
+
+@pytest.mark.asyncio
+async def test_failed_edits_are_retried_until_the_latest_votes_are_shown():
+    """Test that a failed edit is retried, and that a tally given up on is edited on the next vote."""
+    error = discord.HTTPException(response=Mock(), message="Error")
+    message = Mock(pin=AsyncMock(), edit=AsyncMock(side_effect=[error, None, error, error, None]))
+    voters = [SimpleNamespace(display_name=name) for name in ("Alice", "Bob", "Charlie")]
+    vote = SimpleNamespace(nominee=voters[0], nominator=voters[1], votes=0, order=voters, history=[])
+    tally = LiveVoteTally()
+
+    with patch('model.game.vote_tally.EDIT_INTERVAL', 0), \
+            patch('model.game.vote_tally.RETRY_DELAY', 0.001), \
+            patch('model.game.vote_tally.EDIT_ATTEMPTS', 2), \
+            patch('utils.message_utils.safe_send', AsyncMock(return_value=message)):
+        vote.history.append(1)
+        await tally.show(vote)
+        vote.history.append(1)
+        await tally.show(vote)
+        await tally.flush()
+        assert message.edit.await_count == 2
+        assert message.edit.await_args.kwargs["content"] == tally.render(vote)
+
+        # Two failures in a row give up, leaving the last votes for the next one to show
+        vote.history.append(0)
+        await tally.show(vote)
+        await tally.flush()
+        assert message.edit.await_count == 4
+        await tally.show(vote)
+        await tally.flush()
+
+    assert message.edit.await_count == 5
+    assert message.edit.await_args.kwargs["content"].endswith("Charlie votes no.")
+
+
+@pytest.mark.asyncio
+async def test_live_tally_replaces_the_per_vote_messages(mock_discord_setup, setup_test_game):
+    """Test a whole vote with the live tally: one pinned tally, no fetches, and the usual result."""
+    alice = setup_test_game['players']['alice']
+    bob = setup_test_game['players']['bob']
+    global_vars.game = setup_test_game['game']
+    global_vars.game.live_vote_tally = True
+    global_vars.channel = mock_discord_setup['channels']['town_square']
+
+    day = MagicMock(open_noms=AsyncMock(), open_pms=AsyncMock(), voteEndMessages=[], aboutToDie=None)
+    global_vars.game.days = [day]
+    vote = Vote(alice, bob)
+    day.votes = [vote]
+
+    sent = []
+
+    async def send(channel, content=None, **kwargs):
+        message = MockMessage(content=content, channel=channel)
+        message.edit = AsyncMock()
+        message.unpin = AsyncMock()
+        sent.append(message)
+        return message
+
+    with patch('model.game.vote_tally.EDIT_INTERVAL', 0.01), \
+            patch('utils.message_utils.safe_send', AsyncMock(side_effect=send)), \
+            patch.object(global_vars.channel, 'fetch_message', AsyncMock()) as mock_fetch, \
+            patch.object(global_vars.game, 'update_seating_order_message', AsyncMock()):
+        for voter in list(vote.order):
+            await vote.vote(1, voter=voter)
+
+    tallies = [message for message in sent if message.content.startswith("**Votes on")]
+    assert len(tallies) == 1
+    tally = tallies[0]
+    assert not any(" votes yes. " in message.content for message in sent)
+    mock_fetch.assert_not_called()
+    assert set(vote.announcements) == {tally.id}
+
+    # The tally shows every vote before the result, and is unpinned with the vote
+    assert tally.edit.await_args.kwargs["content"].count("votes yes.") == len(vote.order)
+    tally.unpin.assert_awaited_once()
+    assert any(message.content.startswith(f"{vote.votes} votes on Alice") for message in sent)
+    assert vote.done
@@ -0,0 +1,77 @@
+"""
+Tests for the game's log of whispers
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+from model.game.whisper_log import RECIPIENT, SENDER, WhisperLog
+
+START = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _at(minutes):
+    return START + timedelta(minutes=minutes)
+
+
+def _message(sender, recipient, content, minutes, jump, day=1):
+    return {"from_player": sender, "to_player": recipient, "content": content, "day": day,
+            "time": _at(minutes), "jump": jump}
+
+
+def test_whispers_are_stored_once_and_shared():
+    """Test that both players see one row, each with the jump URL to their own copy."""
+    alice, bob, charlie = Mock(), Mock(), Mock()
+    log = WhisperLog()
+    log.record(alice, bob, "hi", 1, _at(0), "to-bob", "from-alice")
+    log.record(bob, charlie, "psst", 1, _at(1), "to-charlie", "from-bob")
+
+    assert len(log) == 2
+    assert log.history(alice) == [_message(alice, bob, "hi", 0, "from-alice")]
+    assert log.history(bob) == [_message(alice, bob, "hi", 0, "to-bob"), _message(bob, charlie, "psst", 1, "from-bob")]
+    assert log.history(Mock()) == []
+    assert [msg["content"] for msg in log.messages()] == ["hi", "psst"]
+
+
+def test_replacing_a_history_keeps_the_other_players_copy():
+    """Test that replacing one player's history leaves the other player's untouched."""
+    alice, bob = Mock(), Mock()
+    log = WhisperLog()
+    log.record(alice, bob, "hi", 1, _at(0), "to-bob", "from-alice")
+
+    log.replace_history(alice, [_message(bob, alice, "hello", 2, "to-alice")])
+
+    assert log.history(alice) == [_message(bob, alice, "hello", 2, "to-alice")]
+    assert log.history(bob) == [_message(alice, bob, "hi", 0, "to-bob")]
+    assert [whisper.holders for whisper in log] == [RECIPIENT, RECIPIENT]
+
+
+def test_adopting_legacy_histories_merges_the_two_copies():
+    """Test that both copies of a whisper from an old backup become one row."""
+    alice, bob = Mock(), Mock()
+    naive = datetime(2024, 1, 1, 12)
+    sent = {"from_player": alice, "to_player": bob, "content": "hi", "day": 1, "time": naive, "jump": "from-alice"}
+    log = WhisperLog()
+    log.adopt({
+        bob: [dict(sent, jump="to-bob"), dict(sent, jump="to-bob-again")],
+        alice: [sent],
+    })
+
+    assert [whisper.holders for whisper in log] == [SENDER | RECIPIENT, RECIPIENT]
+    assert log.history(alice) == [_message(alice, bob, "hi", 0, "from-alice")]
+    assert [msg["jump"] for msg in log.history(bob)] == ["to-bob", "to-bob-again"]
+
+
+def test_restoring_rebuilds_the_histories():
+    """Test that a log restored from its backed-up state serves the same histories."""
+    alice, bob = Mock(), Mock()
+    log = WhisperLog()
+    log.record(alice, bob, "hi", 1, _at(0), "to-bob", "from-alice")
+    state = log.__getstate__()
+    assert set(state) == {"whispers", "people"}
+
+    restored = WhisperLog.__new__(WhisperLog)
+    restored.__setstate__({"whispers": [list(row) for row in state["whispers"]], "people": list(state["people"])})
+
+    assert restored.history(alice) == log.history(alice)
+    assert restored.history(bob) == log.history(bob)
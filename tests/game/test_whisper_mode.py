@@ -8,6 +8,7 @@ import pytest
 
 from model import Game, Vote
 from model.game import WhisperMode
+from model.game.seating_ring import SeatingRing
 from model.game.whisper_mode import to_whisper_mode, choose_whisper_candidates
 
 
@@ -113,6 +114,7 @@ async def test_choose_whisper_candidates_neighbors_mode(mock_get_player):
     player3 = MagicMock()
 
     game.seatingOrder = [player1, player2, player3]
+    game.seating = SeatingRing(game.seatingOrder)
     game.storytellers = ["storyteller1", "storyteller2"]
 
     author = MagicMock()
@@ -142,6 +144,7 @@ async def test_choose_whisper_candidates_edge_case_two_players(mock_get_player):
     player2 = MagicMock()
 
     game.seatingOrder = [player1, player2]
+    game.seating = SeatingRing(game.seatingOrder)
     game.storytellers = ["storyteller1"]
 
     author = MagicMock()
@@ -173,6 +176,7 @@ async def test_choose_whisper_candidates_edge_case_circular(mock_get_player):
     player3 = MagicMock()
 
     game.seatingOrder = [player1, player2, player3]
+    game.seating = SeatingRing(game.seatingOrder)
     game.storytellers = ["storyteller1"]
 
     author = MagicMock()
@@ -219,6 +223,7 @@ async def test_whisper_mode_transitions():
 
     # Set up initial state
     game.seatingOrder = [player1, player2, player3]
+    game.seating = SeatingRing(game.seatingOrder)
     game.whisper_mode = WhisperMode.ALL
     game.days = [MagicMock(spec=Day)]
     game.days[-1].votes = []
@@ -273,6 +278,7 @@ async def test_whisper_candidates_for_different_modes():
     storyteller = MagicMock()
 
     game.seatingOrder = [player1, player2, player3]
+    game.seating = SeatingRing(game.seatingOrder)
     game.storytellers = [storyteller]
 
     # Define a helper function to check if player is in candidates
@@ -0,0 +1,139 @@
+"""
+Tests for the whisper counts behind the message tally
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+import discord
+
+from model.game.seating_ring import SeatingRing
+from model.game.whisper_tally import WhisperTally, format_tally, tally_report
+from tests.fixtures.discord_mocks import mock_discord_setup
+from tests.fixtures.game_fixtures import setup_test_game
+
+START = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _at(minutes):
+    return START + timedelta(minutes=minutes)
+
+
+def _people(*names):
+    people = []
+    for name in names:
+        person = Mock(is_ghost=False)
+        person.display_name = name
+        people.append(person)
+    return people
+
+
+def test_windows_count_whispers_since_their_start():
+    """Test counting whispers by day and since a time, in either direction."""
+    alice, bob, charlie = _people("Alice", "Bob", "Charlie")
+    tally = WhisperTally([(alice, bob, 1, _at(0)), (bob, alice, 1, _at(1))])
+    tally.record(bob, charlie, 2, _at(10))
+    tally.checkpoint()
+    tally.record(charlie, bob, 2, _at(20))
+    tally.record(alice, bob, 2, _at(21))
+
+    assert tally.on_day(1) == [(alice, bob, 3), (bob, charlie, 2)]
+    assert tally.on_day(2) == [(alice, bob, 1), (bob, charlie, 2)]
+    assert tally.since(_at(20)) == [(alice, bob, 1), (bob, charlie, 1)]
+    assert tally.since(_at(30)) == []
+
+
+def test_out_of_order_whispers_are_placed_by_time():
+    """Test that a whisper recorded late still falls in the right windows."""
+    alice, bob, charlie = _people("Alice", "Bob", "Charlie")
+    tally = WhisperTally()
+    tally.record(alice, bob, 1, _at(0))
+    tally.record(alice, bob, 1, _at(10))
+    assert tally.since(_at(5)) == [(alice, bob, 1)]
+
+    tally.record(bob, charlie, 1, _at(6))
+    assert tally.since(_at(5)) == [(alice, bob, 1), (bob, charlie, 1)]
+    assert tally.since(_at(7)) == [(alice, bob, 1)]
+
+
+def test_table_grows_past_its_capacity():
+    """Test that counts survive the table growing to fit more people."""
+    people = _people(*(f"P{i}" for i in range(20)))
+    tally = WhisperTally()
+    for i, person in enumerate(people[1:]):
+        tally.record(people[0], person, 1, _at(i))
+
+    assert len(tally) == 19
+    assert tally.on_day(1) == [(people[0], person, 1) for person in people[1:]]
+
+
+def test_format_tally_orders_busiest_pairs_first():
+    """Test the report lists pairs by count, then by seat, and notes silent pairs."""
+    alice, bob, charlie = _people("Alice", "Bob", "Charlie")
+    seating = SeatingRing([alice, bob, charlie])
+
+    report = format_tally([(charlie, alice, 1), (bob, charlie, 3)], seating)
+    assert report == "**Message Tally:**\n> Bob - Charlie: 3\n> Alice - Charlie: 1\n> All other pairs: 0"
+
+    report = format_tally([(alice, bob, 1), (bob, charlie, 1), (alice, charlie, 1)], seating, "Message Tally:")
+    assert report == "Message Tally:\n> Alice - Bob: 1\n> Alice - Charlie: 1\n> Bob - Charlie: 1"
+
+
+def test_game_tally_follows_whispers(mock_discord_setup, setup_test_game):
+    """Test that the game's tally is built from message histories, then counts new whispers."""
+    game = setup_test_game['game']
+    players = setup_test_game['players']
+    alice, bob, storyteller = players['alice'], players['bob'], players['storyteller']
+
+    bob._record_message(alice, "hi", 1, _at(0), "", "")
+    assert game.whisper_tally.on_day(1) == [(alice, bob, 1)]
+
+    bob._record_message(alice, "again", 1, _at(1), "", "")
+    game.record_whisper(alice, bob, 1, _at(1))
+    # Storytellers' whispers are not counted
+    alice._record_message(storyteller, "psst", 1, _at(2), "", "")
+    game.record_whisper(storyteller, alice, 1, _at(2))
+    assert game.whisper_tally.on_day(1, game.seating) == [(alice, bob, 2)]
+
+    vote = Mock(announcements=[discord.utils.time_snowflake(_at(1))])
+    assert tally_report(game, vote) == "**Message Tally:**\n> Alice - Bob: 1\n> All other pairs: 0"
+    assert "_whisper_tally" not in game.__getstate__()
+
+
+def _baseline_tally(game, day):
+    """The tally as it was counted from the seated players' message histories."""
+    tally = {}
+    for person in game.seatingOrder:
+        for msg in person.message_history:
+            if msg["from_player"] == person and msg["day"] == day:
+                pair = frozenset((person, msg["to_player"]))
+                tally[pair] = tally.get(pair, 0) + 1
+    return tally
+
+
+def test_whispers_count_if_their_sender_is_seated_when_shown(mock_discord_setup, setup_test_game):
+    """Test that the built and the incremental tally both leave out senders who have left, as before."""
+    game = setup_test_game['game']
+    players = setup_test_game['players']
+    alice, bob, charlie = players['alice'], players['bob'], players['charlie']
+    assert game.whisper_tally.on_day(1) == []
+
+    def whisper(sender, recipient, minutes):
+        recipient._record_message(sender, "hi", 1, _at(minutes), "", "")
+        game.record_whisper(sender, recipient, 1, _at(minutes))
+
+    whisper(alice, bob, 0)
+    whisper(charlie, alice, 1)
+    whisper(alice, charlie, 2)
+    game.seatingOrder.remove(charlie)
+    whisper(bob, alice, 3)
+
+    expected = {frozenset((alice, bob)): 2, frozenset((alice, charlie)): 1}
+    assert _baseline_tally(game, 1) == expected
+    incremental = game.whisper_tally.on_day(1, game.seating)
+    assert {frozenset((a, b)): count for a, b, count in incremental} == expected
+
+    del game._whisper_tally
+    rebuilt = game.whisper_tally.on_day(1, game.seating)
+    assert {frozenset((a, b)): count for a, b, count in rebuilt} == expected
+    assert tally_report(game).startswith("**Message Tally:**\n> Alice - Bob: 2\n")
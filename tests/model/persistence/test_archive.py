@@ -0,0 +1,139 @@
+"""Tests for the archive of finished games."""
+
+import datetime
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+import global_vars
+from model.characters import Character
+from model.characters.specific import Imp
+from model.game.day import Day
+from model.game.game import Game
+from model.game.script import Script
+from model.game.vote import Vote
+from model.persistence.archive import GameArchive
+from model.player import Player
+from tests.fixtures.discord_mocks import mock_discord_setup
+
+ENDED_AT = datetime.datetime(2025, 3, 1, 20, 0, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture
+def finished_game(mock_discord_setup):
+    """A game where the Imp was nominated once, someone whispered, and someone died."""
+    members = mock_discord_setup['members']
+    channels = mock_discord_setup['channels']
+    alice = Player(Imp, "evil", members['alice'], channels['st_alice'], 0)
+    bob = Player(Character, "good", members['bob'], channels['st_bob'], 1)
+    charlie = Player(Character, "good", members['charlie'], channels['st_charlie'], 2)
+    game = Game([alice, bob, charlie], None, None, Script(["imp"]), skip_storytellers=True)
+
+    original_game = global_vars.game
+    global_vars.game = game
+    day = Day()
+    game.days.append(day)
+    vote = Vote(alice, bob)
+    for voter in vote.order:
+        vote._record_vote(voter, 1 if voter is not alice else 0)
+    day.votes.append(vote)
+    alice._record_message(bob, "it's you", 1, ENDED_AT, "https://a", "https://b")
+    charlie.is_ghost = True
+
+    yield game
+
+    global_vars.game = original_game
+
+
+@pytest.fixture
+def archive(tmp_path):
+    with GameArchive(str(tmp_path / "archive.db")) as archive:
+        yield archive
+
+
+def test_record_and_query_player(finished_game, archive):
+    game_id = archive.record(finished_game, "Good", ended_at=ENDED_AT)
+
+    [played] = archive.games_for_player(2)
+    assert played.game.id == game_id
+    assert played.game.winner == "good"
+    assert played.game.script == ["imp"]
+    assert played.game.ended_at == ENDED_AT
+    assert played.character == "Imp"
+    assert played.alignment == "evil"
+    assert not played.won
+    assert archive.player_record(3).wins == 1
+    assert archive.player_record(4).deaths == 1
+
+
+def test_character_record_across_games(finished_game, archive):
+    archive.record(finished_game, "good", ended_at=ENDED_AT)
+    archive.record(finished_game, "evil", ended_at=ENDED_AT + datetime.timedelta(days=1))
+
+    record = archive.character_record("Imp")
+    assert (record.games, record.wins, record.win_rate) == (2, 1, 0.5)
+    assert archive.character_record("Washerwoman").games == 0
+
+
+def test_games_filtered_by_date(finished_game, archive):
+    first = archive.record(finished_game, "good", ended_at=ENDED_AT)
+    second = archive.record(finished_game, "good", ended_at=ENDED_AT + datetime.timedelta(days=7))
+
+    assert [game.id for game in archive.games()] == [second, first]
+    assert [game.id for game in archive.games(start=ENDED_AT + datetime.timedelta(days=1))] == [second]
+    assert [game.id for game in archive.games(end=ENDED_AT + datetime.timedelta(days=1))] == [first]
+
+
+def test_votes_and_whispers_are_archived(finished_game, archive):
+    game_id = archive.record(finished_game, "good", ended_at=ENDED_AT)
+
+    connection = archive._connection
+    assert connection.execute("SELECT nominator_id, nominee_id, votes FROM votes WHERE game_id = ?",
+                              (game_id,)).fetchall() == [(3, 2, 2)]
+    assert sorted(connection.execute("SELECT voter_id, vote FROM ballots").fetchall()) == [(2, 0), (3, 1), (4, 1)]
+    assert connection.execute("SELECT day, sender_id, recipient_id, length FROM whispers").fetchall() == [
+        (1, 3, 2, 8)
+    ]
+
+
+def test_players_who_left_the_server_are_archived(finished_game, archive):
+    """Test that a restored player whose member can no longer be found is archived by user id."""
+    alice = finished_game.seatingOrder[0]
+    alice.__setstate__(alice.__getstate__())
+
+    with patch.object(global_vars, 'server', Mock(get_member=Mock(return_value=None))):
+        game_id = archive.record(finished_game, "good", ended_at=ENDED_AT)
+        assert alice.user is None
+
+    [played] = archive.games_for_player(2)
+    assert played.game.id == game_id
+    connection = archive._connection
+    assert (2, 0) in connection.execute("SELECT voter_id, vote FROM ballots").fetchall()
+    assert connection.execute("SELECT sender_id, recipient_id FROM whispers").fetchall() == [(3, 2)]
+
+
+@pytest.mark.asyncio
+async def test_deaths_are_archived_with_their_day(finished_game, archive):
+    """Test that each player who ended the game dead is archived with the day they died."""
+    alice, bob, charlie = finished_game.seatingOrder
+    charlie.is_ghost = False
+    channel_manager = Mock(set_ghost=AsyncMock(), remove_ghost=AsyncMock())
+
+    with patch('utils.message_utils.safe_send', AsyncMock()), \
+            patch('model.channels.ChannelManager', Mock(return_value=channel_manager)), \
+            patch.object(finished_game, 'reseat', AsyncMock()):
+        for person in (alice, bob, charlie):
+            person.user.add_roles = AsyncMock()
+            person.user.remove_roles = AsyncMock()
+        await bob.kill()
+        finished_game.days.append(Day())
+        await alice.kill()
+        # A player who was revived is not dead at the end
+        await charlie.kill()
+        await charlie.revive()
+        assert charlie.death_day is None
+
+    game_id = archive.record(finished_game, "good", ended_at=ENDED_AT)
+
+    assert sorted(archive._connection.execute(
+        "SELECT user_id, day FROM deaths WHERE game_id = ?", (game_id,)).fetchall()) == [(2, 2), (3, 1)]
@@ -0,0 +1,203 @@
+"""Tests for the background backup writer."""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from model.persistence import tracking
+from model.persistence.backup_service import BackupService, SnapshotMode
+
+
+class _Recorder:
+    """Records what a BackupService snapshots and writes."""
+
+    def __init__(self, fail=False):
+        self.state = 0
+        self.snapshots = []
+        self.writes = []
+        self.written = []
+        self.write_threads = []
+        self.fail = fail
+
+    def snapshot(self, file_name, isolate):
+        self.snapshots.append(isolate)
+        return self.state
+
+    def write(self, file_name, data):
+        self.write_threads.append(threading.current_thread())
+        if self.fail:
+            raise OSError("disk full")
+        self.writes.append((file_name, data))
+
+    def done(self, file_name, data):
+        self.written.append(data)
+
+    def service(self, **kwargs):
+        return BackupService(self.snapshot, self.write, self.done, **kwargs)
+
+
+def test_writes_immediately_without_event_loop():
+    recorder = _Recorder()
+    service = recorder.service()
+    tracking.mark_dirty()
+
+    service.request("game.pckl")
+
+    assert recorder.writes == [("game.pckl", 0)]
+    assert recorder.snapshots == [False]
+    assert recorder.written == [0]
+    assert not tracking.is_dirty()
+
+
+@pytest.mark.asyncio
+async def test_burst_of_requests_is_coalesced_into_one_write():
+    recorder = _Recorder()
+    service = recorder.service(delay=0.01)
+
+    for state in range(5):
+        recorder.state = state
+        service.request("game.pckl")
+    assert recorder.writes == []
+    assert service.metrics.queue_depth == 1
+
+    await asyncio.sleep(0.05)
+
+    assert recorder.writes == [("game.pckl", 4)]
+    assert recorder.snapshots == [True]
+    assert recorder.write_threads[0] is not threading.main_thread()
+    assert service.metrics.requests == 5
+    assert service.metrics.coalesced == 4
+    assert service.metrics.writes == 1
+    assert service.metrics.queue_depth == 0
+    service.flush()
+
+
+@pytest.mark.asyncio
+async def test_staleness_is_bounded():
+    recorder = _Recorder()
+    service = recorder.service(delay=0.03, max_staleness=0.05)
+
+    # Keep requesting more often than the debounce delay
+    for _ in range(8):
+        service.request("game.pckl")
+        await asyncio.sleep(0.015)
+
+    assert len(recorder.writes) >= 1
+    service.flush()
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_pending_backup():
+    recorder = _Recorder()
+    service = recorder.service(delay=10)
+    recorder.state = "latest"
+
+    service.request("game.pckl")
+    service.flush()
+
+    assert recorder.writes == [("game.pckl", "latest")]
+    assert service.metrics.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_drops_pending_backup():
+    recorder = _Recorder()
+    service = recorder.service(delay=0.01)
+
+    service.request("game.pckl")
+    service.cancel()
+    await asyncio.sleep(0.03)
+
+    assert recorder.writes == []
+
+
+@pytest.mark.asyncio
+async def test_failed_write_leaves_state_dirty():
+    recorder = _Recorder(fail=True)
+    service = recorder.service(delay=0)
+
+    service.request("game.pckl")
+    await asyncio.sleep(0.05)
+
+    assert tracking.is_dirty()
+    assert recorder.written == []
+    assert service.metrics.failures == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+@pytest.mark.asyncio
+async def test_fork_mode_writes_from_child_process(tmp_path):
+    path = tmp_path / "game.pckl"
+    written = []
+
+    def write(file_name, data):
+        path.write_text(f"{data} {os.getpid()}")
+
+    service = BackupService(lambda file_name, isolate: isolate, write, lambda file_name, data: written.append(data),
+                            delay=0, snapshot_mode=SnapshotMode.FORK)
+    service.request(str(path))
+    for _ in range(100):
+        if written:
+            break
+        await asyncio.sleep(0.01)
+
+    # The child writes the live, un-copied state
+    isolated, pid = path.read_text().split()
+    assert isolated == "False"
+    assert int(pid) != os.getpid()
+    assert written == [False]
+    assert service.metrics.writes == 1
+    assert not tracking.is_dirty()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+@pytest.mark.asyncio
+async def test_fork_mode_failure_leaves_state_dirty(capfd):
+    recorder = _Recorder(fail=True)
+    service = recorder.service(delay=0, snapshot_mode=SnapshotMode.FORK)
+
+    service.request("game.pckl")
+    await asyncio.sleep(0.01)
+    service.flush()
+
+    assert tracking.is_dirty()
+    assert recorder.written == []
+    assert service.metrics.failures == 1
+    assert "disk full" in capfd.readouterr().err
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+@pytest.mark.asyncio
+async def test_hung_fork_writer_is_killed_and_thread_mode_takes_over():
+    recorder = _Recorder()
+    parent = os.getpid()
+    prepared = []
+
+    def write(file_name, data):
+        if os.getpid() != parent:
+            # A child that deadlocked, for instance on a lock held by another thread at the fork
+            threading.Event().wait()
+        recorder.write(file_name, data)
+
+    service = BackupService(recorder.snapshot, write, recorder.done, delay=0, snapshot_mode=SnapshotMode.FORK,
+                            prepare=lambda: prepared.append(True), fork_timeout=0.1)
+
+    service.request("game.pckl")
+    await asyncio.sleep(0.01)
+    service.flush()
+
+    assert prepared == [True]
+    assert tracking.is_dirty()
+    assert service.metrics.failures == 1
+    assert service.snapshot_mode == SnapshotMode.THREAD
+
+    # The next backup is written from a thread
+    service.request("game.pckl")
+    await asyncio.sleep(0.01)
+    service.flush()
+
+    assert recorder.writes == [("game.pckl", 0)]
+    assert recorder.snapshots == [False, True]
+    assert not tracking.is_dirty()
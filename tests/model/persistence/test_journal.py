@@ -0,0 +1,202 @@
+"""Tests for the write-ahead journal of game-state mutations."""
+
+import asyncio
+import json
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+import global_vars
+from model.characters import Character
+from model.game.day import Day
+from model.game.game import Game
+from model.game.script import Script
+from model.persistence import journal, tracking
+from model.player import Player
+from tests.fixtures.discord_mocks import mock_discord_setup
+from utils import game_utils
+
+BACKUP_FILE = "test_journal_game.pckl"
+
+
+@pytest_asyncio.fixture
+async def journaled_game(mock_discord_setup, tmp_path, monkeypatch):
+    """A game that has just been backed up, with the journal attached."""
+    monkeypatch.chdir(tmp_path)
+    members = mock_discord_setup['members']
+    channels = mock_discord_setup['channels']
+    players = {
+        name: Player(Character, "good", members[name], channels[f"st_{name}"], position)
+        for position, name in enumerate(["alice", "bob", "charlie"])
+    }
+    seating_message = await channels['town_square'].send("**Seating Order:**")
+    game = Game(list(players.values()), seating_message, None, Script([]), skip_storytellers=True)
+    game.days.append(Day())
+    game.isDay = True
+
+    original_game = global_vars.game
+    global_vars.game = game
+    tracking.mark_dirty()
+    game_utils.backup(BACKUP_FILE)
+    game_utils.flush_backups()
+
+    yield game, players
+
+    journal.detach()
+    global_vars.game = original_game
+
+
+def _journal_lines():
+    if not os.path.exists(journal.journal_file(BACKUP_FILE)):
+        return []
+    with open(journal.journal_file(BACKUP_FILE)) as file:
+        return [json.loads(line) for line in file]
+
+
+@pytest.mark.asyncio
+async def test_whisper_is_journaled_instead_of_dirtying(journaled_game):
+    game, players = journaled_game
+    assert not tracking.is_dirty()
+
+    await players['bob'].message(players['alice'], "hello", "https://jump")
+
+    assert not tracking.is_dirty()
+    lines = _journal_lines()
+    assert [line["event"] for line in lines] == ["whisper"]
+    assert lines[0]["data"]["sender"] == players['alice'].user.id
+    assert game.journal_sequence == 1
+
+
+@pytest.mark.asyncio
+async def test_load_replays_journal_onto_snapshot(journaled_game):
+    game, players = journaled_game
+
+    await players['bob'].message(players['alice'], "hello", "https://jump")
+    await game.days[-1].close_pms()
+    with patch.object(Game, 'update_seating_order_message'), patch(
+            'model.channels.channel_utils.reorder_channels'):
+        await game.reseat([players['charlie'], players['alice'], players['bob']])
+
+    loaded = await game_utils.load(BACKUP_FILE)
+
+    assert [person.user.id for person in loaded.seatingOrder] == [4, 2, 3]
+    assert [person.position for person in loaded.seatingOrder] == [0, 1, 2]
+    assert loaded.days[-1].isPms is False
+    bob = loaded.seatingOrder[2]
+    assert [msg["content"] for msg in bob.message_history] == ["hello"]
+    assert bob.message_history[0]["from_player"] is loaded.seatingOrder[1]
+    assert loaded.journal_sequence == 3
+    assert not tracking.is_dirty()
+
+
+@pytest.mark.asyncio
+async def test_dirty_state_is_not_journaled(journaled_game):
+    game, players = journaled_game
+    players['alice'].can_nominate = False
+
+    await players['bob'].message(players['alice'], "hello", "https://jump")
+
+    assert tracking.is_dirty()
+    assert _journal_lines() == []
+
+    # The next backup folds everything into a fresh snapshot
+    game_utils.backup(BACKUP_FILE)
+    game_utils.flush_backups()
+    assert not tracking.is_dirty()
+    loaded = await game_utils.load(BACKUP_FILE)
+    assert len(loaded.seatingOrder[1].message_history) == 1
+    assert loaded.seatingOrder[0].can_nominate is False
+
+
+@pytest.mark.asyncio
+async def test_compaction_requested_after_enough_events(journaled_game, monkeypatch):
+    game, players = journaled_game
+    monkeypatch.setattr(journal, "COMPACT_EVERY", 2)
+
+    await game.days[-1].close_noms()
+    assert not tracking.is_dirty()
+
+    await game.days[-1].close_pms()
+    assert tracking.is_dirty()
+
+    game_utils.backup(BACKUP_FILE)
+    game_utils.flush_backups()
+    assert _journal_lines() == []
+    loaded = await game_utils.load(BACKUP_FILE)
+    assert loaded.journal_sequence == 2
+
+
+@pytest.mark.asyncio
+async def test_replay_skips_events_already_in_snapshot(journaled_game):
+    game, players = journaled_game
+
+    await players['bob'].message(players['alice'], "hello", "https://jump")
+    # Simulate a crash after the snapshot was written but before the journal was truncated
+    stale = open(journal.journal_file(BACKUP_FILE)).read()
+    tracking.mark_dirty()
+    game_utils.backup(BACKUP_FILE)
+    game_utils.flush_backups()
+    with open(journal.journal_file(BACKUP_FILE), "w") as file:
+        file.write(stale)
+
+    loaded = await game_utils.load(BACKUP_FILE)
+    assert len(loaded.seatingOrder[1].message_history) == 1
+
+
+@pytest.mark.asyncio
+async def test_background_backup_is_isolated_from_later_changes(journaled_game, monkeypatch):
+    game, players = journaled_game
+    monkeypatch.setattr(game_utils.get_backup_service(), "delay", 0)
+
+    players['alice'].can_nominate = False
+    game_utils.backup(BACKUP_FILE)
+    await asyncio.sleep(0.01)  # Let the snapshot be taken
+
+    players['bob'].can_nominate = False
+    game_utils.flush_backups()
+
+    loaded = await game_utils.load(BACKUP_FILE)
+    assert loaded.seatingOrder[0].can_nominate is False
+    assert loaded.seatingOrder[1].can_nominate is True
+
+
+@pytest.mark.asyncio
+async def test_nothing_is_journaled_after_a_failed_snapshot(journaled_game, monkeypatch):
+    game, players = journaled_game
+    monkeypatch.setattr(game_utils.get_backup_service(), "delay", 0)
+    release = threading.Event()
+
+    def failing_write(path, sections):
+        release.wait()
+        raise OSError("disk full")
+
+    # A change that is not journaled, whose snapshot is taken but then fails to write
+    players['alice'].can_nominate = False
+    with patch('model.persistence.snapshot.write_snapshot', side_effect=failing_write):
+        game_utils.backup(BACKUP_FILE)
+        await asyncio.sleep(0.01)  # Let the snapshot be taken
+        assert not tracking.is_dirty()
+
+        # Journaling this would replay it onto the older snapshot, without the change above
+        await players['bob'].message(players['alice'], "hello", "https://jump")
+        release.set()
+        game_utils.flush_backups()
+
+    assert tracking.is_dirty()
+    assert _journal_lines() == []
+
+    # After a crash, the game is the last snapshot that was written, without gaps
+    loaded = await game_utils.load(BACKUP_FILE)
+    assert loaded.seatingOrder[0].can_nominate is True
+    assert loaded.seatingOrder[1].message_history == []
+
+    # Once a snapshot succeeds, journaling resumes on top of it
+    global_vars.game = game
+    tracking.mark_dirty()
+    game_utils.backup(BACKUP_FILE)
+    game_utils.flush_backups()
+    await players['bob'].message(players['alice'], "again", "https://jump")
+    assert [line["event"] for line in _journal_lines()] == ["whisper"]
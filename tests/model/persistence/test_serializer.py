@@ -0,0 +1,138 @@
+"""Tests for the schema-versioned game-state serializer."""
+
+import datetime
+import json
+import zlib
+
+import dill
+import pytest
+
+import global_vars
+from model.characters import Character
+from model.characters.specific import Imp
+from model.game.day import Day
+from model.game.game import Game
+from model.game.script import Script
+from model.game.vote import Vote
+from model.persistence import serializer, snapshot, tracking
+from model.player import Player
+from tests.fixtures.discord_mocks import mock_discord_setup
+from utils import game_utils
+
+
+def _round_trip(state):
+    sections = serializer.encode_sections(state)
+    return serializer.decode_sections(list(sections), sections.__getitem__)
+
+
+@pytest.fixture
+def game_state(mock_discord_setup):
+    """The backed-up attributes of a small game with a day, a vote and a whisper."""
+    members = mock_discord_setup['members']
+    channels = mock_discord_setup['channels']
+    alice = Player(Imp, "evil", members['alice'], channels['st_alice'], 0)
+    bob = Player(Character, "good", members['bob'], channels['st_bob'], 1)
+    game = Game([alice, bob], None, None, Script(["imp"]), skip_storytellers=True)
+
+    original_game = global_vars.game
+    global_vars.game = game
+    day = Day()
+    vote = Vote(bob, alice)
+    vote.presetVotes[alice.user.id] = 1
+    day.votes.append(vote)
+    day.aboutToDie = (bob, vote)
+    game.days.append(day)
+    bob._record_message(alice, "hello", 1, datetime.datetime(2025, 1, 1, 12, 0), "https://a", "https://b")
+
+    yield {"days": game.days, "seatingOrder": game.seatingOrder, "script": game.script, "whisper_mode": "all"}
+
+    global_vars.game = original_game
+
+
+def test_round_trip_preserves_values_and_identity(game_state):
+    state = _round_trip(game_state)
+
+    alice, bob = state["seatingOrder"]
+    assert [person.user.id for person in state["seatingOrder"]] == [2, 3]
+    assert isinstance(alice.character, Imp)
+    assert alice.character.parent is alice
+    assert state["whisper_mode"] == "all"
+    assert state["script"].__dict__ == game_state["script"].__dict__
+
+    day = state["days"][0]
+    vote = day.votes[0]
+    assert day.aboutToDie == (bob, vote)
+    assert vote.nominee is bob and vote.nominator is alice
+    assert vote.presetVotes == {alice.user.id: 1}
+    assert set(vote.values) == {alice, bob}
+    assert not vote._vote_lock.locked()
+
+    message = bob.message_history[0]
+    assert message["from_player"] is alice
+    assert message["time"] == datetime.datetime(2025, 1, 1, 12, 0, tzinfo=datetime.timezone.utc)
+
+
+def test_players_are_stored_once(game_state):
+    sections = serializer.encode_sections(game_state)
+
+    assert set(json.loads(zlib.decompress(sections[serializer.PLAYERS_SECTION]))) == {"2", "3"}
+    assert json.loads(zlib.decompress(sections["seatingOrder"])) == [{"$p": 2}, {"$p": 3}]
+
+
+def test_capture_is_encoded_as_the_state_was_when_captured(game_state):
+    alice, bob = game_state["seatingOrder"]
+    before = serializer.encode_sections(game_state)
+    captured = serializer.capture(game_state)
+
+    bob.can_nominate = False
+    game_state["days"][0].votes[0].presetVotes[bob.user.id] = 0
+    bob._record_message(alice, "later", 1, datetime.datetime(2025, 1, 1, 13, 0), "https://c", "https://d")
+
+    assert serializer.encode_sections(captured) == before
+
+    # The whisper rows are immutable, so the capture shares them with the game
+    log = bob.whisper_log
+    captured_log = serializer.capture({"whispers": log})["whispers"]
+    assert captured_log.state["whispers"] is not log.whispers
+    assert captured_log.state["whispers"][0] is log.whispers[0]
+
+
+def test_unsupported_type_is_rejected():
+    with pytest.raises(serializer.SerializationError):
+        serializer.encode_sections({"value": object()})
+
+
+def test_newer_schema_is_rejected(game_state):
+    sections = serializer.encode_sections(game_state)
+    sections[serializer.SCHEMA_SECTION] = zlib.compress(
+        json.dumps({"version": serializer.SCHEMA_VERSION + 1}).encode())
+
+    with pytest.raises(serializer.SerializationError):
+        serializer.decode_sections(list(sections), sections.__getitem__)
+
+
+@pytest.mark.asyncio
+async def test_dill_snapshot_is_migrated(mock_discord_setup, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    channels = mock_discord_setup['channels']
+    player = Player(Character, "good", mock_discord_setup['members']['alice'], channels['st_alice'], 0)
+    message = await channels['town_square'].send("**Seating Order:**")
+    snapshot.write_snapshot("game.pckl", {
+        "seatingOrder": dill.dumps([player]),
+        "seatingOrderMessage": dill.dumps(message.id),
+        "script": dill.dumps(Script([])),
+    })
+
+    original_game = global_vars.game
+    try:
+        global_vars.game = await game_utils.load("game.pckl")
+        assert [person.user.id for person in global_vars.game.seatingOrder] == [2]
+        assert tracking.is_dirty()
+
+        game_utils.backup("game.pckl")
+        game_utils.flush_backups()
+        with snapshot.SnapshotReader("game.pckl") as reader:
+            assert serializer.is_encoded(reader.names())
+    finally:
+        game_utils.remove_backup("game.pckl")
+        global_vars.game = original_game
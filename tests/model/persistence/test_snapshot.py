@@ -0,0 +1,69 @@
+"""Tests for the single-file snapshot container."""
+
+import os
+
+import pytest
+
+from model.persistence.snapshot import MAGIC, SnapshotError, SnapshotReader, is_snapshot, write_snapshot
+
+
+def _identity(payload):
+    return bytes(payload)
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "game.pckl")
+    write_snapshot(path, {"days": b"\x00\x01", "isDay": b"", "script": b"script" * 100})
+
+    assert os.listdir(tmp_path) == ["game.pckl"]
+    with open(path, "rb") as file:
+        assert is_snapshot(file.read(len(MAGIC)))
+    with SnapshotReader(path) as reader:
+        assert reader.names() == ["days", "isDay", "script"]
+        assert reader.load("script", _identity) == b"script" * 100
+        assert reader.load("isDay", _identity) == b""
+        assert reader.load("days", _identity) == b"\x00\x01"
+
+
+def test_rewrite_replaces_previous_snapshot(tmp_path):
+    path = str(tmp_path / "game.pckl")
+    write_snapshot(path, {"days": b"old"})
+    write_snapshot(path, {"days": b"new", "isDay": b"1"})
+
+    with SnapshotReader(path) as reader:
+        assert reader.names() == ["days", "isDay"]
+        assert reader.load("days", _identity) == b"new"
+
+
+def test_corrupt_section_is_detected_when_read(tmp_path):
+    path = str(tmp_path / "game.pckl")
+    write_snapshot(path, {"days": b"abcdef", "isDay": b"1"})
+    with open(path, "r+b") as file:
+        file.seek(-3, os.SEEK_END)
+        file.write(b"X")
+
+    with SnapshotReader(path) as reader:
+        assert reader.load("isDay", _identity) == b"1"
+        with pytest.raises(SnapshotError):
+            reader.load("days", _identity)
+
+
+def test_corrupt_header_is_rejected(tmp_path):
+    path = str(tmp_path / "game.pckl")
+    write_snapshot(path, {"days": b"abcdef"})
+    with open(path, "r+b") as file:
+        file.seek(len(MAGIC) + 8)
+        file.write(b"y")
+
+    with pytest.raises(SnapshotError):
+        SnapshotReader(path)
+
+
+@pytest.mark.parametrize("content", [b"", b"BOTC", b"not a snapshot at all"])
+def test_invalid_files_are_rejected(tmp_path, content):
+    path = str(tmp_path / "game.pckl")
+    with open(path, "wb") as file:
+        file.write(content)
+
+    with pytest.raises(SnapshotError):
+        SnapshotReader(path)
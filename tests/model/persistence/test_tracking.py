@@ -0,0 +1,86 @@
+"""Tests for dirty tracking of the persisted game state."""
+
+import dill
+
+from model.characters import Character
+from model.persistence import tracking
+from model.persistence.tracking import Tracked, TrackedDict, TrackedList
+from tests.fixtures.discord_mocks import mock_discord_setup
+from tests.fixtures.game_fixtures import setup_test_game
+
+
+class _State(Tracked):
+    _untracked_attributes = frozenset({"scratch"})
+
+    def __init__(self):
+        self.items = []
+        self.lookup = {}
+        self.flag = False
+        self.scratch = 0
+
+
+def test_attribute_changes_mark_dirty():
+    state = _State()
+    tracking.mark_clean()
+
+    state.flag = False
+    assert not tracking.is_dirty()
+
+    state.flag = True
+    assert tracking.is_dirty()
+
+
+def test_containers_are_wrapped_and_tracked():
+    state = _State()
+    assert isinstance(state.items, TrackedList)
+    assert isinstance(state.lookup, TrackedDict)
+
+    tracking.mark_clean()
+    state.items.append(1)
+    assert tracking.is_dirty()
+
+    tracking.mark_clean()
+    state.lookup["a"] = 1
+    assert tracking.is_dirty()
+
+    tracking.mark_clean()
+    state.lookup.setdefault("a", 2)
+    assert not tracking.is_dirty()
+
+    tracking.mark_clean()
+    state.items.remove(1)
+    assert tracking.is_dirty()
+
+
+def test_untracked_attributes_do_not_mark_dirty():
+    state = _State()
+    tracking.mark_clean()
+
+    state.scratch = 42
+    assert not tracking.is_dirty()
+
+
+def test_round_trip_keeps_tracking():
+    state = dill.loads(dill.dumps(_State()))
+    assert isinstance(state.items, TrackedList)
+
+    tracking.mark_clean()
+    state.items.append(1)
+    assert tracking.is_dirty()
+
+
+def test_game_model_is_tracked(mock_discord_setup, setup_test_game):
+    game = setup_test_game['game']
+    alice = setup_test_game['players']['alice']
+    assert isinstance(alice.character, Character)
+
+    tracking.mark_clean()
+    alice.last_active = 0
+    assert not tracking.is_dirty()
+
+    alice.character.poison()
+    assert tracking.is_dirty()
+
+    tracking.mark_clean()
+    game.seatingOrder.reverse()
+    assert tracking.is_dirty()
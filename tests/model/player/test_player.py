@@ -10,7 +10,9 @@ import discord
 import pytest
 import pytest_asyncio
 
+from model.game.hook_registry import HookRegistry
 from model.player import Player
+from utils.outbox import Priority
 
 
 class TestPlayer:
@@ -155,11 +157,17 @@ class TestPlayer:
         )
         player.__setstate__(state)
 
-        # Verify Discord objects were retrieved by ID
-        self.mock_global_vars.server.get_member.assert_called_once_with(12345)
-        self.mock_global_vars.server.get_channel.assert_called_once_with(67890)
+        # Discord objects are only looked up on first use
+        self.mock_global_vars.server.get_member.assert_not_called()
+        self.mock_global_vars.server.get_channel.assert_not_called()
+        assert player.__getstate__()["user"] == 12345
+
+        # Verify Discord objects were retrieved by ID, once
         assert player.user == mock_member
         assert player.st_channel == mock_channel
+        assert player.user == mock_member
+        self.mock_global_vars.server.get_member.assert_called_once_with(12345)
+        self.mock_global_vars.server.get_channel.assert_called_once_with(67890)
 
     @pytest.mark.asyncio
     async def test_morning(self):
@@ -283,6 +291,7 @@ class TestPlayer:
 
         # Add that player to the game
         self.mock_global_vars.game.seatingOrder = [fake_player]
+        self.mock_global_vars.game.hooks = HookRegistry([fake_player])
 
         # Call kill method
         result = await self.player.kill()
@@ -502,7 +511,8 @@ class TestPlayer:
         # Verify message was sent to whisper channel
         mock_safe_send.assert_any_call(
             mock_whisper_channel,
-            "Message from SenderName to TestDisplayName: **Test message content**"
+            "Message from SenderName to TestDisplayName: **Test message content**",
+            priority=Priority.LOW
         )
 
     @mock.patch('utils.message_utils.safe_send')
@@ -546,6 +556,40 @@ class TestPlayer:
         assert len(self.player.message_history) == 0
         assert len(mock_sender.message_history) == 0
 
+    @mock.patch('bot_client.logger')
+    @mock.patch('utils.message_utils.safe_send')
+    @pytest.mark.asyncio
+    async def test_message_not_delivered(self, mock_safe_send, mock_logger):
+        """Test that a whisper whose message could not be sent is reported and not recorded."""
+        mock_sender, _ = self._setup_message_test(mock_safe_send)
+        mock_safe_send.return_value = None
+
+        await self.player.message(mock_sender, "Test message content", "https://discord.com/original_url")
+
+        mock_safe_send.assert_called_with(
+            mock_sender.user,
+            f"Something went wrong with your message to {self.player.display_name}! Please try again"
+        )
+        mock_logger.info.assert_called_once()
+        assert len(self.player.message_history) == 0
+        self.mock_global_vars.game.record_whisper.assert_not_called()
+
+    @mock.patch('utils.message_utils.safe_send')
+    @pytest.mark.asyncio
+    async def test_message_copied_to_storytellers(self, mock_safe_send):
+        """Test that without a whisper channel, every storyteller but the recipient gets a copy."""
+        storyteller = mock.MagicMock(spec=discord.Member)
+        self.mock_global_vars.whisper_channel = None
+        self.mock_global_vars.gamemaster_role.members = [storyteller, self.player.user]
+        mock_sender, _ = self._setup_message_test(mock_safe_send)
+
+        await self.player.message(mock_sender, "Test message content", "https://discord.com/original_url")
+
+        log = "**[**SenderName **>** TestDisplayName**]** Test message content"
+        mock_safe_send.assert_any_call(storyteller, log, priority=Priority.LOW)
+        assert mock.call(self.player.user, log, priority=Priority.LOW) not in mock_safe_send.call_args_list
+        mock_safe_send.assert_any_call(mock_sender.user, "Message sent!")
+
     @mock.patch('utils.message_utils.safe_send')
     @pytest.mark.asyncio
     async def test_make_inactive(self, mock_safe_send):
@@ -780,7 +824,7 @@ class TestPlayer:
         # Create sender
         mock_sender = mock.MagicMock()
         mock_sender.display_name = "SenderName"
-        mock_sender.message_history = []
+        mock_sender.whisper_log = None
 
         # Create message response
         mock_message = mock.AsyncMock(spec=discord.Message)
@@ -805,7 +849,8 @@ class TestPlayer:
         """Verify message history updated correctly."""
         # Check lengths
         assert len(self.player.message_history) == 1
-        assert len(mock_sender.message_history) == 1
+        sender_history = self.player.whisper_log.history(mock_sender)
+        assert len(sender_history) == 1
 
         # Check content in player's history
         assert self.player.message_history[0]["content"] == "Test message content"
@@ -813,10 +858,10 @@ class TestPlayer:
         assert self.player.message_history[0]["to_player"] == self.player
 
         # Check content in sender's history
-        assert mock_sender.message_history[0]["content"] == "Test message content"
-        assert mock_sender.message_history[0]["from_player"] == mock_sender
-        assert mock_sender.message_history[0]["to_player"] == self.player
-        assert mock_sender.message_history[0]["jump"] == "https://discord.com/original_url"
+        assert sender_history[0]["content"] == "Test message content"
+        assert sender_history[0]["from_player"] == mock_sender
+        assert sender_history[0]["to_player"] == self.player
+        assert sender_history[0]["jump"] == "https://discord.com/original_url"
 
     def _setup_inactive_test_players(self):
         """Configure test players for inactive tests."""
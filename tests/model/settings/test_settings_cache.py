@@ -0,0 +1,67 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from model.settings import _base_settings
+from model.settings._base_settings import JsonSettingsBackend
+from model.settings.global_settings import GlobalSettings
+
+
+@pytest.fixture
+def settings_file(tmp_path):
+    path = tmp_path / "preferences.json"
+    path.write_text(json.dumps({"1": {"aliases": {"v": "vote"}}}))
+    yield str(path)
+    _base_settings.invalidate_cache()
+
+
+def test_repeated_loads_do_not_read_the_file(settings_file):
+    assert GlobalSettings.load(settings_file).get_alias(1, "v") == "vote"
+
+    with patch("builtins.open") as mock_open, patch("os.stat") as mock_stat:
+        assert GlobalSettings.load(settings_file).get_alias(1, "v") == "vote"
+
+    mock_open.assert_not_called()
+    mock_stat.assert_not_called()
+
+
+def test_file_changed_outside_the_bot_is_reloaded(settings_file, monkeypatch):
+    monkeypatch.setattr(_base_settings, "STAT_INTERVAL", 0)
+    GlobalSettings.load(settings_file)
+
+    with open(settings_file, "w") as f:
+        json.dump({"1": {"aliases": {"v": "vote", "n": "nominate"}}}, f)
+
+    assert GlobalSettings.load(settings_file).get_alias(1, "n") == "nominate"
+
+
+def test_unchanged_file_is_not_reparsed(settings_file, monkeypatch):
+    monkeypatch.setattr(_base_settings, "STAT_INTERVAL", 0)
+    GlobalSettings.load(settings_file)
+
+    with patch("json.load") as mock_load:
+        GlobalSettings.load(settings_file)
+
+    mock_load.assert_not_called()
+
+
+def test_unsaved_changes_do_not_leak_into_the_cache(settings_file):
+    settings = GlobalSettings.load(settings_file)
+    settings.set_alias(1, "n", "nominate")
+    settings.clear_alias(1, "v")
+
+    reloaded = GlobalSettings.load(settings_file)
+    assert reloaded.get_alias(1, "v") == "vote"
+    assert reloaded.get_alias(1, "n") is None
+
+
+def test_saved_changes_are_served_from_the_cache(settings_file):
+    GlobalSettings.load(settings_file).set_default_vote(2, True, 30).save()
+
+    with patch.object(JsonSettingsBackend, "read") as mock_read:
+        assert GlobalSettings.load(settings_file).get_default_vote(2) == (True, 30)
+
+    mock_read.assert_not_called()
+    with open(settings_file) as f:
+        assert json.load(f)["2"] == {"defaultvote": [True, 30]}
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from model.settings import GameSettings, GlobalSettings, JsonSettingsBackend, SqliteSettingsBackend, set_backend
+
+
+@pytest.fixture
+def preferences(tmp_path):
+    path = tmp_path / "preferences.json"
+    path.write_text(json.dumps({"1": {"aliases": {"v": "vote"}, "defaultvote": [True, 30]}}))
+    return str(path)
+
+
+@pytest.fixture
+def backend():
+    backend = SqliteSettingsBackend(delay=0.01)
+    set_backend(backend)
+    yield backend
+    set_backend(JsonSettingsBackend())
+    backend.close()
+
+
+def _rows(preferences):
+    with sqlite3.connect(SqliteSettingsBackend.database_file(preferences)) as connection:
+        return dict(((user_id, name), json.loads(value))
+                    for user_id, name, value in connection.execute("SELECT * FROM settings"))
+
+
+def test_json_file_is_imported_on_first_start(preferences, backend):
+    settings = GlobalSettings.load(preferences)
+
+    assert settings.get_alias(1, "v") == "vote"
+    assert settings.get_default_vote(1) == (True, 30)
+    assert _rows(preferences) == {(1, "aliases"): {"v": "vote"}, (1, "defaultvote"): [True, 30]}
+
+
+def test_only_changed_settings_are_written(preferences, backend):
+    GlobalSettings.load(preferences).set_default_vote(2, False, 5).clear_default_vote(1).save()
+
+    assert _rows(preferences) == {(1, "aliases"): {"v": "vote"}, (2, "defaultvote"): [False, 5]}
+    # The JSON file is left alone once imported
+    with open(preferences) as f:
+        assert json.load(f)["1"]["defaultvote"] == [True, 30]
+
+
+@pytest.mark.asyncio
+async def test_writes_are_batched(preferences, backend):
+    GlobalSettings.load(preferences)
+    GlobalSettings.load(preferences).set_alias(1, "n", "nominate").save()
+    GlobalSettings.load(preferences).set_alias(2, "p", "pm").save()
+
+    # Queued, but already visible to later loads
+    assert (2, "aliases") not in _rows(preferences)
+    assert GlobalSettings.load(preferences).get_alias(2, "p") == "pm"
+
+    await asyncio.sleep(0.05)
+    rows = _rows(preferences)
+    assert rows[(1, "aliases")] == {"v": "vote", "n": "nominate"}
+    assert rows[(2, "aliases")] == {"p": "pm"}
+
+
+@pytest.mark.asyncio
+async def test_a_stream_of_writes_is_still_committed(preferences):
+    backend = SqliteSettingsBackend(delay=0.05)
+    set_backend(backend)
+    try:
+        settings = GlobalSettings.load(preferences)
+        # Each write comes well within the delay of the last one
+        for i in range(20):
+            settings.set_alias(1, f"a{i}", "vote").save()
+            await asyncio.sleep(0.01)
+            if i == 10:
+                assert "a0" in _rows(preferences)[(1, "aliases")]
+    finally:
+        set_backend(JsonSettingsBackend())
+        backend.close()
+
+
+def test_settings_survive_restart(tmp_path, backend):
+    filename = str(tmp_path / "settings.json")
+    GameSettings.load(filename).set_st_channel(1, 12345).save()
+    backend.close()
+
+    restarted = SqliteSettingsBackend()
+    set_backend(restarted)
+    try:
+        assert GameSettings.load(filename).get_st_channel(1) == 12345
+    finally:
+        restarted.close()
@@ -6,13 +6,14 @@ These tests focus on command handling in the on_message function.
 
 import datetime
 from contextlib import ExitStack
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import pytest_asyncio
 
 import global_vars  # Add missing import for global_vars
-from bot_impl import on_member_update, on_message, on_message_edit
+from bot_impl import on_member_update, on_message, on_message_edit, on_user_update
 from model.characters import Character, Storyteller
 from model.game.day import Day
 from model.game.game import NULL_GAME, Game
@@ -22,13 +23,16 @@ from model.player import STORYTELLER_ALIGNMENT, Player
 from tests.fixtures.common_patches import full_bot_setup_patches_combined
 from tests.fixtures.discord_mocks import mock_discord_setup, MockChannel, MockMember, MockMessage
 from tests.fixtures.game_fixtures import setup_test_game
+from utils import player_utils
+from utils.outbox import Priority
 
 
 @pytest.fixture(autouse=True)
 def disable_backup():
     """Automatically disables backup functionality for all tests."""
     with patch('utils.game_utils.backup', return_value=None) as mock_backup:
-        with patch('utils.game_utils.remove_backup', return_value=None) as mock_remove:
+        with patch('utils.game_utils.remove_backup', return_value=None) as mock_remove, \
+                patch('utils.game_utils.archive_game'):
             with patch('os.remove', return_value=None) as mock_os_remove:
                 yield
 
@@ -127,6 +131,7 @@ def common_patches():
     patches = [
         patch('utils.game_utils.backup'),  # Completely disable backup function
         patch('utils.game_utils.remove_backup'),  # Disable backup removal function
+        patch('utils.game_utils.archive_game'),  # Disable the archive of finished games
         patch('utils.message_utils.safe_send', new_callable=AsyncMock),
         patch('bot_client.client', MagicMock())
     ]
@@ -1091,6 +1096,25 @@ async def test_on_member_update_nickname_change():
     assert True
 
 
+@pytest.mark.asyncio
+async def test_on_user_update_reindexes_renamed_member():
+    """Test that a member found under their old username is found under the new one."""
+    server = SimpleNamespace()
+    member = SimpleNamespace(id=1, name="alice", display_name=None, guild=server)
+    server.members = [member]
+    server.get_member = lambda user_id: member if user_id == member.id else None
+
+    with patch('utils.player_utils.global_vars.server', server):
+        index = player_utils.member_index()
+        before = SimpleNamespace(id=1, name="alice", display_name="alice")
+        member.name = "zelda"
+        after = SimpleNamespace(id=1, name="zelda", display_name="zelda")
+        await on_user_update(before, after)
+
+        assert await player_utils.generate_possibilities("zel", index) == [member]
+        assert await player_utils.generate_possibilities("alic", index) == []
+
+
 @pytest.mark.asyncio
 async def test_on_member_update_role_change_storyteller_added(mock_discord_setup, setup_test_game):
     """Test adding the storyteller role to a member updates the game state."""
@@ -1317,7 +1341,8 @@ async def test_on_message_whispermode_command(mock_discord_setup, setup_test_gam
                 # Verify notification was sent to storytellers
                 mock_safe_send.assert_called_with(
                     mock_discord_setup['members']['storyteller'],
-                    "Storyteller has set whisper mode to neighbors"
+                    "Storyteller has set whisper mode to neighbors",
+                    priority=Priority.LOW
                 )
 
     # Test invalid whisper mode
@@ -1717,7 +1742,8 @@ async def test_on_message_direct_tally_commands(mock_discord_setup, setup_test_g
         # Verify notification was sent to storytellers
         mock_safe_send.assert_called_with(
             mock_discord_setup['members']['storyteller'],
-            "Storyteller enabled the message tally"
+            "Storyteller enabled the message tally",
+            priority=Priority.LOW
         )
 
     # Test disabletally command
@@ -1737,7 +1763,8 @@ async def test_on_message_direct_tally_commands(mock_discord_setup, setup_test_g
         # Verify notification was sent to storytellers
         mock_safe_send.assert_called_with(
             mock_discord_setup['members']['storyteller'],
-            "Storyteller disabled the message tally"
+            "Storyteller disabled the message tally",
+            priority=Priority.LOW
         )
 
     # Test messagetally command with invalid ID
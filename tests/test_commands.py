@@ -112,7 +112,8 @@ async def test_all_core_commands_execute(mock_discord_setup, setup_test_game):
     with patch('utils.message_utils.safe_send', new_callable=AsyncMock), \
             patch('utils.game_utils.update_presence'), \
             patch('utils.game_utils.backup'), \
-            patch('utils.game_utils.remove_backup'):
+            patch('utils.game_utils.remove_backup'), \
+            patch('utils.game_utils.archive_game'):
         # For functions that fetch messages
         mock_pins = AsyncMock(return_value=[])
         global_vars.channel.pins = mock_pins
@@ -3,7 +3,7 @@
 from unittest.mock import Mock
 
 from model.characters.base import DeathModifier
-from model.characters.specific import Fool, Virgin, TeaLady, Sailor, Philosopher
+from model.characters.specific import Cannibal, Fool, Virgin, TeaLady, Sailor, Philosopher
 from utils.character_utils import the_ability, has_ability
 
 
@@ -136,3 +136,46 @@ class TestHasAbility:
         # Then we should get False initially and True after adding it
         assert result1 is False
         assert result2 is True
+
+
+class TestEffectiveAbilities:
+    """Tests for the flattened ability table kept by AbilityModifier characters."""
+
+    def test_deeply_nested_ability(self):
+        """Test that abilities are found through several levels of AbilityModifiers."""
+        parent = Mock()
+        philosopher = Philosopher(parent)
+        philosopher.add_ability(Cannibal)
+        philosopher.abilities[0].add_ability(Philosopher)
+        philosopher.abilities[0].abilities[0].add_ability(Fool)
+
+        fool = philosopher.abilities[0].abilities[0].abilities[0]
+        assert the_ability(philosopher, Fool) is fool
+        assert the_ability(philosopher, Philosopher) is philosopher
+
+    def test_cache_follows_changes(self):
+        """Test that the table is reused until the abilities change."""
+        parent = Mock()
+        philosopher = Philosopher(parent)
+        philosopher.add_ability(Cannibal)
+        table = philosopher.effective_abilities()
+        assert philosopher.effective_abilities() is table
+
+        # A change to a nested ability is seen by the outer character
+        philosopher.abilities[0].add_ability(Sailor)
+        assert isinstance(the_ability(philosopher, Sailor), Sailor)
+
+        philosopher.clear_ability()
+        assert the_ability(philosopher, Sailor) is None
+        assert isinstance(the_ability(philosopher, Cannibal), Cannibal)
+
+        philosopher.refresh()
+        assert the_ability(philosopher, Cannibal) is None
+
+    def test_cache_is_not_backed_up(self):
+        """Test that the table is left out of the character's saved state."""
+        philosopher = Philosopher(Mock())
+        philosopher.add_ability(Fool)
+        philosopher.effective_abilities()
+
+        assert "_ability_cache" not in philosopher.__getstate__()
@@ -179,8 +179,9 @@ class TestRemoveBackup:
             mock_dir.return_value = ['days', 'isDay', 'script', '__class__', '__call__']
             remove_backup("test.pckl")
 
-            # Then all backup files (main + attributes) should be removed
-            assert mock_remove.call_count == 4  # Main file + 3 attribute files
+            # Then all backup files (journal + main + attributes) should be removed
+            assert mock_remove.call_count == 5  # Journal + main file + 3 attribute files
+            mock_remove.assert_any_call("test.journal")
             mock_remove.assert_any_call("test.pckl")
             mock_remove.assert_any_call("days_test.pckl")
             mock_remove.assert_any_call("isDay_test.pckl")
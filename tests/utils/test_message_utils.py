@@ -2,13 +2,15 @@
 Tests for message utility functions used in the BOTC bot
 """
 
-from unittest.mock import AsyncMock, patch, Mock
+import asyncio
+from unittest.mock import AsyncMock, call, patch, Mock
 
 import discord
 import pytest
 
 from utils import message_utils
 from utils.message_utils import safe_send_dm, _split_text
+from utils.outbox import Priority
 
 
 class TestSplitText:
@@ -179,3 +181,63 @@ class TestSafeSendDM:
 
         assert result is None
         mock_logger.error.assert_called_once_with("Unexpected error sending DM to TestUser: General error")
+
+
+class TestBroadcast:
+    """Test the broadcast function and its digest mode."""
+
+    @pytest.mark.asyncio
+    async def test_sends_concurrently_up_to_the_limit(self):
+        """Test that a broadcast has several sends in flight, but no more than the limit."""
+        in_flight = 0
+        most_in_flight = 0
+        recipients = [Mock() for _ in range(message_utils.BROADCAST_CONCURRENCY + 2)]
+
+        async def slow_send(recipient, content):
+            nonlocal in_flight, most_in_flight
+            in_flight += 1
+            most_in_flight = max(most_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        with patch('utils.message_utils.safe_send', side_effect=slow_send) as mock_safe_send:
+            await message_utils.broadcast(recipients, "PMs are now open.")
+
+        assert most_in_flight == message_utils.BROADCAST_CONCURRENCY
+        assert [c.args for c in mock_safe_send.call_args_list] == [(r, "PMs are now open.") for r in recipients]
+
+    @pytest.mark.asyncio
+    async def test_digest_merges_messages_per_recipient(self):
+        """Test that digest broadcasts are held back and sent as one message per recipient."""
+        first, second = Mock(), Mock()
+
+        with patch('utils.message_utils.safe_send', new_callable=AsyncMock) as mock_safe_send:
+            await message_utils.broadcast([first, second], "Alice's vote on Bob.", digest=True)
+            await message_utils.broadcast([first], "Charlie's vote on Bob.", digest=True)
+            mock_safe_send.assert_not_called()
+
+            await message_utils.flush_digest()
+
+        mock_safe_send.assert_has_calls([
+            call(first, "Alice's vote on Bob.\nCharlie's vote on Bob.", priority=Priority.LOW),
+            call(second, "Alice's vote on Bob.", priority=Priority.LOW),
+        ])
+        assert mock_safe_send.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_digest_is_sent_after_the_window(self):
+        """Test that held back messages go out on their own once the window ends."""
+        recipient = Mock()
+
+        with patch('utils.message_utils.DIGEST_WINDOW', 0.01), \
+                patch('utils.message_utils.safe_send', new_callable=AsyncMock) as mock_safe_send:
+            await message_utils.broadcast([recipient], "Everyone has checked in!", digest=True)
+            await asyncio.sleep(0.05)
+
+        mock_safe_send.assert_called_once_with(recipient, "Everyone has checked in!", priority=Priority.LOW)
+
+    @pytest.mark.asyncio
+    async def test_digest_rejects_message_parameters(self):
+        """Test that a digest broadcast cannot carry message parameters it would lose."""
+        with pytest.raises(ValueError):
+            await message_utils.broadcast([Mock()], "text", digest=True, embed=Mock())
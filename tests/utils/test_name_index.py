@@ -0,0 +1,77 @@
+"""
+Tests for the name index used to look up members and players
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from utils import player_utils
+from utils.name_index import NameIndex, normalize
+
+
+def _member(member_id, name, display_name=None, guild=None):
+    return SimpleNamespace(id=member_id, name=name, display_name=display_name, guild=guild)
+
+
+@pytest.fixture
+def index():
+    return NameIndex([
+        _member(1, "zoe_w", "Zoë"),
+        _member(2, "zoltan", "Zolly"),
+        _member(3, "amelie", "Amélie"),
+        _member(4, "noname"),
+    ])
+
+
+def test_normalize_casefolds_and_strips_accents():
+    assert normalize("Zoë") == "zoe"
+    assert normalize("STRASSE") == normalize("Straße")
+
+
+def test_exact_prefix_and_substring(index):
+    assert [m.id for m in index.exact("zoe")] == [1]
+    assert [m.id for m in index.prefix("zo")] == [1, 2]
+    assert [m.id for m in index.substring("e")] == [1, 3, 4]
+    assert [m.id for m in index.substring("ELIE")] == [3]
+    assert [m.id for m in index.substring("")] == [1, 2, 3, 4]
+    assert index.substring("xyz") == []
+    assert index.substring("zoexyz") == []
+
+
+def test_matches_username_or_display_name(index):
+    assert [m.id for m in index.substring("zoltan")] == [2]
+    assert [m.id for m in index.substring("zolly")] == [2]
+    assert [m.id for m in index.substring("nonam")] == [4]
+
+
+def test_incremental_updates(index):
+    index.add(_member(2, "zoltan", "Zed"))
+    assert index.substring("zolly") == []
+    assert [m.display_name for m in index.exact("zed")] == ["Zed"]
+
+    index.discard(1)
+    assert [m.id for m in index.prefix("zo")] == [2]
+    assert len(index) == 3
+
+
+@pytest.mark.asyncio
+async def test_member_index_follows_member_events():
+    server = SimpleNamespace(members=[_member(1, "alice")])
+    server.members[0].guild = server
+    with patch('utils.player_utils.global_vars') as mock_global_vars:
+        mock_global_vars.server = server
+        index = player_utils.member_index()
+        assert player_utils.member_index() is index
+
+        bob = _member(2, "bob", guild=server)
+        player_utils.index_member(bob)
+        assert await player_utils.generate_possibilities("bo", index) == [bob]
+
+        player_utils.unindex_member(bob)
+        assert await player_utils.generate_possibilities("bo", index) == []
+
+        # Members of other servers are ignored
+        player_utils.index_member(_member(3, "bobby", guild=object()))
+        assert await player_utils.generate_possibilities("bo", index) == []
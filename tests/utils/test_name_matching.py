@@ -0,0 +1,106 @@
+"""
+Tests for ranking the people a typed name could refer to
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import global_vars
+from tests.fixtures.discord_mocks import mock_discord_setup
+from tests.fixtures.game_fixtures import setup_test_game
+from utils.name_matching import MatchKind, best_matches, edit_distance, match_kind
+from utils.player_utils import select_player
+
+
+def _member(member_id, name, display_name=None):
+    return SimpleNamespace(id=member_id, name=name, display_name=display_name)
+
+
+@pytest.fixture
+def no_game():
+    original_game = global_vars.game
+    global_vars.game = None
+    yield
+    global_vars.game = original_game
+
+
+def test_match_kinds():
+    assert match_kind("sam", ["sam"]) is MatchKind.EXACT
+    assert match_kind("sam", ["samantha"]) is MatchKind.PREFIX
+    assert match_kind("sam", ["big sam"]) is MatchKind.TOKEN
+    assert match_kind("sam", ["wisamuel"]) is MatchKind.SUBSTRING
+    assert match_kind("jordan", ["jordn"]) is MatchKind.FUZZY
+    assert match_kind("sam", ["tom"]) is None
+    # The best of several names counts
+    assert match_kind("sam", ["big sam", "sam"]) is MatchKind.EXACT
+
+
+def test_edit_distance_gives_up_past_limit():
+    assert edit_distance("kitten", "sitting", 3) == 3
+    assert edit_distance("kitten", "sitting", 1) == 2
+    assert edit_distance("a", "abcdef", 2) == 3
+
+
+def test_clear_winner_is_picked(no_game):
+    sam = _member(1, "sam", "Sam")
+    samantha = _member(2, "samantha", "Samantha")
+    big_sam = _member(3, "bigs", "Big Sam")
+
+    assert best_matches("sam", [samantha, big_sam, sam]) == [sam]
+    assert best_matches("sa", [big_sam, samantha, sam]) == [samantha, sam]
+
+
+def test_players_in_the_game_are_listed_first(mock_discord_setup, setup_test_game):
+    game = setup_test_game['game']
+    members = mock_discord_setup['members']
+    alice_player = setup_test_game['players']['alice']
+
+    # Both display names start with the text; only one of them is playing
+    lookalike = _member(99, "alicia", "Alicia")
+    assert best_matches("ali", [lookalike, members['alice']]) == [members['alice'], lookalike]
+
+    # Living players come before dead ones
+    alice_player.is_ghost = True
+    living = _member(members['bob'].id, "alina", "Alina")
+    assert best_matches("ali", [members['alice'], living]) == [living, members['alice']]
+    assert game.get_player(living.id) is setup_test_game['players']['bob']
+
+    # A closer match still wins outright over a player in the game
+    exact = _member(98, "ali", "Ali")
+    assert best_matches("ali", [living, exact]) == [exact]
+
+
+@pytest.mark.asyncio
+async def test_select_player_asks_when_only_the_game_tells_people_apart(mock_discord_setup, setup_test_game):
+    alice = mock_discord_setup['members']['alice']
+    lookalike = _member(99, "alicia", "Alicia")
+    with patch('utils.player_utils.choices', new_callable=AsyncMock) as mock_choices:
+        mock_choices.return_value = alice
+        assert await select_player(SimpleNamespace(), "ali", [lookalike, alice]) is alice
+    mock_choices.assert_awaited_once()
+    assert mock_choices.call_args[0][1] == [alice, lookalike]
+
+
+@pytest.mark.asyncio
+async def test_select_player_confirms_typos(no_game):
+    jordan = _member(1, "jordan", "Jordan")
+    with patch('utils.player_utils.choices', new_callable=AsyncMock) as mock_choices:
+        mock_choices.return_value = jordan
+        assert await select_player(SimpleNamespace(), "jordn", [jordan, _member(2, "taylor")]) is jordan
+    # A near miss is never acted on unconfirmed, even when it is the only one
+    mock_choices.assert_awaited_once()
+    assert mock_choices.call_args[0][1] == [jordan]
+
+
+@pytest.mark.asyncio
+async def test_select_player_only_asks_about_ties(no_game):
+    alex = _member(1, "alex_b", "Alex")
+    alexa = _member(2, "alexa", "Alex")
+    alexander = _member(3, "alexander", "Alexander")
+    with patch('utils.player_utils.choices', new_callable=AsyncMock) as mock_choices:
+        mock_choices.return_value = alexa
+        assert await select_player(SimpleNamespace(), "alex", [alexander, alex, alexa]) is alexa
+    mock_choices.assert_awaited_once()
+    assert mock_choices.call_args[0][1] == [alex, alexa]
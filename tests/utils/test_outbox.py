@@ -0,0 +1,131 @@
+"""
+Tests for the outbox that schedules outgoing messages
+"""
+
+import asyncio
+
+import discord
+import pytest
+from unittest.mock import Mock
+
+from utils.outbox import Outbox, Priority, RateBucket
+
+
+class FakeChannel:
+    """A channel recording what it was sent, optionally holding sends until released."""
+
+    def __init__(self, channel_id, sent, gate=None):
+        self.id = channel_id
+        self.sent = sent
+        self.gate = gate
+
+    async def send(self, content=None, **kwargs):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append((self.id, content))
+        return Mock(content=content)
+
+
+def test_rate_bucket_refills_steadily():
+    """Test that a bucket allows a burst, then one send per refill interval."""
+    bucket = RateBucket(2, 1.0)
+    bucket.take(0.0)
+    bucket.take(0.0)
+    assert bucket.delay(0.0) == pytest.approx(0.5)
+    assert bucket.delay(0.5) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_urgent_messages_skip_the_queue():
+    """Test that an urgent message is sent before messages queued ahead of it."""
+    sent = []
+    outbox = Outbox(global_rate=(1, 0.02))
+    sends = [outbox.send(FakeChannel(i, sent), f"notification {i}", Priority.LOW) for i in range(3)]
+    sends.append(outbox.send(FakeChannel(9, sent), "your vote", Priority.URGENT))
+
+    await asyncio.gather(*sends)
+
+    assert sent[0] == (9, "your vote")
+    assert outbox.metrics[Priority.URGENT].sent == 1
+    assert outbox.metrics[Priority.LOW].max_wait_seconds > 0
+    assert all(metrics.queue_depth == 0 for metrics in outbox.metrics.values())
+
+
+@pytest.mark.asyncio
+async def test_each_destination_is_rate_limited_in_order():
+    """Test that messages to one channel keep their order and wait for the channel's bucket."""
+    sent = []
+    outbox = Outbox(route_rate=(2, 0.1))
+    channel, other = FakeChannel(1, sent), FakeChannel(2, sent)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    await asyncio.gather(*(outbox.send(channel, str(i)) for i in range(3)), outbox.send(other, "other"))
+
+    assert [content for channel_id, content in sent if channel_id == 1] == ["0", "1", "2"]
+    assert sent.index((2, "other")) < sent.index((1, "2"))
+    assert loop.time() - start >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_low_priority_messages_are_coalesced():
+    """Test that low-priority messages waiting for the same channel are sent as one."""
+    sent = []
+    gate = asyncio.Event()
+    channel = FakeChannel(1, sent, gate)
+    outbox = Outbox()
+
+    first = asyncio.ensure_future(outbox.send(channel, "a", Priority.LOW))
+    # Let the first message start sending, so the others queue behind it
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    rest = [asyncio.ensure_future(outbox.send(channel, text, Priority.LOW)) for text in ("b", "c")]
+    await asyncio.sleep(0)
+    gate.set()
+    messages = await asyncio.gather(first, *rest)
+
+    assert sent == [(1, "a"), (1, "b\nc")]
+    assert messages[1] is messages[2]
+    assert outbox.metrics[Priority.LOW].sent == 2
+    assert outbox.metrics[Priority.LOW].coalesced == 1
+
+
+@pytest.mark.asyncio
+async def test_send_errors_reach_the_caller():
+    """Test that a failed send raises in the caller and does not stop the queue."""
+    sent = []
+    broken = FakeChannel(1, sent)
+    broken.send = Mock(side_effect=discord.HTTPException(response=Mock(), message="Error"))
+    outbox = Outbox()
+
+    with pytest.raises(discord.HTTPException):
+        await outbox.send(broken, "lost")
+    await outbox.send(FakeChannel(2, sent), "delivered")
+
+    assert sent == [(2, "delivered")]
+
+
+@pytest.mark.asyncio
+async def test_messages_to_one_destination_keep_their_order_across_lanes():
+    """Test that an urgent message waits for earlier messages to its destination, and hurries them along."""
+    sent = []
+    gate = asyncio.Event()
+    whispers, other = FakeChannel(1, sent, gate), FakeChannel(2, sent)
+    outbox = Outbox(global_rate=(1, 0.02))
+
+    first = asyncio.ensure_future(outbox.send(whispers, "log 1", Priority.LOW))
+    # Let the first message start sending, so the others queue behind it
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    rest = [
+        asyncio.ensure_future(outbox.send(other, "notification", Priority.LOW)),
+        asyncio.ensure_future(outbox.send(whispers, "log 2", Priority.LOW)),
+        asyncio.ensure_future(outbox.send(whispers, "Start of day 2", Priority.URGENT)),
+    ]
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(first, *rest)
+
+    assert [content for channel_id, content in sent if channel_id == 1] == ["log 1", "log 2", "Start of day 2"]
+    assert sent.index((1, "log 2")) < sent.index((2, "notification"))
+    assert all(metrics.queue_depth == 0 for metrics in outbox.metrics.values())
@@ -8,6 +8,9 @@ from unittest.mock import AsyncMock, MagicMock, patch, Mock, call
 import discord
 import pytest
 
+from model.game.game import Game
+from model.game.script import Script
+from model.game.seating_ring import SeatingRing
 from utils.interaction_utils import yes_no
 from utils.player_utils import (
     is_player, find_player_by_nick, who_by_id, who_by_character, who, get_neighbors,
@@ -230,22 +233,22 @@ async def test_select_player_multiple_matches(mock_players):
     with patch('utils.player_utils.generate_possibilities', new_callable=AsyncMock) as mock_gen_poss:
         with patch('utils.player_utils.choices', new_callable=AsyncMock) as mock_choices:
             # Mock generate_possibilities to return multiple players
-            mock_gen_poss.return_value = mock_players[:2]  # Alice and Bob
+            mock_gen_poss.return_value = [mock_players[0], mock_players[2]]  # Alice and Charlie
 
             # Mock choices to return one player
             mock_choices.return_value = mock_players[0]  # Alice
 
-            # Call select_player
-            result = await select_player(user, "A", mock_players)
+            # Call select_player with text matching both names equally well
+            result = await select_player(user, "li", mock_players)
 
             # Verify result is the player returned by choices
             assert result == mock_players[0]
 
             # Verify generate_possibilities was called
-            mock_gen_poss.assert_awaited_once_with("A", mock_players)
+            mock_gen_poss.assert_awaited_once_with("li", mock_players)
 
             # Verify choices was called with the matched players
-            mock_choices.assert_awaited_once_with(user, mock_players[:2], "A")
+            mock_choices.assert_awaited_once_with(user, [mock_players[0], mock_players[2]], "li")
 
 
 @pytest.mark.asyncio
@@ -291,8 +294,9 @@ async def test_get_player_found(mock_wait_for, mock_safe_send):
 
     # Mock the global game object and seating order
     with patch('utils.player_utils.global_vars') as mock_global_vars:
-        mock_global_vars.game.seatingOrder = [player]
         player.user = user
+        player.user_id = user.id
+        mock_global_vars.game = Game([player], None, None, Script([]), skip_storytellers=True)
 
         # Call get_player
         result = get_player(user)
@@ -313,8 +317,9 @@ async def test_get_player_not_found(mock_wait_for, mock_safe_send):
 
     # Mock the global game object and seating order
     with patch('utils.player_utils.global_vars') as mock_global_vars:
-        mock_global_vars.game.seatingOrder = [player]
         player.user = other_user  # Different user
+        player.user_id = other_user.id
+        mock_global_vars.game = Game([player], None, None, Script([]), skip_storytellers=True)
 
         # Call get_player
         result = get_player(user)
@@ -430,15 +435,15 @@ class TestWhoById:
         user1.id = 12345
         player1 = Mock()
         player1.user = user1
+        player1.user_id = user1.id
 
         user2 = Mock(spec=discord.User)
         user2.id = 67890
         player2 = Mock()
         player2.user = user2
+        player2.user_id = user2.id
 
-        mock_game = Mock()
-        mock_game.seatingOrder = [player1, player2]
-        mock_global_vars.game = mock_game
+        mock_global_vars.game = Game([player1, player2], None, None, Script([]), skip_storytellers=True)
 
         result = who_by_id(12345)
 
@@ -451,10 +456,9 @@ class TestWhoById:
         user1.id = 12345
         player1 = Mock()
         player1.user = user1
+        player1.user_id = user1.id
 
-        mock_game = Mock()
-        mock_game.seatingOrder = [player1]
-        mock_global_vars.game = mock_game
+        mock_global_vars.game = Game([player1], None, None, Script([]), skip_storytellers=True)
 
         result = who_by_id(999)
 
@@ -606,6 +610,7 @@ class TestGetNeighbors:
 
         mock_game = Mock()
         mock_game.seatingOrder = [player1, player2, player3]
+        mock_game.seating = SeatingRing(mock_game.seatingOrder)
         mock_global_vars.game = mock_game
 
         result = get_neighbors(player2)
@@ -626,6 +631,7 @@ class TestGetNeighbors:
 
         mock_game = Mock()
         mock_game.seatingOrder = [player1, player2, player3]
+        mock_game.seating = SeatingRing(mock_game.seatingOrder)
         mock_global_vars.game = mock_game
 
         result = get_neighbors(player3)
@@ -649,6 +655,7 @@ class TestGetNeighbors:
 
         mock_game = Mock()
         mock_game.seatingOrder = [player1, player2, player3, player4]
+        mock_game.seating = SeatingRing(mock_game.seatingOrder)
         mock_global_vars.game = mock_game
 
         result = get_neighbors(player1)
@@ -663,6 +670,7 @@ class TestGetNeighbors:
 
         mock_game = Mock()
         mock_game.seatingOrder = [player1]
+        mock_game.seating = SeatingRing(mock_game.seatingOrder)
         mock_global_vars.game = mock_game
 
         result = get_neighbors(player2)
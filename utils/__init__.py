@@ -11,9 +11,9 @@ from . import text_utils
 # Import commonly used functions
 from .character_utils import has_ability, the_ability, str_to_class
 from .game_utils import remove_backup, update_presence, backup, load
-from .message_utils import safe_send, safe_send_dm, notify_storytellers
+from .message_utils import safe_send, safe_send_dm, notify_storytellers, broadcast
 from .player_utils import (
-    who, find_player_by_nick, is_player, get_player, generate_possibilities,
+    who, find_player_by_nick, is_player, get_player, generate_possibilities, member_index,
     choices, select_player, active_in_st_chat, make_active, cannot_nominate,
     warn_missing_player_channels, check_and_print_if_one_or_zero_to_check_in
 )
@@ -34,6 +34,7 @@ __all__ = [
     'safe_send',
     'safe_send_dm',
     'notify_storytellers',
+    'broadcast',
 
     # Player utilities
     'who',
@@ -41,6 +42,7 @@ __all__ = [
     'is_player',
     'get_player',
     'generate_possibilities',
+    'member_index',
     'choices',
     'select_player',
     'active_in_st_chat',
@@ -30,6 +30,11 @@ def the_ability(character, ability_class):
     Returns:
         The ability instance if found, otherwise None
     """
+    # AbilityModifiers keep a flattened table of their nested abilities
+    effective_abilities = getattr(type(character), 'effective_abilities', None)
+    if effective_abilities is not None and isinstance(ability_class, type):
+        return effective_abilities(character).get(ability_class)
+
     # Check if character has the abilities attribute
     if hasattr(character, 'abilities'):
         for ability in character.abilities:
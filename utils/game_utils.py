@@ -1,6 +1,8 @@
 """Utilities for game management, extracted to avoid circular imports."""
 
+import asyncio
 import os
+import time
 
 import dill
 import discord
@@ -44,62 +46,193 @@ async def update_presence(client):
         )
 
 
+def _backed_up_attributes(game):
+    """Lists the attributes of the game that are written to backups.
+
+    Args:
+        game: The game being backed up
+
+    Returns:
+        list[str]: The names of the non-callable attributes of the game, leaving out
+            properties and untracked attributes, which are derived from the others
+    """
+    from model.persistence import Tracked
+
+    return [
+        x
+        for x in dir(game)
+        if not x.startswith("__")
+           and x not in vars(Tracked)
+           and x not in game._untracked_attributes
+           and not isinstance(getattr(type(game), x, None), property)
+           and not callable(getattr(game, x))
+    ]
+
+
 def remove_backup(fileName):
-    """Removes a backup file and its associated object files.
+    """Removes a backup file and its associated object and journal files.
     
     Args:
         fileName: The name of the backup file
     """
+    from model.persistence import journal
+
+    if _backup_service is not None:
+        _backup_service.cancel()
+    journal.discard(fileName)
+
     if os.path.exists(fileName):
         os.remove(fileName)
 
-    for obj in [
-        x
-        for x in dir(global_vars.game)
-        if not x.startswith("__") and not callable(getattr(global_vars.game, x))
-    ]:
+    for obj in _backed_up_attributes(global_vars.game):
         obj_file = obj + "_" + fileName
         if os.path.exists(obj_file):
             os.remove(obj_file)
 
 
+def archive_game(game, winner):
+    """Records a finished game in the archive of finished games.
+
+    Failing to archive is logged rather than raised, so that the game can still end.
+
+    Args:
+        game: The game that ended
+        winner: The winning team ('good', 'evil', or 'tie')
+    """
+    import bot_client
+    from model.persistence.archive import GameArchive
+
+    try:
+        with GameArchive() as archive:
+            archive.record(game, winner)
+    except Exception as e:
+        bot_client.logger.error(f"Could not archive game: {e}")
+
+
 def backup(fileName):
     """
     Backs up the game-state.
+
+    Nothing is written if the game-state has not changed since the last backup or load, or if
+    every change since then has been journaled. Writing the backup compacts the journal.
+
+    When called from the event loop, the backup is written by a background worker shortly
+    afterwards; see ``BackupService``.
     
     Args:
         fileName: The name of the backup file
     """
     from model.game.game import NULL_GAME
+    from model.persistence import tracking
 
     if not global_vars.game or global_vars.game is NULL_GAME:
         return
 
-    objects = [
-        x
-        for x in dir(global_vars.game)
-        if not x.startswith("__") and not callable(getattr(global_vars.game, x))
-    ]
-    with open(fileName, "wb") as file:
-        dill.dump(objects, file)
+    if not tracking.is_dirty():
+        return
 
-    for obj in objects:
-        with open(obj + "_" + fileName, "wb") as file:
-            if obj == "seatingOrderMessage":
-                dill.dump(getattr(global_vars.game, obj).id, file)
-            elif obj == "info_channel_seating_order_message":
-                msg = getattr(global_vars.game, obj)
-                if msg is not None:
-                    dill.dump(msg.id, file)
-                else:
-                    dill.dump(None, file)
-            else:
-                dill.dump(getattr(global_vars.game, obj), file)
+    get_backup_service().request(fileName)
+
+
+def flush_backups():
+    """Writes any pending backup and waits for background writes to finish."""
+    if _backup_service is not None:
+        _backup_service.flush()
+
+
+def get_backup_service():
+    """Gets the service that writes game backups, creating it on first use.
+
+    Returns:
+        BackupService: The backup service
+    """
+    global _backup_service
+    from model.persistence.backup_service import BackupService
+
+    if _backup_service is None:
+        _backup_service = BackupService(_snapshot_game, _write_backup, _backup_written,
+                                        prepare=_prepare_backup_write)
+    return _backup_service
+
+
+_backup_service = None
+
+
+def _snapshot_game(fileName, isolate):
+    """Captures the state of the current game for a backup.
+
+    Args:
+        fileName: The name of the backup file
+        isolate: Whether to capture the state so it can be written while the game continues
+
+    Returns:
+        tuple: The game, its journal sequence number, and the attributes to write by name
+    """
+    from model.persistence import journal, serializer
+
+    # Until this snapshot is on disk, the journal cannot extend the snapshot that is
+    journal.suspend()
+
+    game = global_vars.game
+    state = {}
+    for obj in _backed_up_attributes(game):
+        value = getattr(game, obj)
+        if obj in ("seatingOrderMessage", "info_channel_seating_order_message"):
+            value = value.id if value is not None else None
+        state[obj] = value
+    if isolate:
+        # Copies only containers and object states; the worker thread does the encoding
+        state = serializer.capture(state)
+    return game, game.journal_sequence, state
+
+
+def _prepare_backup_write():
+    """Imports everything ``_write_backup`` needs, so that a forked writer never imports."""
+    from model.persistence import serializer, snapshot  # noqa: F401
+
+    serializer.preload()
+
+
+def _write_backup(fileName, data):
+    """Writes a snapshot taken by ``_snapshot_game`` to the backup file.
+
+    Each attribute is encoded by the schema-versioned serializer into its own section of a
+    single snapshot file, which replaces the previous backup atomically.
+
+    Args:
+        fileName: The name of the backup file
+        data: The snapshot to write
+    """
+    from model.persistence import serializer, snapshot
+
+    _, _, state = data
+    snapshot.write_snapshot(fileName, serializer.encode_sections(state))
+
+
+def _backup_written(fileName, data):
+    """Compacts the journal once a snapshot is on disk.
+
+    Args:
+        fileName: The name of the backup file
+        data: The snapshot that was written
+    """
+    from model.persistence import journal
+
+    game, sequence, _ = data
+    journal.attach(fileName, game, snapshot_sequence=sequence)
 
 
 async def load(fileName):
     """
-    Loads the game-state.
+    Loads the game-state, replaying any journaled mutations made after the backup was written.
+
+    Backups written with dill, either as a snapshot or as one file per attribute, are still
+    read; the game-state is then flagged dirty so that the next backup migrates it.
+
+    Discord objects are rehydrated lazily: players resolve their member and channel on first
+    use, and the seating order messages are restored as partial messages that are only
+    fetched when needed. Where a channel cannot make partial messages, the messages are
+    fetched concurrently. The time spent in each phase is logged.
     
     Args:
         fileName: The name of the backup file
@@ -107,34 +240,121 @@ async def load(fileName):
     Returns:
         The loaded game object
     """
+    import bot_client
     from model.game.game import Game
     from model.game.script import Script
+    from model.persistence import journal, serializer, snapshot, tracking
 
+    timings = {}
+    start = time.perf_counter()
     with open(fileName, "rb") as file:
-        objects = dill.load(file)
+        is_snapshot = snapshot.is_snapshot(file.read(len(snapshot.MAGIC)))
+        if not is_snapshot:
+            file.seek(0)
+            objects = dill.load(file)
+
+    if is_snapshot:
+        try:
+            state, migrate = _read_snapshot(fileName)
+        except (snapshot.SnapshotError, serializer.SerializationError) as e:
+            print(f"Corrupt backup found: {e}")
+            return None
+    else:
+        state = _read_legacy_backup(fileName, objects)
+        migrate = True
+        if state is None:
+            print("Incomplete backup found.")
+            return None
+    timings["read"] = time.perf_counter() - start
 
+    start = time.perf_counter()
     game = Game([], None, None, Script([]))
+    for obj, value in state.items():
+        if obj not in ("seatingOrderMessage", "info_channel_seating_order_message"):
+            setattr(game, obj, value)
+    game.share_whispers(game.seatingOrder + game.storytellers)
+    info_channel = global_vars.info_channel if state.get("info_channel_seating_order_message") else None
+    game.seatingOrderMessage, game.info_channel_seating_order_message = await asyncio.gather(
+        _message_handle(global_vars.channel, state.get("seatingOrderMessage")),
+        _message_handle(info_channel, state.get("info_channel_seating_order_message"), required=False),
+    )
+    timings["messages"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    journal.replay(fileName, game)
+    journal.attach(fileName, game)
+    timings["replay"] = time.perf_counter() - start
+
+    if migrate:
+        tracking.mark_dirty()
+    else:
+        # The files on disk already match what was just loaded
+        tracking.mark_clean()
+
+    bot_client.logger.info(
+        f"Loaded {fileName} in {sum(timings.values()):.3f}s ("
+        + ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in timings.items()) + ")"
+    )
+    return game
+
+
+async def _message_handle(channel, message_id, required=True):
+    """Gets a handle on a backed-up message without fetching it where possible.
+
+    Args:
+        channel: The channel the message was sent in
+        message_id: The id of the message
+        required: Whether a message that cannot be fetched is an error rather than None
+
+    Returns:
+        discord.PartialMessage | discord.Message | None: The message
+    """
+    if message_id is None or channel is None:
+        return None
+    if hasattr(channel, "get_partial_message"):
+        return channel.get_partial_message(message_id)
+    try:
+        return await channel.fetch_message(message_id)
+    except Exception:
+        if required:
+            raise
+        # Message may have been deleted or channel may not exist
+        return None
+
+
+def _read_snapshot(fileName):
+    """Reads attributes from a single-file snapshot backup.
+
+    Args:
+        fileName: The name of the backup file
+
+    Returns:
+        tuple: The attribute values by name, and whether the sections were written with dill
+    """
+    from model.persistence import serializer
+    from model.persistence.snapshot import SnapshotReader
+
+    with SnapshotReader(fileName) as reader:
+        names = reader.names()
+        if serializer.is_encoded(names):
+            return serializer.decode_sections(names, lambda name: reader.load(name, bytes)), False
+        return {obj: reader.load(obj, dill.loads) for obj in names}, True
+
+
+def _read_legacy_backup(fileName, objects):
+    """Reads attributes from a backup written as one file per attribute.
+
+    Args:
+        fileName: The name of the backup index file
+        objects: The attribute names listed in the index file
+
+    Returns:
+        dict | None: The attribute values by name, or None if an attribute file is missing
+    """
+    state = {}
     for obj in objects:
         if not os.path.isfile(obj + "_" + fileName):
-            print("Incomplete backup found.")
             return None
         with open(obj + "_" + fileName, "rb") as file:
-            if obj == "seatingOrderMessage":
-                id = dill.load(file)
-                msg = await global_vars.channel.fetch_message(id)
-                setattr(game, obj, msg)
-            elif obj == "info_channel_seating_order_message":
-                id = dill.load(file)
-                if id is not None and global_vars.info_channel:
-                    try:
-                        msg = await global_vars.info_channel.fetch_message(id)
-                        setattr(game, obj, msg)
-                    except:
-                        # Message may have been deleted or channel may not exist
-                        setattr(game, obj, None)
-                else:
-                    setattr(game, obj, None)
-            else:
-                setattr(game, obj, dill.load(file))
-
-    return game
+            state[obj] = dill.load(file)
+    return state
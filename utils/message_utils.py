@@ -3,9 +3,38 @@ Utility functions for handling Discord messages.
 """
 
 
+import asyncio
+from typing import Any, Iterable
+
 import discord
 
 import bot_client
+from utils.outbox import LaneMetrics, Outbox, Priority
+
+# Most DMs a broadcast has waiting on Discord at once
+BROADCAST_CONCURRENCY = 4
+# Seconds a digest collects notifications for before sending them
+DIGEST_WINDOW = 2.0
+
+_outbox = None
+
+
+def _get_outbox() -> Outbox:
+    """Get the outbox every message is sent through, creating it on first use."""
+    global _outbox
+    if _outbox is None:
+        _outbox = Outbox()
+    return _outbox
+
+
+def outbox_metrics() -> dict[Priority, LaneMetrics]:
+    """
+    Get the queue depth and waiting times of each priority lane of the outbox.
+
+    Returns:
+        The metrics of each lane
+    """
+    return _get_outbox().metrics
 
 
 def _split_text(text: str, max_length: int = 2000) -> list[str]:
@@ -25,14 +54,19 @@ def _split_text(text: str, max_length: int = 2000) -> list[str]:
 async def safe_send(
         channel: discord.abc.Messageable | discord.Member | discord.User,
         content: str | None = None,
+        priority: Priority = Priority.NORMAL,
     **kwargs
 ) -> discord.Message | None:
     """
     Safely send a message to a channel, handling errors and long messages.
+
+    The message is queued in the outbox, which sends urgent messages first and may combine
+    low-priority messages to the same channel into one.
     
     Args:
         channel: The channel or user to send to
         content: The content of the message
+        priority: How urgently the message should be sent
         **kwargs: Additional message parameters
         
     Returns:
@@ -43,6 +77,8 @@ async def safe_send(
         if not content and not any(k in kwargs for k in ['embed', 'embeds', 'file', 'files']):
             content = "\u200b"  # Zero-width space
         
+        outbox = _get_outbox()
+
         # Split long messages
         if content and len(content) > 2000:
             chunks = _split_text(content)
@@ -50,14 +86,14 @@ async def safe_send(
             for i, chunk in enumerate(chunks):
                 if i == 0:
                     # Apply kwargs only to the first message
-                    message = await channel.send(chunk, **kwargs)
+                    message = await outbox.send(channel, chunk, priority, **kwargs)
                     first_message = message
                 else:
-                    await channel.send(chunk)
+                    await outbox.send(channel, chunk, priority)
             return first_message
         
         # Regular send
-        return await channel.send(content, **kwargs)
+        return await outbox.send(channel, content, priority, **kwargs)
     except discord.HTTPException as e:
         bot_client.logger.error(f"Failed to send message: {e}")
         return None
@@ -98,7 +134,92 @@ async def safe_send_dm(
         return None
 
 
-async def notify_storytellers(message: str, **kwargs) -> None:
+async def broadcast(
+        recipients: Iterable[discord.abc.Messageable | discord.Member | discord.User],
+        content: str,
+        digest: bool = False,
+    **kwargs
+) -> None:
+    """
+    Send the same message to several people at once.
+
+    Up to BROADCAST_CONCURRENCY sends are in flight together, instead of each recipient
+    waiting for the previous one.
+
+    Args:
+        recipients: The channels or users to send to
+        content: The content of the message
+        digest: Whether to hold the message back for DIGEST_WINDOW seconds and send it to
+            each recipient in one message together with any others held back meanwhile
+        **kwargs: Additional message parameters for safe_send; not allowed with digest
+    """
+    if digest:
+        if kwargs:
+            raise ValueError("Digest broadcasts only take message content")
+        _digest.add(recipients, content)
+        return
+
+    semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+
+    async def send(recipient):
+        async with semaphore:
+            await safe_send(recipient, content, **kwargs)
+
+    await asyncio.gather(*(send(recipient) for recipient in recipients))
+
+
+class _Digest:
+    """Notifications held back to be sent to each recipient as one message."""
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pending: dict[Any, list[str]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushing: asyncio.Task | None = None
+
+    def add(self, recipients: Iterable[Any], content: str) -> None:
+        """Hold a message back for each recipient, sending them all once the window ends."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._reset()
+        for recipient in recipients:
+            self._pending.setdefault(recipient, []).append(content)
+        if self._timer is None:
+            self._timer = loop.call_later(DIGEST_WINDOW, self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._flushing = self._loop.create_task(self.flush())
+
+    async def flush(self) -> None:
+        """Send every recipient the messages held back for them."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+
+        async def send(recipient, lines):
+            async with semaphore:
+                await safe_send(recipient, "\n".join(lines), priority=Priority.LOW)
+
+        await asyncio.gather(*(send(recipient, lines) for recipient, lines in pending.items()))
+
+
+_digest = _Digest()
+
+
+async def flush_digest() -> None:
+    """
+    Send the notifications held back by digest broadcasts now.
+    """
+    await _digest.flush()
+
+
+async def notify_storytellers(message: str, digest: bool = False, **kwargs) -> None:
     """
     Send a message to all storytellers in the current game.
     
@@ -106,28 +227,33 @@ async def notify_storytellers(message: str, **kwargs) -> None:
     about game state changes. It will try both global_vars.gamemaster_role.members
     and global_vars.game.storytellers to find storytellers.
     
+    Notifications are sent at low priority unless another priority is given, so they never
+    hold up messages the game is waiting on.
+
     Args:
         message: The message to send to storytellers
+        digest: Whether to merge the message with other notifications sent soon after; see broadcast
         **kwargs: Additional message parameters for safe_send
     """
     import global_vars
 
+    if not digest:
+        kwargs.setdefault("priority", Priority.LOW)
+
     # Try to send to storytellers from the game object first (preferred)
     if (hasattr(global_vars, 'game') and
             global_vars.game and
             hasattr(global_vars.game, 'storytellers') and
             global_vars.game.storytellers):
-        for storyteller in global_vars.game.storytellers:
-            # Game storytellers have a .user attribute
-            user = getattr(storyteller, 'user', storyteller)
-            await safe_send(user, message, **kwargs)
+        # Game storytellers have a .user attribute
+        users = [getattr(storyteller, 'user', storyteller) for storyteller in global_vars.game.storytellers]
+        await broadcast(users, message, digest, **kwargs)
 
     # Fallback to gamemaster role members
     elif (hasattr(global_vars, 'gamemaster_role') and
           global_vars.gamemaster_role and
           hasattr(global_vars.gamemaster_role, 'members')):
-        for member in global_vars.gamemaster_role.members:
-            await safe_send(member, message, **kwargs)
+        await broadcast(global_vars.gamemaster_role.members, message, digest, **kwargs)
 
     # If neither is available, log a warning
     else:
@@ -0,0 +1,198 @@
+"""
+Index of people by their normalized display names and usernames.
+
+Names are casefolded and stripped of accents, so "Zoë" is found by "zoe". Every 1-, 2-
+and 3-character slice of each name has a posting set of the people whose names contain
+it, which answers short substring queries directly and narrows longer ones down to a
+few candidates before they are checked. Every prefix of each name has a posting set
+too, so prefix lookups need no checking at all.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from operator import attrgetter
+from typing import Callable, Generic, Hashable, Iterable, TypeVar
+
+T = TypeVar('T')
+
+# Longest slice of a name with its own posting set
+GRAM_SIZE = 3
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize a name for matching, casefolding it and stripping accents.
+
+    Args:
+        text: The name
+
+    Returns:
+        The normalized name
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def person_names(person) -> tuple[str, ...]:
+    """
+    Get the normalized names a person can be found by.
+
+    Args:
+        person: A member or player
+
+    Returns:
+        The normalized display name and username, leaving out missing ones
+    """
+    return tuple(normalize(name) for name in (person.display_name, person.name) if name is not None)
+
+
+def _prefixes(name: str) -> list[str]:
+    return [name[:end] for end in range(1, len(name) + 1)]
+
+
+def _grams(name: str) -> set[str]:
+    return {
+        name[start:start + size]
+        for size in range(1, GRAM_SIZE + 1)
+        for start in range(len(name) - size + 1)
+    }
+
+
+class NameIndex(Generic[T]):
+    """
+    People indexed by name for exact, prefix and substring lookups.
+
+    Lookups return people in the order they were added. Adding a person with the key of
+    one already indexed replaces them, which is how a changed nickname is picked up.
+    """
+
+    def __init__(self, people: Iterable[T] = (), key: Callable[[T], Hashable] = attrgetter("id")):
+        """
+        Initialize a NameIndex.
+
+        Args:
+            people: The people to index
+            key: Gets the value that identifies a person, by default their id
+        """
+        self._key = key
+        self._people: dict[Hashable, tuple[T, tuple[str, ...]]] = {}
+        self._positions: dict[Hashable, int] = {}
+        self._added = 0
+        self._exact: dict[str, set[Hashable]] = {}
+        self._prefixes: dict[str, set[Hashable]] = {}
+        self._postings: dict[str, set[Hashable]] = {}
+        for person in people:
+            self.add(person)
+
+    def __len__(self) -> int:
+        return len(self._people)
+
+    def __iter__(self):
+        return (person for person, _ in self._people.values())
+
+    def add(self, person: T) -> None:
+        """
+        Index a person, replacing anyone indexed with the same key.
+
+        Args:
+            person: The person to index
+        """
+        key = self._key(person)
+        self.discard(key)
+        names = person_names(person)
+        self._people[key] = (person, names)
+        self._positions[key] = self._added
+        self._added += 1
+        for name in names:
+            self._exact.setdefault(name, set()).add(key)
+            for prefix in _prefixes(name):
+                self._prefixes.setdefault(prefix, set()).add(key)
+            for gram in _grams(name):
+                self._postings.setdefault(gram, set()).add(key)
+
+    def discard(self, key: Hashable) -> None:
+        """
+        Remove a person from the index, if they are in it.
+
+        Args:
+            key: The key of the person, e.g. their id
+        """
+        entry = self._people.pop(key, None)
+        if entry is None:
+            return
+        del self._positions[key]
+        for name in entry[1]:
+            self._remove_posting(self._exact, name, key)
+            for prefix in _prefixes(name):
+                self._remove_posting(self._prefixes, prefix, key)
+            for gram in _grams(name):
+                self._remove_posting(self._postings, gram, key)
+
+    @staticmethod
+    def _remove_posting(postings: dict[str, set[Hashable]], name: str, key: Hashable) -> None:
+        keys = postings.get(name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del postings[name]
+
+    def exact(self, text: str) -> list[T]:
+        """
+        Find the people with a name equal to text.
+
+        Args:
+            text: The name to look up
+
+        Returns:
+            The matching people
+        """
+        return self._people_for(self._exact.get(normalize(text), ()))
+
+    def prefix(self, text: str) -> list[T]:
+        """
+        Find the people with a name starting with text.
+
+        Args:
+            text: The start of the name
+
+        Returns:
+            The matching people
+        """
+        text = normalize(text)
+        if not text:
+            return list(self)
+        return self._people_for(self._prefixes.get(text, ()))
+
+    def substring(self, text: str) -> list[T]:
+        """
+        Find the people with a name containing text.
+
+        Args:
+            text: The part of the name
+
+        Returns:
+            The matching people
+        """
+        text = normalize(text)
+        if len(text) <= GRAM_SIZE:
+            return self._people_for(self._candidates(text))
+        return self._people_for(
+            key for key in self._candidates(text)
+            if any(text in name for name in self._people[key][1])
+        )
+
+    def _candidates(self, text: str) -> Iterable[Hashable]:
+        """Get the keys of a superset of the people with a name containing text."""
+        if not text:
+            return self._people.keys()
+        if len(text) <= GRAM_SIZE:
+            return self._postings.get(text, ())
+        postings = sorted(
+            (self._postings.get(text[start:start + GRAM_SIZE], set()) for start in range(len(text) - GRAM_SIZE + 1)),
+            key=len,
+        )
+        return postings[0].intersection(*postings[1:])
+
+    def _people_for(self, keys: Iterable[Hashable]) -> list[T]:
+        return [self._people[key][0] for key in sorted(keys, key=self._positions.__getitem__)]
@@ -0,0 +1,166 @@
+"""
+Ranking of the people a name typed by a user could refer to.
+
+Each candidate is scored first by how well the text matches one of their names, from
+an exact match down to a near miss within a small edit distance, then by their part in
+the current game: living players, then dead players, then storytellers, then anyone
+else. A candidate is only picked without asking the user when their kind of match beats
+every other candidate's; their part in the game alone never decides, and only orders
+the candidates the user is asked to choose between.
+"""
+
+from __future__ import annotations
+
+import re
+from enum import IntEnum
+from typing import Iterable, TypeVar
+
+import global_vars
+import model.player
+from utils.name_index import normalize, person_names
+
+T = TypeVar('T')
+
+_WORD_SEPARATORS = re.compile(r"[\W_]+")
+
+
+class MatchKind(IntEnum):
+    """How closely a text matches a name; higher is closer."""
+    FUZZY = 1
+    SUBSTRING = 2
+    TOKEN = 3
+    PREFIX = 4
+    EXACT = 5
+
+
+def typo_limit(text: str) -> int:
+    """
+    Get the number of edits a text may be from a name and still match it.
+
+    Args:
+        text: The normalized text
+
+    Returns:
+        0 for short texts, where near misses would be mostly noise, and more for longer ones
+    """
+    if len(text) < 4:
+        return 0
+    return 1 if len(text) < 8 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Compute the Levenshtein distance between two strings, giving up past a limit.
+
+    Args:
+        a: The first string
+        b: The second string
+        limit: The largest distance of interest
+
+    Returns:
+        The distance, or limit + 1 if it is larger than limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+def match_kind(text: str, names: Iterable[str]) -> MatchKind | None:
+    """
+    Find how closely a text matches the best of several names.
+
+    Args:
+        text: The normalized text
+        names: The normalized names
+
+    Returns:
+        The closest kind of match, or None if the text matches none of the names
+    """
+    best = None
+    limit = typo_limit(text)
+    for name in names:
+        if name == text:
+            return MatchKind.EXACT
+        words = [word for word in _WORD_SEPARATORS.split(name) if word]
+        if name.startswith(text):
+            kind = MatchKind.PREFIX
+        elif any(word.startswith(text) for word in words):
+            kind = MatchKind.TOKEN
+        elif text in name:
+            kind = MatchKind.SUBSTRING
+        elif limit and any(edit_distance(text, candidate, limit) <= limit for candidate in [name, *words]):
+            kind = MatchKind.FUZZY
+        else:
+            continue
+        best = kind if best is None else max(best, kind)
+    return best
+
+
+def context_rank(person) -> int:
+    """
+    Rank a member or player by their part in the current game.
+
+    Args:
+        person: A member or player
+
+    Returns:
+        3 for a living player, 2 for a dead player, 1 for a storyteller and 0 for anyone else
+    """
+    game = global_vars.game
+    if game is None:
+        return 0
+    user_id = person.user_id if isinstance(person, model.player.Player) else getattr(person, "id", None)
+    player = game.get_player(user_id)
+    if player is not None:
+        return 2 if player.is_ghost else 3
+    return 1 if game.get_storyteller(user_id) is not None else 0
+
+
+def rank(text: str, people: Iterable[T]) -> list[tuple[tuple[int, int], T]]:
+    """
+    Score the people a text could refer to, best first.
+
+    Args:
+        text: The text typed by the user
+        people: The candidates
+
+    Returns:
+        (score, person) pairs for the people the text matches, in descending order of
+        score, keeping the order of people for equal scores
+    """
+    text = normalize(text)
+    scored = []
+    for person in people:
+        kind = match_kind(text, person_names(person))
+        if kind is not None:
+            scored.append(((int(kind), context_rank(person)), person))
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    return scored
+
+
+def best_matches(text: str, people: Iterable[T]) -> list[T]:
+    """
+    Find the people a text most likely refers to.
+
+    Args:
+        text: The text typed by the user
+        people: The candidates
+
+    Returns:
+        The single best candidate if their kind of match beats all others, otherwise
+        every candidate tied for the best kind of match, players in the game first;
+        people the text does not match at all are left out
+    """
+    scored = rank(text, people)
+    if not scored:
+        return []
+    best_kind = scored[0][0][0]
+    return [person for (kind, _), person in scored if kind == best_kind]
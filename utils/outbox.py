@@ -0,0 +1,308 @@
+"""Scheduling of the bot's outgoing messages.
+
+Every message used to be sent inline by whoever produced it, so a burst of storyteller
+notifications or whisper-channel logs competed with the call for a player's vote while
+Discord rate-limited both. ``Outbox`` queues messages in priority lanes and a single
+worker hands them to Discord, always serving the most urgent lane first.
+
+Sends are paced by token buckets, one per destination and one shared by all, sized like
+Discord's own limits, so the outbox rather than Discord decides what waits when the bot
+is busy. Each destination's messages are sent one at a time and in the order they were
+queued, whatever their lanes; priority decides which destination is served first, and a
+destination with an urgent message waiting is served before others. Consecutive
+low-priority messages waiting for the same destination are coalesced into a single
+message when they fit.
+
+Callers await the sent message as before; if the send fails they get the exception.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Hashable
+
+import discord
+
+# Discord allows about five messages per channel every five seconds, and fifty requests a second overall
+ROUTE_RATE = (5, 5.0)
+GLOBAL_RATE = (50, 1.0)
+MAX_LENGTH = 2000
+
+
+class Priority(IntEnum):
+    """The lanes of the outbox, most urgent first."""
+
+    URGENT = 0  # The game is waiting on it, like calling a player's vote
+    NORMAL = 1
+    LOW = 2  # Notifications and logs nobody waits on; coalesced when they pile up
+
+
+@dataclass
+class LaneMetrics:
+    """Counters describing the traffic through a lane of an Outbox.
+
+    Attributes:
+        queue_depth: Number of messages waiting to be sent
+        sent: Number of messages handed to Discord
+        coalesced: Number of messages folded into another message to the same destination
+        total_wait_seconds: Total time messages waited in the queue
+        max_wait_seconds: Longest time a message waited in the queue
+    """
+
+    queue_depth: int = 0
+    sent: int = 0
+    coalesced: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        """The average time a message waited in the queue."""
+        waited = self.sent + self.coalesced
+        return self.total_wait_seconds / waited if waited else 0.0
+
+
+class RateBucket:
+    """A token bucket refilled at a steady rate."""
+
+    def __init__(self, capacity: int, period: float, now: float = 0.0):
+        """Create a full bucket.
+
+        Args:
+            capacity: The most sends allowed in a burst
+            period: Seconds taken to refill the bucket from empty
+            now: The current time
+        """
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = float(capacity)
+        self._updated = now
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, now: float) -> float:
+        """Get how long until a send is allowed.
+
+        Args:
+            now: The current time
+
+        Returns:
+            Seconds to wait, or 0 if a send is allowed now
+        """
+        self._refill(now)
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        """Use up a send.
+
+        Args:
+            now: The current time
+        """
+        self._refill(now)
+        self._tokens -= 1
+
+
+@dataclass
+class _Outgoing:
+    """A queued message and the callers waiting for it to be sent."""
+
+    destination: Any
+    route: Hashable
+    priority: Priority
+    content: str | None
+    kwargs: dict[str, Any]
+    futures: list[asyncio.Future] = field(default_factory=list)
+    queued_times: list[float] = field(default_factory=list)
+
+    def can_absorb(self, other: _Outgoing) -> bool:
+        """Check whether another message can be appended to this one."""
+        return (
+                not self.kwargs and not other.kwargs
+                and self.content is not None and other.content is not None
+                and len(self.content) + 1 + len(other.content) <= MAX_LENGTH
+        )
+
+
+def _route(destination: Any) -> Hashable:
+    """Get the rate limit route of a channel or user."""
+    route = getattr(destination, "id", None)
+    return route if route is not None else id(destination)
+
+
+class Outbox:
+    """Sends messages in priority order within Discord's rate limits."""
+
+    def __init__(self, route_rate: tuple[int, float] = ROUTE_RATE, global_rate: tuple[int, float] = GLOBAL_RATE):
+        """Initialize an Outbox.
+
+        Args:
+            route_rate: Sends allowed per destination, as (burst, seconds to refill)
+            global_rate: Sends allowed overall, as (burst, seconds to refill)
+        """
+        self.route_rate = route_rate
+        self.global_rate = global_rate
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget the queue, for a new event loop."""
+        self.metrics = {priority: LaneMetrics() for priority in Priority}
+        self._lanes: dict[Priority, deque[_Outgoing]] = {priority: deque() for priority in Priority}
+        self._routes: dict[Hashable, RateBucket] = {}
+        self._global: RateBucket | None = None
+        # The messages waiting for each destination, in the order they were queued
+        self._queued: dict[Hashable, deque[_Outgoing]] = {}
+        self._in_flight: set[Hashable] = set()
+        self._wake = asyncio.Event()
+        self._worker: asyncio.Task | None = None
+
+    async def send(
+            self,
+            destination: discord.abc.Messageable,
+            content: str | None = None,
+            priority: Priority = Priority.NORMAL,
+            **kwargs,
+    ) -> discord.Message:
+        """Queue a message and wait for it to be sent.
+
+        Args:
+            destination: The channel or user to send to
+            content: The content of the message
+            priority: The lane to queue the message in
+            **kwargs: Additional message parameters
+
+        Returns:
+            The sent message, which low-priority messages may share with others
+
+        Raises:
+            discord.HTTPException: If Discord rejects the message
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._reset()
+        future = loop.create_future()
+        now = loop.time()
+        outgoing = _Outgoing(destination, _route(destination), priority, content, kwargs, [future], [now])
+        self._lanes[priority].append(outgoing)
+        self._queued.setdefault(outgoing.route, deque()).append(outgoing)
+        self.metrics[priority].queue_depth += 1
+        self._wake.set()
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+        return await future
+
+    async def _run(self) -> None:
+        """Dispatch queued messages until the queue is empty."""
+        loop = asyncio.get_running_loop()
+        while any(self._lanes.values()):
+            self._wake.clear()
+            delay = self._dispatch(loop.time())
+            if not any(self._lanes.values()):
+                return
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _bucket(self, route: Hashable, now: float) -> RateBucket:
+        bucket = self._routes.get(route)
+        if bucket is None:
+            bucket = self._routes[route] = RateBucket(*self.route_rate, now)
+        return bucket
+
+    def _remove(self, outgoing: _Outgoing) -> None:
+        """Take a message out of the queue."""
+        self._lanes[outgoing.priority].remove(outgoing)
+        queued = self._queued[outgoing.route]
+        queued.remove(outgoing)
+        if not queued:
+            del self._queued[outgoing.route]
+
+    def _dispatch(self, now: float) -> float | None:
+        """Start every queued message that may be sent now.
+
+        Args:
+            now: The current time
+
+        Returns:
+            Seconds until a rate limit allows the next send, or None to wait for a send to finish
+        """
+        if self._global is None:
+            self._global = RateBucket(*self.global_rate, now)
+        for lane in self._lanes.values():
+            for outgoing in list(lane):
+                if all(future.done() for future in outgoing.futures):
+                    # Every caller gave up waiting
+                    self._remove(outgoing)
+                    self.metrics[outgoing.priority].queue_depth -= len(outgoing.futures)
+
+        wait = None
+        # Destinations with a message in flight or waiting on its bucket, so later ones wait too
+        held = set(self._in_flight)
+        for priority in Priority:
+            for outgoing in list(self._lanes[priority]):
+                if outgoing.route in held:
+                    continue
+                # A destination's messages keep their order, so a message queued behind
+                # others for its destination sends the first of them in its place
+                first = self._queued[outgoing.route][0]
+                route = self._bucket(outgoing.route, now)
+                delay = max(self._global.delay(now), route.delay(now))
+                held.add(outgoing.route)
+                if delay:
+                    wait = delay if wait is None else min(wait, delay)
+                    continue
+                self._global.take(now)
+                route.take(now)
+                self._remove(first)
+                if first.priority == Priority.LOW:
+                    self._coalesce(first)
+                self._start(first, now)
+        return wait
+
+    def _coalesce(self, outgoing: _Outgoing) -> None:
+        """Append the low-priority messages queued next for the same destination to a message."""
+        queued = self._queued.get(outgoing.route)
+        while queued and queued[0].priority == Priority.LOW and outgoing.can_absorb(queued[0]):
+            follower = queued[0]
+            self._remove(follower)
+            outgoing.content += "\n" + follower.content
+            outgoing.futures += follower.futures
+            outgoing.queued_times += follower.queued_times
+            self.metrics[Priority.LOW].coalesced += 1
+            queued = self._queued.get(outgoing.route)
+
+    def _start(self, outgoing: _Outgoing, now: float) -> None:
+        metrics = self.metrics[outgoing.priority]
+        metrics.queue_depth -= len(outgoing.futures)
+        metrics.sent += 1
+        for queued_at in outgoing.queued_times:
+            metrics.total_wait_seconds += now - queued_at
+            metrics.max_wait_seconds = max(metrics.max_wait_seconds, now - queued_at)
+        self._in_flight.add(outgoing.route)
+        self._loop.create_task(self._deliver(outgoing))
+
+    async def _deliver(self, outgoing: _Outgoing) -> None:
+        """Send a message and hand the result to everyone waiting for it."""
+        try:
+            message = await outgoing.destination.send(outgoing.content, **outgoing.kwargs)
+        except Exception as e:
+            for future in outgoing.futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for future in outgoing.futures:
+                if not future.done():
+                    future.set_result(message)
+        finally:
+            for future in outgoing.futures:
+                # Only left undone if the send itself was cancelled
+                future.cancel()
+            self._in_flight.discard(outgoing.route)
+            self._wake.set()
@@ -11,7 +11,8 @@ import bot_client
 import global_vars
 import model.player
 from model import game
-from utils import message_utils
+from utils import message_utils, name_matching
+from utils.name_index import NameIndex, normalize, person_names
 
 T = TypeVar('T')
 
@@ -76,10 +77,7 @@ def who_by_id(user_id: int) -> model.player.Player | None:
     Returns:
         The player object if found, None otherwise
     """
-    for player in global_vars.game.seatingOrder:
-        if player.user.id == user_id:
-            return player
-    return None
+    return global_vars.game.get_player(user_id)
 
 
 def who_by_name(name: str) -> model.player.Player | None:
@@ -146,29 +144,7 @@ def get_neighbors(player: model.player.Player) -> list[model.player.Player]:
     Returns:
         List containing the player's neighbors (left and right)
     """
-    if player not in global_vars.game.seatingOrder:
-        return []
-    
-    index = global_vars.game.seatingOrder.index(player)
-    result = []
-    
-    # Find alive left neighbor
-    for i in range(1, len(global_vars.game.seatingOrder)):
-        left_index = (index - i) % len(global_vars.game.seatingOrder)
-        left_neighbor = global_vars.game.seatingOrder[left_index]
-        if not left_neighbor.is_ghost:
-            result.append(left_neighbor)
-            break
-    
-    # Find alive right neighbor
-    for i in range(1, len(global_vars.game.seatingOrder)):
-        right_index = (index + i) % len(global_vars.game.seatingOrder)
-        right_neighbor = global_vars.game.seatingOrder[right_index]
-        if not right_neighbor.is_ghost:
-            result.append(right_neighbor)
-            break
-    
-    return result
+    return global_vars.game.seating.living_neighbors(player)
 
 
 async def check_and_print_if_one_or_zero_to_check_in() -> None:
@@ -182,14 +158,12 @@ async def check_and_print_if_one_or_zero_to_check_in() -> None:
     ]
     
     if len(not_checked_in) == 1:
-        for member in global_vars.gamemaster_role.members:
-            await message_utils.safe_send(
-                member, 
-                f"Just waiting on {not_checked_in[0].display_name} to check in."
-            )
+        await message_utils.broadcast(
+            global_vars.gamemaster_role.members,
+            f"Just waiting on {not_checked_in[0].display_name} to check in."
+        )
     elif len(not_checked_in) == 0:
-        for member in global_vars.gamemaster_role.members:
-            await message_utils.safe_send(member, "Everyone has checked in!")
+        await message_utils.broadcast(global_vars.gamemaster_role.members, "Everyone has checked in!")
 
 
 def get_player(user) -> model.player.Player | None:
@@ -202,50 +176,98 @@ def get_player(user) -> model.player.Player | None:
     Returns:
         The Player object if found, None otherwise
     """
-    if global_vars.game is game.NULL_GAME:
+    if global_vars.game is game.NULL_GAME or user is None:
         return None
 
-    for person in global_vars.game.seatingOrder:
-        if person.user == user:
-            return person
+    return global_vars.game.get_player(user.id)
 
-    return None
+
+def member_index() -> NameIndex[discord.Member]:
+    """
+    Get the name index of the server's members, building it on first use.
+
+    The index is kept up to date by the member join, leave and update events.
+
+    Returns:
+        The index of the members of global_vars.server
+    """
+    global _member_index, _member_index_server
+    if _member_index is None or _member_index_server is not global_vars.server:
+        _member_index = NameIndex(global_vars.server.members)
+        _member_index_server = global_vars.server
+    return _member_index
+
+
+_member_index: NameIndex[discord.Member] | None = None
+_member_index_server: discord.Guild | None = None
+
+
+def index_member(member: discord.Member) -> None:
+    """
+    Add a member who joined, or whose names changed, to the member index.
+
+    Args:
+        member: The member
+    """
+    if _member_index is not None and member.guild == _member_index_server:
+        _member_index.add(member)
+
+
+def unindex_member(member: discord.Member) -> None:
+    """
+    Remove a member who left the server from the member index.
+
+    Args:
+        member: The member
+    """
+    if _member_index is not None and member.guild == _member_index_server:
+        _member_index.discard(member.id)
 
 
-async def generate_possibilities(text: str, people: Sequence[T]) -> list[T]:
+async def generate_possibilities(text: str, people: Sequence[T] | NameIndex[T]) -> list[T]:
     """
     Generates possible users with name or nickname matching text.
+
+    Names are compared casefolded and without accents.
     
     Args:
         text: The text to match against
-        people: The sequence of people to search through
+        people: The sequence of people to search through, or an index of them
         
     Returns:
         List of matching people
     """
-    possibilities = []
-    for person in people:
-        if (
-                person.display_name is not None and text.lower() in person.display_name.lower()
-        ) or text.lower() in person.name.lower():
-            possibilities.append(person)
-    return possibilities
+    if isinstance(people, NameIndex):
+        return people.substring(text)
+    text = normalize(text)
+    return [person for person in people if any(text in name for name in person_names(person))]
 
 
-async def select_player(user: discord.User, text: str, possibilities: Sequence[T]) -> T | None:
+async def select_player(user: discord.User, text: str, possibilities: Sequence[T] | NameIndex[T]) -> T | None:
     """
     Finds a player from players matching a string.
+
+    When several people match, the one whose name matches best is picked, favouring
+    players in the current game; the user is only asked to choose between people who
+    match equally well. Near misses such as typos are always confirmed with the user,
+    even when there is only one. See ``name_matching``.
     
     Args:
         user: The Discord user making the selection
         text: The text to match
-        possibilities: The sequence of possible matches
+        possibilities: The sequence of possible matches, or an index of them
         
     Returns:
         The selected player if found, None otherwise
     """
     new_possibilities = await generate_possibilities(text, possibilities)
 
+    # If no names contain the text, look for near misses such as typos, which the user confirms
+    if len(new_possibilities) == 0:
+        near_misses = name_matching.best_matches(text, possibilities)
+        if near_misses:
+            return await choices(user, near_misses, text)
+
     # If no users found
     if len(new_possibilities) == 0:
         await message_utils.safe_send(user, "User {} not found. Try again!".format(text))
@@ -255,9 +277,11 @@ async def select_player(user: discord.User, text: str, possibilities: Sequence[T
     elif len(new_possibilities) == 1:
         return new_possibilities[0]
 
-    # If too many users found
-    elif len(new_possibilities) > 1:
-        return await choices(user, new_possibilities, text)
+    # If too many users found, only ask about those tied for the best match
+    best = name_matching.best_matches(text, new_possibilities) or new_possibilities
+    if len(best) == 1:
+        return best[0]
+    return await choices(user, best, text)
 
 
 async def choices(user: discord.User, possibilities: list[model.player.Player],
@@ -338,10 +362,10 @@ async def make_active(user):
     Args:
         user: The Discord user
     """
-    if not get_player(user):
+    person = get_player(user)
+    if not person:
         return
 
-    person = get_player(user)
     person.update_last_active()
 
     if person.is_active or not global_vars.game.isDay:
@@ -356,13 +380,12 @@ async def make_active(user):
         if player.is_active == False and player.alignment != STORYTELLER_ALIGNMENT
     ]
     if len(notActive) == 1:
-        for memb in global_vars.gamemaster_role.members:
-            await message_utils.safe_send(
-                memb, "Just waiting on {} to speak.".format(notActive[0].display_name)
-            )
+        await message_utils.broadcast(
+            global_vars.gamemaster_role.members,
+            "Just waiting on {} to speak.".format(notActive[0].display_name)
+        )
     if len(notActive) == 0:
-        for memb in global_vars.gamemaster_role.members:
-            await message_utils.safe_send(memb, "Everyone has spoken!")
+        await message_utils.broadcast(global_vars.gamemaster_role.members, "Everyone has spoken!")
 
 
 async def cannot_nominate(user):
@@ -384,14 +407,12 @@ async def cannot_nominate(user):
            and player.is_ghost == False
     ]
     if len(can_nominate) == 1:
-        for memb in global_vars.gamemaster_role.members:
-            await message_utils.safe_send(
-                memb,
-                "Just waiting on {} to nominate or skip.".format(can_nominate[0].display_name),
-            )
+        await message_utils.broadcast(
+            global_vars.gamemaster_role.members,
+            "Just waiting on {} to nominate or skip.".format(can_nominate[0].display_name)
+        )
     if len(can_nominate) == 0:
-        for memb in global_vars.gamemaster_role.members:
-            await message_utils.safe_send(memb, "Everyone has nominated or skipped!")
+        await message_utils.broadcast(global_vars.gamemaster_role.members, "Everyone has nominated or skipped!")
 
 
 async def warn_missing_player_channels(channel_to_send, players_missing_channels):